@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+TARGET = "creativeai_studio.main"
+# Imported on first use by the provider registry; none of them should appear at startup.
+LAZY_MODULES = ("google.genai", "google.cloud.storage", "openai")
+
+
+def _importtime(module: str) -> dict[str, tuple[int, int]]:
+    # `-X importtime` writes "import time: self [us] | cumulative | imported package" to stderr.
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    out: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        if not self_us.isdigit():
+            continue
+        out[name.strip()] = (int(self_us), int(cumulative_us))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=f"Cold-start import time of {TARGET}.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=None, help="exit non-zero above this median")
+    args = parser.parse_args()
+
+    samples: list[float] = []
+    last: dict[str, tuple[int, int]] = {}
+    for _ in range(args.repeat):
+        last = _importtime(TARGET)
+        samples.append(last[TARGET][1] / 1000.0)
+
+    median_ms = statistics.median(samples)
+    print(f"{TARGET}: median {median_ms:.1f} ms over {args.repeat} runs (min {min(samples):.1f} ms)")
+
+    print(f"\n{'slowest imports (self)':<48}{'self ms':>10}{'cum ms':>10}")
+    for name, (self_us, cum_us) in sorted(last.items(), key=lambda kv: kv[1][0], reverse=True)[: args.top]:
+        print(f"{name:<48}{self_us / 1000.0:>10.1f}{cum_us / 1000.0:>10.1f}")
+
+    eager = [m for m in LAZY_MODULES if m in last]
+    if eager:
+        print(f"\nprovider SDKs imported at startup: {', '.join(eager)}")
+
+    print(f"\n{'provider SDK (deferred)':<48}{'cum ms':>10}")
+    for module in LAZY_MODULES:
+        try:
+            cost = _importtime(module).get(module)
+        except subprocess.CalledProcessError:
+            cost = None
+        print(f"{module:<48}{'n/a' if cost is None else f'{cost[1] / 1000.0:.1f}':>10}")
+
+    if eager or (args.budget_ms is not None and median_ms > args.budget_ms):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
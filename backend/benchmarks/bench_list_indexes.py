@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from creativeai_studio.db import MIGRATIONS, apply_migrations
+
+JOB_STATUSES = ("queued", "running", "succeeded", "succeeded", "succeeded", "failed", "canceled")
+JOB_TYPES = ("image.generate", "video.generate")
+MODEL_IDS = ("nano-banana", "nano-banana-pro", "doubao-seedream-4-5-251128", "veo-3.1", "veo-3.1-fast")
+
+QUERIES: dict[str, tuple[str, tuple]] = {
+    "jobs: recent": (
+        "SELECT * FROM jobs ORDER BY created_at DESC LIMIT 50 OFFSET 0",
+        (),
+    ),
+    "jobs: status=queued": (
+        "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT 50 OFFSET 0",
+        ("queued",),
+    ),
+    "jobs: model_id": (
+        "SELECT * FROM jobs WHERE model_id = ? ORDER BY created_at DESC LIMIT 50 OFFSET 0",
+        ("veo-3.1",),
+    ),
+    "jobs: recover running": (
+        "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT 1000 OFFSET 0",
+        ("running",),
+    ),
+    "assets: media_type=video": (
+        "SELECT * FROM assets WHERE media_type = ? ORDER BY created_at DESC LIMIT 50 OFFSET 0",
+        ("video",),
+    ),
+    "assets: origin=upload": (
+        "SELECT * FROM assets WHERE origin = ? ORDER BY created_at DESC LIMIT 50 OFFSET 0",
+        ("upload",),
+    ),
+    "assets: by source job": (
+        "SELECT * FROM assets WHERE source_job_id = ?",
+        ("job-000000500000",),
+    ),
+}
+
+
+def _populate(conn: sqlite3.Connection, rows: int, seed: int) -> None:
+    rnd = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    batch = 20_000
+
+    for offset in range(0, rows, batch):
+        jobs = []
+        assets = []
+        links = []
+        for i in range(offset, min(rows, offset + batch)):
+            created_at = (start + timedelta(seconds=i)).isoformat()
+            job_id = f"job-{i:012d}"
+            asset_id = f"asset-{i:012d}"
+            jobs.append(
+                (
+                    job_id,
+                    rnd.choice(JOB_TYPES),
+                    rnd.choice(MODEL_IDS),
+                    "api_key",
+                    rnd.choice(JOB_STATUSES),
+                    '{"prompt": "x"}',
+                    created_at,
+                )
+            )
+            origin = "upload" if rnd.random() < 0.2 else "generated"
+            assets.append(
+                (
+                    asset_id,
+                    "video" if rnd.random() < 0.1 else "image",
+                    origin,
+                    f"assets/generated/{asset_id}.png",
+                    "image/png",
+                    1024,
+                    None if origin == "upload" else job_id,
+                    created_at,
+                )
+            )
+            links.append((job_id, asset_id, "output"))
+        conn.executemany(
+            """
+            INSERT INTO jobs(id, job_type, model_id, auth_mode, status, params_json, created_at)
+            VALUES(?, ?, ?, ?, ?, ?, ?)
+            """,
+            jobs,
+        )
+        conn.executemany(
+            """
+            INSERT INTO assets(id, media_type, origin, file_path, mime_type, size_bytes, source_job_id, created_at)
+            VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            assets,
+        )
+        conn.executemany("INSERT INTO job_assets(job_id, asset_id, role) VALUES(?, ?, ?)", links)
+        conn.commit()
+
+
+def _measure(conn: sqlite3.Connection, repeat: int) -> dict[str, float]:
+    out: dict[str, float] = {}
+    for name, (sql, params) in QUERIES.items():
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            samples.append((time.perf_counter() - t0) * 1000.0)
+        out[name] = statistics.median(samples)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="List query latency before/after the index migration.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "bench.db")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        apply_migrations(conn, MIGRATIONS[:1])
+
+        t0 = time.perf_counter()
+        _populate(conn, args.rows, args.seed)
+        print(f"populated {args.rows:,} jobs/assets in {time.perf_counter() - t0:.1f}s")
+
+        before = _measure(conn, args.repeat)
+
+        t0 = time.perf_counter()
+        apply_migrations(conn)
+        conn.execute("ANALYZE")
+        print(f"applied migrations in {time.perf_counter() - t0:.1f}s")
+
+        after = _measure(conn, args.repeat)
+        conn.close()
+
+    print(f"{'query':<28}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name in QUERIES:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:<28}{before[name]:>12.2f}{after[name]:>12.2f}{speedup:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,58 +1,155 @@
 from __future__ import annotations
 
+import os
 import uuid
+from email.utils import formatdate
+from pathlib import Path
+from typing import Any, AsyncIterator
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
 
 from creativeai_studio.api.deps import AppContext, get_ctx
+from creativeai_studio.asset_delivery import (
+    IMMUTABLE_CACHE_CONTROL,
+    AssetDelivery,
+    is_not_modified,
+    strong_etag,
+)
+from creativeai_studio.asset_store import UploadTooLargeError, file_sha256
 from creativeai_studio.media_meta import read_image_size, read_video_meta_ffprobe
-from creativeai_studio.model_catalog import get_model
+from creativeai_studio.model_catalog import get_model_display_name
+from creativeai_studio.repositories.pagination import InvalidCursorError, clamp_page_limit
 
 router = APIRouter(prefix="/assets")
 
 
-def _asset_response_with_source_model(ctx: AppContext, asset: dict) -> dict:
-    out = dict(asset)
-    out["source_model_id"] = None
-    out["source_model_name"] = None
+def _conditional_file_response(
+    request: Request,
+    path: Path,
+    *,
+    media_type: str,
+    etag: str,
+    cache_control: str,
+) -> Response:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Asset file missing") from None
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+    }
+    if is_not_modified(request.headers, etag, st.st_mtime):
+        return Response(status_code=304, headers=headers)
+    # FileResponse serves Range / If-Range itself and keeps our ETag via setdefault.
+    return FileResponse(path, media_type=media_type, headers=headers, stat_result=st)
+
 
-    source_job_id = out.get("source_job_id")
-    if not source_job_id:
-        return out
+def _asset_delivery(asset_id: str, ctx: AppContext) -> AssetDelivery:
+    entry = ctx.asset_paths.get(asset_id)
+    if entry is not None:
+        return entry
+
+    a = ctx.assets.get(asset_id)
+    if not a:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    abs_path = ctx.asset_store.resolve(a["file_path"])
+    content_hash = a.get("content_hash")
+    if not content_hash:
+        # Assets stored before content addressing get their hash computed once and persisted.
+        if not abs_path.is_file():
+            raise HTTPException(status_code=404, detail="Asset file missing")
+        content_hash = file_sha256(abs_path)
+        ctx.assets.set_content_hash(asset_id, content_hash)
 
-    job = ctx.jobs.get(str(source_job_id))
-    if not job:
-        return out
+    entry = AssetDelivery(
+        path=abs_path,
+        mime_type=a["mime_type"],
+        etag=strong_etag(content_hash),
+        immutable=a["origin"] == "generated",
+    )
+    ctx.asset_paths.put(asset_id, entry)
+    return entry
 
-    model_id = job.get("model_id")
-    if not model_id:
-        return out
 
-    out["source_model_id"] = str(model_id)
-    model = get_model(str(model_id))
-    if model and model.get("display_name"):
-        out["source_model_name"] = str(model["display_name"])
+def _asset_response_with_source_model(asset: dict) -> dict:
+    out = dict(asset)
+    model_id = out.get("source_model_id")
+    out["source_model_id"] = str(model_id) if model_id else None
+    out["source_model_name"] = get_model_display_name(str(model_id)) if model_id else None
     return out
 
 
+# Room for the multipart framing around the file: boundaries, part headers, filename.
+_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+async def _limited_body(request: Request, max_bytes: int) -> AsyncIterator[bytes]:
+    # Starlette spools the whole file part to disk before a handler sees it, so the limit
+    # has to apply while the body is still being received.
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_bytes:
+            raise UploadTooLargeError(max_bytes)
+        yield chunk
+
+
 @router.post("/upload")
-async def upload_asset(file: UploadFile = File(...), ctx: AppContext = Depends(get_ctx)):
+async def upload_asset(request: Request, ctx: AppContext = Depends(get_ctx)):
+    max_body = ctx.cfg.max_upload_bytes + _MULTIPART_OVERHEAD_BYTES
+    too_large = HTTPException(status_code=413, detail=f"File too large (max {ctx.cfg.max_upload_bytes} bytes)")
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > max_body:
+        raise too_large
+
+    parser = MultiPartParser(request.headers, _limited_body(request, max_body), max_files=1)
+    try:
+        form = await parser.parse()
+    except UploadTooLargeError:
+        raise too_large from None
+    except MultiPartException as e:
+        raise HTTPException(status_code=400, detail=e.message) from None
+    try:
+        file = form.get("file")
+        if not isinstance(file, UploadFile):
+            raise HTTPException(status_code=422, detail="Missing file")
+        # Blocking chunked copies and the ffprobe call run in the threadpool, off the event loop.
+        return await run_in_threadpool(_store_upload, file, ctx)
+    finally:
+        await form.close()
+
+
+def _store_upload(file: UploadFile, ctx: AppContext) -> dict[str, Any]:
     mime = file.content_type or "application/octet-stream"
     if not (mime.startswith("image/") or mime.startswith("video/")):
         raise HTTPException(status_code=400, detail="Only image/video supported")
 
     asset_id = uuid.uuid4().hex
-    data = await file.read()
-    stored = ctx.asset_store.save_upload(
-        asset_id=asset_id,
-        filename=file.filename or "upload.bin",
-        content=data,
-    )
+    try:
+        stored = ctx.asset_store.save_upload_stream(
+            asset_id=asset_id,
+            filename=file.filename or "upload.bin",
+            src=file.file,
+            max_bytes=ctx.cfg.max_upload_bytes,
+            chunk_size=ctx.cfg.download_chunk_size,
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=f"File too large (max {e.max_bytes} bytes)") from None
 
     width = height = None
     duration = None
-    if stored.mime_type.startswith("image/"):
+    existing = ctx.assets.find_by_content_hash(stored.sha256) if stored.sha256 else None
+    if existing is not None:
+        # Same bytes as an earlier asset: reuse its probed metadata instead of re-reading the file.
+        width, height, duration = existing["width"], existing["height"], existing["duration_seconds"]
+    elif stored.mime_type.startswith("image/"):
         width, height = read_image_size(stored.abs_path)
     elif stored.mime_type.startswith("video/"):
         try:
@@ -70,7 +167,9 @@ async def upload_asset(file: UploadFile = File(...), ctx: AppContext = Depends(g
         width=width,
         height=height,
         duration_seconds=duration,
+        content_hash=stored.sha256,
     )
+    ctx.renditions.prewarm(asset)
 
     return {
         "id": asset["id"],
@@ -90,23 +189,76 @@ def list_assets(
     origin: str | None = None,
     limit: int = 50,
     offset: int = 0,
+    cursor: str | None = None,
 ):
-    assets = ctx.assets.list(media_type=media_type, origin=origin, limit=limit, offset=offset)
-    return [_asset_response_with_source_model(ctx, a) for a in assets]
+    if cursor is None:
+        assets = ctx.assets.list(
+            media_type=media_type,
+            origin=origin,
+            limit=limit,
+            offset=offset,
+            include_source_model=True,
+        )
+        return [_asset_response_with_source_model(a) for a in assets]
+
+    try:
+        assets, next_cursor = ctx.assets.list_page(
+            media_type=media_type,
+            origin=origin,
+            limit=clamp_page_limit(limit),
+            cursor=cursor or None,
+            include_source_model=True,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "items": [_asset_response_with_source_model(a) for a in assets],
+        "next_cursor": next_cursor,
+    }
 
 
 @router.get("/{asset_id}")
 def get_asset(asset_id: str, ctx: AppContext = Depends(get_ctx)):
-    a = ctx.assets.get(asset_id)
+    a = ctx.assets.get(asset_id, include_source_model=True)
     if not a:
         raise HTTPException(status_code=404, detail="Asset not found")
-    return _asset_response_with_source_model(ctx, a)
+    return _asset_response_with_source_model(a)
 
 
-@router.get("/{asset_id}/content")
-def asset_content(asset_id: str, ctx: AppContext = Depends(get_ctx)):
+@router.get("/{asset_id}/thumbnail")
+def asset_thumbnail(
+    asset_id: str,
+    request: Request,
+    w: int | None = None,
+    ctx: AppContext = Depends(get_ctx),
+):
     a = ctx.assets.get(asset_id)
     if not a:
         raise HTTPException(status_code=404, detail="Asset not found")
-    abs_path = ctx.asset_store.resolve(a["file_path"])
-    return FileResponse(abs_path, media_type=a["mime_type"])
+    path = ctx.renditions.get_or_create(a, w)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Thumbnail unavailable")
+    # A rendition of a given asset and width never changes once written.
+    return _conditional_file_response(
+        request,
+        path,
+        media_type=ctx.renditions.mime_type,
+        etag=strong_etag(asset_id, f"-{path.stem}"),
+        cache_control=IMMUTABLE_CACHE_CONTROL,
+    )
+
+
+@router.get("/{asset_id}/content")
+def asset_content(asset_id: str, request: Request, ctx: AppContext = Depends(get_ctx)):
+    entry = _asset_delivery(asset_id, ctx)
+    try:
+        return _conditional_file_response(
+            request,
+            entry.path,
+            media_type=entry.mime_type,
+            etag=entry.etag,
+            cache_control=entry.cache_control,
+        )
+    except HTTPException:
+        ctx.asset_paths.invalidate(asset_id)
+        raise
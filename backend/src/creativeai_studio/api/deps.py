@@ -4,10 +4,16 @@ from dataclasses import dataclass
 
 from fastapi import Request
 
+from creativeai_studio.asset_delivery import AssetDeliveryCache
 from creativeai_studio.asset_store import AssetStore
+from creativeai_studio.client_cache import ProviderClientCache
 from creativeai_studio.config import AppConfig
 from creativeai_studio.db import Database
+from creativeai_studio.job_events import JobEventBus
+from creativeai_studio.reference_cache import ReferenceCache
+from creativeai_studio.renditions import RenditionService
 from creativeai_studio.repositories.assets_repo import AssetsRepo
+from creativeai_studio.repositories.idempotency_repo import IdempotencyKeysRepo
 from creativeai_studio.repositories.job_assets_repo import JobAssetsRepo
 from creativeai_studio.repositories.jobs_repo import JobsRepo
 from creativeai_studio.repositories.settings_repo import SettingsRepo
@@ -22,6 +28,12 @@ class AppContext:
     jobs: JobsRepo
     job_assets: JobAssetsRepo
     asset_store: AssetStore
+    events: JobEventBus
+    clients: ProviderClientCache
+    renditions: RenditionService
+    asset_paths: AssetDeliveryCache
+    references: ReferenceCache
+    idempotency: IdempotencyKeysRepo
 
 
 def get_ctx(request: Request) -> AppContext:
@@ -1,54 +1,342 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from creativeai_studio.api.deps import AppContext, get_ctx
-from creativeai_studio.validation import ValidationError, validate_job_create
+from creativeai_studio.job_events import TERMINAL_JOB_STATUSES
+from creativeai_studio.model_catalog import get_model
+from creativeai_studio.repositories.pagination import InvalidCursorError, clamp_page_limit
+from creativeai_studio.scheduling import lane_for_model
+from creativeai_studio.validation import ValidatedJobCreate, ValidationError, validate_job_create
 
 router = APIRouter(prefix="/jobs")
 
+SSE_HEARTBEAT_SECONDS = 15.0
+MAX_STREAM_JOB_IDS = 100
+MAX_BATCH_JOBS = 500
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
 
-def _create_job(payload: dict, ctx: AppContext, runner) -> dict:
-    try:
-        v = validate_job_create(payload, ctx)
-    except ValidationError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+# Params that name input assets; the result cache keys on their content instead.
+_INPUT_ASSET_PARAMS = frozenset(
+    {
+        "reference_image_asset_id",
+        "reference_image_asset_ids",
+        "start_image_asset_id",
+        "end_image_asset_id",
+    }
+)
 
-    job_id = uuid.uuid4().hex
-    job = ctx.jobs.create(
-        job_id=job_id,
-        job_type=v.job_type,
-        model_id=v.model_id,
-        auth_mode=v.auth_mode,
-        params=v.params,
-    )
 
-    params = v.params
-    if v.job_type == "image.generate":
+def _input_asset_links(job_type: str, params: dict) -> list[tuple[str, str]]:
+    links: list[tuple[str, str]] = []
+    if job_type == "image.generate":
         ref_ids = params.get("reference_image_asset_ids")
         if isinstance(ref_ids, list):
-            for ref_id in ref_ids:
-                if ref_id:
-                    ctx.job_assets.add(job_id=job_id, asset_id=str(ref_id), role="input_reference")
+            links.extend((str(ref_id), "input_reference") for ref_id in ref_ids if ref_id)
         elif params.get("reference_image_asset_id"):
-            ctx.job_assets.add(job_id=job_id, asset_id=str(params["reference_image_asset_id"]), role="input_reference")
-    if v.job_type == "video.generate":
+            links.append((str(params["reference_image_asset_id"]), "input_reference"))
+    if job_type == "video.generate":
         if params.get("start_image_asset_id"):
-            ctx.job_assets.add(job_id=job_id, asset_id=str(params["start_image_asset_id"]), role="input_start")
+            links.append((str(params["start_image_asset_id"]), "input_start"))
         if params.get("end_image_asset_id"):
-            ctx.job_assets.add(job_id=job_id, asset_id=str(params["end_image_asset_id"]), role="input_end")
+            links.append((str(params["end_image_asset_id"]), "input_end"))
+    return links
 
-    if runner is not None:
-        runner.enqueue(job_id)
+
+@dataclass
+class _Idempotency:
+    key: str
+    request_hash: str
+    replayed: bool = False
+
+
+def _idempotency(request: Request, payload: Any) -> _Idempotency | None:
+    key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+    if key is None:
+        return None
+    key = key.strip()
+    if not key or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{IDEMPOTENCY_KEY_HEADER} must be 1-{MAX_IDEMPOTENCY_KEY_LENGTH} characters",
+        )
+    # The path is part of the fingerprint, so reusing a key on another endpoint is a mismatch.
+    encoded = json.dumps(
+        {"path": request.url.path, "payload": payload},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return _Idempotency(key=key, request_hash=hashlib.sha256(encoded.encode("utf-8")).hexdigest())
+
+
+def _replay(ctx: AppContext, idem: _Idempotency | None) -> dict | None:
+    # The original response for a repeated key: current state of the job or batch it created.
+    if idem is None:
+        return None
+    record = ctx.idempotency.get(idem.key)
+    if record is None:
+        return None
+    if record["request_hash"] != idem.request_hash:
+        raise HTTPException(
+            status_code=422,
+            detail=f"{IDEMPOTENCY_KEY_HEADER} was already used for a different request",
+        )
+    if record["batch_id"]:
+        jobs = ctx.jobs.list_batch(record["batch_id"])
+        replayed = _batch_response(record["batch_id"], jobs) if jobs else None
+    else:
+        replayed = ctx.jobs.get(record["job_id"]) if record["job_id"] else None
+    if replayed is None:
+        # The key is still live, so creating again would collide with it; say so instead.
+        raise HTTPException(
+            status_code=409,
+            detail=f"{IDEMPOTENCY_KEY_HEADER} refers to a job that no longer exists",
+        )
+    idem.replayed = True
+    return replayed
+
+
+def _mark_replayed(response: Response, idem: _Idempotency | None) -> None:
+    if idem is not None and idem.replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+
+
+def _validate(payload: dict, ctx: AppContext):
+    try:
+        return validate_job_create(payload, ctx)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _request_key(v: ValidatedJobCreate, ctx: AppContext) -> str:
+    # Same model, output-affecting params and input *content* give the same key; asset ids,
+    # auth mode and priority do not, so a re-uploaded reference still matches.
+    inputs = []
+    for asset_id, role in _input_asset_links(v.job_type, v.params):
+        asset = ctx.assets.get(asset_id)
+        content = asset.get("content_hash") if asset else None
+        inputs.append([role, content or f"asset:{asset_id}"])
+    canonical = {
+        "job_type": v.job_type,
+        "model_id": v.model_id,
+        "params": {k: val for k, val in v.params.items() if k not in _INPUT_ASSET_PARAMS},
+        "inputs": inputs,
+    }
+    encoded = json.dumps(canonical, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _job_row(v: ValidatedJobCreate, ctx: AppContext, batch_id: str | None = None) -> dict:
+    # The key costs an asset read per input, so it is only computed when it will be looked up.
+    use_cache = v.use_result_cache and ctx.cfg.result_cache_ttl_seconds > 0
+    return {
+        "job_id": uuid.uuid4().hex,
+        "job_type": v.job_type,
+        "model_id": v.model_id,
+        "auth_mode": v.auth_mode,
+        "params": v.params,
+        "priority": v.priority,
+        "lane": lane_for_model(get_model(v.model_id), v.job_type),
+        "batch_id": batch_id,
+        "request_key": _request_key(v, ctx) if use_cache else None,
+    }
+
+
+def _reuse_cached_results(ctx: AppContext, jobs: list[dict]) -> list[dict]:
+    # Runs inside the creating transaction: a job with a fresh enough identical predecessor is
+    # completed on the spot by linking that job's outputs, and never reaches the queue.
+    ttl = ctx.cfg.result_cache_ttl_seconds
+    if ttl <= 0:
+        return jobs
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=ttl)
+    cutoff_iso = cutoff.replace(microsecond=0).isoformat()
+    out = []
+    for job in jobs:
+        source = None
+        if job.get("request_key"):
+            source = ctx.jobs.find_cached_result(job["request_key"], cutoff_iso)
+        if source is None:
+            out.append(job)
+            continue
+        links = ctx.job_assets.list_by_job(source["id"])
+        outputs = [a["asset_id"] for a in links if a["role"] == "output"]
+        ctx.job_assets.add_many(job["id"], outputs, role="output")
+        result = dict(source.get("result") or {})
+        result["cached_from"] = result.get("cached_from") or source["id"]
+        ctx.jobs.set_succeeded(job["id"], result_dict=result)
+        out.append(ctx.jobs.get(job["id"]))
+    return out
+
+
+def _create_job(payload: dict, ctx: AppContext, runner, idem: _Idempotency | None = None) -> dict:
+    replayed = _replay(ctx, idem)
+    if replayed is not None:
+        return replayed
+    v = _validate(payload, ctx)
+    row = _job_row(v, ctx)
+    # The job row and its input links commit together, so a crash never leaves a job
+    # without its references.
+    with ctx.db.transaction():
+        # Checked again under the write lock: a concurrent retry may have won the race.
+        replayed = _replay(ctx, idem)
+        if replayed is not None:
+            return replayed
+        job = ctx.jobs.create(**row)
+        if idem is not None:
+            ctx.idempotency.put(
+                idem.key,
+                idem.request_hash,
+                ttl_seconds=ctx.cfg.idempotency_key_ttl_seconds,
+                job_id=row["job_id"],
+            )
+        for asset_id, role in _input_asset_links(row["job_type"], row["params"]):
+            ctx.job_assets.add(job_id=row["job_id"], asset_id=asset_id, role=role)
+        [job] = _reuse_cached_results(ctx, [job])
+
+    if runner is not None and job["status"] == "queued":
+        runner.enqueue(row["job_id"])
 
     return job
 
 
+def _apply_overrides(base: dict, overrides: dict) -> dict:
+    # Shared by clone and batch variations: prompt/params/auth/priority on top of a base payload.
+    out = {**base, "params": dict(base.get("params") or {})}
+    if overrides.get("prompt") is not None:
+        out["params"]["prompt"] = overrides.get("prompt")
+    if isinstance(overrides.get("params"), dict):
+        out["params"].update(overrides["params"])
+    if isinstance(overrides.get("auth"), dict) and overrides["auth"].get("mode"):
+        out["auth"] = {**(base.get("auth") or {}), "mode": overrides["auth"]["mode"]}
+    if overrides.get("priority") is not None:
+        out["priority"] = overrides["priority"]
+    if overrides.get("cache") is not None:
+        out["cache"] = overrides["cache"]
+    return out
+
+
+def _expand_batch(payload: dict) -> list[dict]:
+    items = payload.get("jobs")
+    if items is not None:
+        if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+            raise HTTPException(status_code=400, detail="jobs must be a list of objects")
+    else:
+        template = payload.get("template")
+        variations = payload.get("variations")
+        if not isinstance(template, dict) or not isinstance(variations, list):
+            raise HTTPException(status_code=400, detail="Provide jobs, or template with variations")
+        if not all(isinstance(v, dict) for v in variations):
+            raise HTTPException(status_code=400, detail="variations must be a list of objects")
+        items = [_apply_overrides(template, v) for v in variations]
+
+    if not items:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if len(items) > MAX_BATCH_JOBS:
+        raise HTTPException(status_code=400, detail=f"at most {MAX_BATCH_JOBS} jobs per batch")
+    return items
+
+
+def _batch_response(batch_id: str, jobs: list[dict]) -> dict:
+    return {"batch_id": batch_id, "total": len(jobs), "jobs": jobs}
+
+
+def _create_batch(payload: dict, ctx: AppContext, runner, idem: _Idempotency | None = None) -> dict:
+    replayed = _replay(ctx, idem)
+    if replayed is not None:
+        return replayed
+    items = _expand_batch(payload)
+
+    # Validate everything before writing anything: a batch is accepted whole or not at all.
+    validated = []
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            validated.append(validate_job_create(item, ctx))
+        except ValidationError as e:
+            errors.append({"index": index, "error": str(e)})
+    if errors:
+        raise HTTPException(status_code=400, detail=errors)
+
+    batch_id = uuid.uuid4().hex
+    rows = [_job_row(v, ctx, batch_id=batch_id) for v in validated]
+    links = [
+        (row["job_id"], asset_id, role)
+        for row in rows
+        for asset_id, role in _input_asset_links(row["job_type"], row["params"])
+    ]
+    with ctx.db.transaction():
+        replayed = _replay(ctx, idem)
+        if replayed is not None:
+            return replayed
+        jobs = ctx.jobs.create_many(rows)
+        if idem is not None:
+            ctx.idempotency.put(
+                idem.key,
+                idem.request_hash,
+                ttl_seconds=ctx.cfg.idempotency_key_ttl_seconds,
+                batch_id=batch_id,
+            )
+        ctx.job_assets.add_links(links)
+        jobs = _reuse_cached_results(ctx, jobs)
+
+    if runner is not None:
+        runner.enqueue_many([job for job in jobs if job["status"] == "queued"])
+
+    return _batch_response(batch_id, jobs)
+
+
+def _batch_status(counts: dict[str, int]) -> str:
+    total = sum(counts.values())
+    done = sum(n for status, n in counts.items() if status in TERMINAL_JOB_STATUSES)
+    if done < total:
+        return "running" if done or counts.get("running") else "queued"
+    succeeded = counts.get("succeeded", 0)
+    if succeeded == total:
+        return "succeeded"
+    if succeeded == 0:
+        return "canceled" if counts.get("canceled", 0) == total else "failed"
+    return "partial"
+
+
 @router.post("")
-def create_job(payload: dict, request: Request, ctx: AppContext = Depends(get_ctx)):
-    return _create_job(payload=payload, ctx=ctx, runner=request.app.state.runner)
+def create_job(
+    payload: dict, request: Request, response: Response, ctx: AppContext = Depends(get_ctx)
+):
+    idem = _idempotency(request, payload)
+    job = _create_job(payload=payload, ctx=ctx, runner=request.app.state.runner, idem=idem)
+    _mark_replayed(response, idem)
+    return job
+
+
+@router.post("/batch")
+def create_job_batch(
+    payload: dict, request: Request, response: Response, ctx: AppContext = Depends(get_ctx)
+):
+    idem = _idempotency(request, payload)
+    batch = _create_batch(payload=payload, ctx=ctx, runner=request.app.state.runner, idem=idem)
+    _mark_replayed(response, idem)
+    return batch
+
+
+@router.get("/batches/{batch_id}")
+def get_job_batch(batch_id: str, ctx: AppContext = Depends(get_ctx)):
+    summary = ctx.jobs.batch_summary(batch_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    completed = sum(n for status, n in summary["counts"].items() if status in TERMINAL_JOB_STATUSES)
+    return {**summary, "status": _batch_status(summary["counts"]), "completed": completed}
 
 
 @router.get("")
@@ -57,10 +345,106 @@ def list_jobs(
     status: str | None = None,
     job_type: str | None = None,
     model_id: str | None = None,
+    batch_id: str | None = None,
     limit: int = 50,
     offset: int = 0,
+    cursor: str | None = None,
 ):
-    return ctx.jobs.list(status=status, job_type=job_type, model_id=model_id, limit=limit, offset=offset)
+    # Passing `cursor` (empty for the first page) switches to keyset pagination and an
+    # envelope response; without it the legacy offset list is returned unchanged.
+    if cursor is None:
+        return ctx.jobs.list(
+            status=status,
+            job_type=job_type,
+            model_id=model_id,
+            batch_id=batch_id,
+            limit=limit,
+            offset=offset,
+        )
+
+    try:
+        items, next_cursor = ctx.jobs.list_page(
+            status=status,
+            job_type=job_type,
+            model_id=model_id,
+            batch_id=batch_id,
+            limit=clamp_page_limit(limit),
+            cursor=cursor or None,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def _sse(event: str, data: Any, event_id: str | None = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _job_event_stream(request: Request, ctx: AppContext, job_ids: list[str]) -> AsyncIterator[str]:
+    # Subscribe before reading the initial snapshots so a transition in between is not lost.
+    sub = ctx.events.subscribe(job_ids, loop=asyncio.get_running_loop())
+    try:
+        pending: set[str] = set()
+        for job_id in job_ids:
+            snapshot = await run_in_threadpool(ctx.events.snapshot, job_id)
+            if snapshot is None:
+                yield _sse("missing", {"id": job_id})
+                continue
+            yield _sse("job", snapshot, event_id=job_id)
+            if snapshot.get("status") not in TERMINAL_JOB_STATUSES:
+                pending.add(job_id)
+
+        while pending:
+            try:
+                snapshot = await asyncio.wait_for(sub.get(), timeout=SSE_HEARTBEAT_SECONDS)
+            except TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield ": keepalive\n\n"
+                continue
+            job_id = str(snapshot.get("id") or "")
+            yield _sse("job", snapshot, event_id=job_id)
+            if snapshot.get("status") in TERMINAL_JOB_STATUSES:
+                pending.discard(job_id)
+
+        yield _sse("end", {"ids": job_ids})
+    finally:
+        ctx.events.unsubscribe(sub)
+
+
+def _event_stream_response(request: Request, ctx: AppContext, job_ids: list[str]) -> StreamingResponse:
+    return StreamingResponse(
+        _job_event_stream(request, ctx, job_ids),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/queue")
+def get_queue_stats(request: Request):
+    runner = request.app.state.runner
+    return {"queued": runner.qsize(), "lanes": runner.lane_stats()}
+
+
+@router.get("/events")
+def stream_jobs_events(request: Request, ids: str = "", ctx: AppContext = Depends(get_ctx)):
+    job_ids = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if not job_ids:
+        raise HTTPException(status_code=400, detail="ids is required")
+    if len(job_ids) > MAX_STREAM_JOB_IDS:
+        raise HTTPException(status_code=400, detail=f"at most {MAX_STREAM_JOB_IDS} ids per stream")
+    return _event_stream_response(request, ctx, job_ids)
+
+
+@router.get("/{job_id}/events")
+def stream_job_events(job_id: str, request: Request, ctx: AppContext = Depends(get_ctx)):
+    if ctx.jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _event_stream_response(request, ctx, [job_id])
 
 
 @router.get("/{job_id}")
@@ -78,31 +462,33 @@ def cancel_job(job_id: str, ctx: AppContext = Depends(get_ctx)):
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    if job["status"] == "queued":
-        ctx.jobs.set_status(job_id, "canceled")
-    else:
+    if not ctx.jobs.cancel_if_queued(job_id):
         ctx.jobs.request_cancel(job_id)
+    ctx.events.publish_job(job_id)
     return {"ok": True}
 
 
 @router.post("/{job_id}/clone")
-def clone_job(job_id: str, request: Request, payload: dict | None = None, ctx: AppContext = Depends(get_ctx)):
+def clone_job(
+    job_id: str,
+    request: Request,
+    response: Response,
+    payload: dict | None = None,
+    ctx: AppContext = Depends(get_ctx),
+):
+    idem = _idempotency(request, payload or {})
     src = ctx.jobs.get(job_id)
     if not src:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    payload = payload or {}
-    new_payload = {
+    base = {
         "job_type": src["job_type"],
         "model_id": src["model_id"],
-        "params": dict(src.get("params") or {}),
+        "params": src.get("params") or {},
         "auth": {"mode": src["auth_mode"]},
+        "priority": src.get("priority") or 0,
     }
-    if payload.get("prompt") is not None:
-        new_payload["params"]["prompt"] = payload.get("prompt")
-    if isinstance(payload.get("params"), dict):
-        new_payload["params"].update(payload["params"])
-    if isinstance(payload.get("auth"), dict) and payload["auth"].get("mode"):
-        new_payload["auth"]["mode"] = payload["auth"]["mode"]
-
-    return _create_job(payload=new_payload, ctx=ctx, runner=request.app.state.runner)
+    new_payload = _apply_overrides(base, payload or {})
+    job = _create_job(payload=new_payload, ctx=ctx, runner=request.app.state.runner, idem=idem)
+    _mark_replayed(response, idem)
+    return job
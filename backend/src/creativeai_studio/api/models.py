@@ -8,6 +8,6 @@ router = APIRouter(prefix="/models")
 
 
 @router.get("")
-def get_models():
-    return list_models()
+def get_models(provider_id: str | None = None, media_type: str | None = None):
+    return list_models(provider_id=provider_id, media_type=media_type)
 
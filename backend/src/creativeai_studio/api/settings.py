@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
 from creativeai_studio.api.deps import AppContext, get_ctx
 
@@ -21,6 +21,24 @@ def get_settings(ctx: AppContext = Depends(get_ctx)):
     }
 
 
+@router.get("/runtime")
+def get_runtime_settings(request: Request, ctx: AppContext = Depends(get_ctx)):
+    runner = getattr(request.app.state, "runner", None)
+    return {
+        "profile": ctx.cfg.performance_profile(),
+        "stats": {
+            "db_pool": ctx.db.pool_stats(),
+            "lanes": runner.lane_stats() if runner is not None else {},
+            "providers": runner.provider_stats() if runner is not None else {},
+            "circuit_breakers": runner.circuit_stats() if runner is not None else {},
+            "events": ctx.events.stats(),
+            "provider_clients": ctx.clients.stats(),
+            "asset_paths": ctx.asset_paths.stats(),
+            "reference_cache": ctx.references.stats(),
+        },
+    }
+
+
 @router.put("")
 def put_settings(payload: dict, ctx: AppContext = Depends(get_ctx)):
     mode = payload.get("default_auth_mode")
@@ -29,8 +47,10 @@ def put_settings(payload: dict, ctx: AppContext = Depends(get_ctx)):
 
     if "google_api_key" in payload and payload["google_api_key"]:
         ctx.settings.set_str("google_api_key", str(payload["google_api_key"]))
+        ctx.clients.invalidate("google")
     if "ark_api_key" in payload and payload["ark_api_key"]:
         ctx.settings.set_str("ark_api_key", str(payload["ark_api_key"]))
+        ctx.clients.invalidate("volcengine_ark")
 
     return get_settings(ctx)
 
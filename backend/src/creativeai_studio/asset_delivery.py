@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Mapping
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Uploads revalidate on each use; a 304 against the strong ETag costs no body transfer.
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+@dataclass(frozen=True)
+class AssetDelivery:
+    path: Path
+    mime_type: str
+    etag: str
+    immutable: bool
+
+    @property
+    def cache_control(self) -> str:
+        return IMMUTABLE_CACHE_CONTROL if self.immutable else REVALIDATE_CACHE_CONTROL
+
+
+def strong_etag(content_hash: str, suffix: str = "") -> str:
+    return f'"{content_hash}{suffix}"'
+
+
+def is_not_modified(request_headers: Mapping[str, str], etag: str, mtime: float) -> bool:
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since (RFC 9110 13.2.2); weak comparison applies.
+        candidates = [c.strip().removeprefix("W/") for c in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since
+    return False
+
+
+class AssetDeliveryCache:
+    def __init__(self, max_entries: int = 4096):
+        self._max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, AssetDelivery] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, asset_id: str) -> AssetDelivery | None:
+        with self._lock:
+            entry = self._entries.get(asset_id)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(asset_id)
+            self._hits += 1
+            return entry
+
+    def put(self, asset_id: str, entry: AssetDelivery) -> None:
+        with self._lock:
+            self._entries[asset_id] = entry
+            self._entries.move_to_end(asset_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, asset_id: str) -> None:
+        with self._lock:
+            self._entries.pop(asset_id, None)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
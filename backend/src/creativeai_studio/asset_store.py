@@ -1,9 +1,20 @@
 from __future__ import annotations
 
+import hashlib
 import mimetypes
-import shutil
+import os
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO
+
+BLOB_ROOT = Path("assets/blobs")
+
+
+class UploadTooLargeError(ValueError):
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
 
 
 @dataclass(frozen=True)
@@ -12,6 +23,28 @@ class StoredFile:
     abs_path: Path
     mime_type: str
     size_bytes: int
+    sha256: str | None = None
+    # True when the content already existed on disk and nothing new was written.
+    deduplicated: bool = False
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def blob_rel_path(sha256: str) -> Path:
+    # Two levels of 256-way sharding keep every directory small. Blobs carry no extension:
+    # identical bytes uploaded as .jpg and .jpeg share one file, and each asset row keeps
+    # the mime type its own caller gave it.
+    return BLOB_ROOT / sha256[:2] / sha256[2:4] / sha256
+
+
+def _mime_for(ext: str) -> str:
+    return mimetypes.guess_type(f"file{ext}")[0] or "application/octet-stream"
 
 
 class AssetStore:
@@ -19,24 +52,54 @@ class AssetStore:
         self._data_dir = data_dir
 
     def save_upload(self, asset_id: str, filename: str, content: bytes) -> StoredFile:
+        return self._write_blob(asset_id, Path(filename).suffix.lower(), content)
+
+    def save_upload_stream(
+        self,
+        asset_id: str,
+        filename: str,
+        src: BinaryIO,
+        *,
+        max_bytes: int,
+        chunk_size: int = 1024 * 1024,
+    ) -> StoredFile:
         ext = Path(filename).suffix.lower()
-        rel = Path("assets/uploads") / f"{asset_id}{ext}"
-        return self._write(rel, content)
+        digest = hashlib.sha256()
+        size_bytes = 0
+        tmp_path = self._mktemp(asset_id)
+        try:
+            with tmp_path.open("wb") as out:
+                while True:
+                    chunk = src.read(chunk_size)
+                    if not chunk:
+                        break
+                    size_bytes += len(chunk)
+                    if size_bytes > max_bytes:
+                        raise UploadTooLargeError(max_bytes)
+                    digest.update(chunk)
+                    out.write(chunk)
+            return self._commit_blob(tmp_path, digest.hexdigest(), _mime_for(ext), size_bytes)
+        finally:
+            tmp_path.unlink(missing_ok=True)
 
     def save_generated(self, asset_id: str, ext: str, content: bytes) -> StoredFile:
         ext = ext if ext.startswith(".") else f".{ext}"
-        rel = Path("assets/generated") / f"{asset_id}{ext}"
-        return self._write(rel, content)
+        return self._write_blob(asset_id, ext, content)
 
-    def save_generated_from_file(self, asset_id: str, ext: str, src_path: Path) -> StoredFile:
+    def adopt_generated_file(
+        self,
+        asset_id: str,
+        ext: str,
+        tmp_path: Path,
+        sha256: str | None = None,
+    ) -> StoredFile:
+        # Moves a file already written under data/tmp into the blob store without copying it.
         ext = ext if ext.startswith(".") else f".{ext}"
-        rel = Path("assets/generated") / f"{asset_id}{ext}"
-        abs_path = (self._data_dir / rel).resolve()
-        abs_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copyfile(src_path, abs_path)
-        size_bytes = abs_path.stat().st_size
-        mime_type = mimetypes.guess_type(str(abs_path))[0] or "application/octet-stream"
-        return StoredFile(rel_path=str(rel), abs_path=abs_path, mime_type=mime_type, size_bytes=size_bytes)
+        sha256 = sha256 or file_sha256(tmp_path)
+        return self._commit_blob(tmp_path, sha256, _mime_for(ext), tmp_path.stat().st_size)
+
+    def temp_path(self, asset_id: str) -> Path:
+        return self._mktemp(asset_id)
 
     def resolve(self, rel_path: str) -> Path:
         p = (self._data_dir / rel_path).resolve()
@@ -44,10 +107,47 @@ class AssetStore:
             raise ValueError("Invalid asset path")
         return p
 
-    def _write(self, rel: Path, content: bytes) -> StoredFile:
+    def _write_blob(self, asset_id: str, ext: str, content: bytes) -> StoredFile:
+        sha256 = hashlib.sha256(content).hexdigest()
+        mime_type = _mime_for(ext)
+        rel = blob_rel_path(sha256)
+        if (self._data_dir / rel).is_file():
+            return self._stored(rel, sha256, mime_type, len(content), deduplicated=True)
+
+        tmp_path = self._mktemp(asset_id)
+        try:
+            tmp_path.write_bytes(content)
+            return self._commit_blob(tmp_path, sha256, mime_type, len(content))
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _commit_blob(self, tmp_path: Path, sha256: str, mime_type: str, size_bytes: int) -> StoredFile:
+        rel = blob_rel_path(sha256)
         abs_path = (self._data_dir / rel).resolve()
+        if abs_path.is_file():
+            return self._stored(rel, sha256, mime_type, size_bytes, deduplicated=True)
+
         abs_path.parent.mkdir(parents=True, exist_ok=True)
-        abs_path.write_bytes(content)
-        size_bytes = abs_path.stat().st_size
-        mime_type = mimetypes.guess_type(str(abs_path))[0] or "application/octet-stream"
-        return StoredFile(rel_path=str(rel), abs_path=abs_path, mime_type=mime_type, size_bytes=size_bytes)
+        # data/tmp and assets/ share a filesystem, so this is a rename rather than a copy.
+        # Concurrent writers of the same content race harmlessly: the bytes are identical.
+        os.replace(tmp_path, abs_path)
+        return self._stored(rel, sha256, mime_type, size_bytes)
+
+    def _stored(
+        self, rel: Path, sha256: str, mime_type: str, size_bytes: int, *, deduplicated: bool = False
+    ) -> StoredFile:
+        return StoredFile(
+            rel_path=str(rel),
+            abs_path=(self._data_dir / rel).resolve(),
+            mime_type=mime_type,
+            size_bytes=size_bytes,
+            sha256=sha256,
+            deduplicated=deduplicated,
+        )
+
+    def _mktemp(self, asset_id: str) -> Path:
+        tmp_dir = self._data_dir / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(prefix=f"{asset_id}.", suffix=".part", dir=tmp_dir)
+        os.close(fd)
+        return Path(name)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+
+def api_key_fingerprint(api_key: str) -> str:
+    # Never keep the raw key as a dict key; it would show up in stats and debuggers.
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+class ProviderClientCache:
+    def __init__(self, max_size: int = 8):
+        self._max_size = max(1, int(max_size))
+        self._lock = threading.Lock()
+        self._clients: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_create(self, provider_id: str, api_key: str, factory: Callable[[str], Any]) -> Any:
+        key = (provider_id, api_key_fingerprint(api_key))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self._hits += 1
+                return client
+            self._misses += 1
+
+        # Build outside the lock so a slow SDK constructor doesn't block other lanes.
+        client = factory(api_key)
+        with self._lock:
+            existing = self._clients.get(key)
+            if existing is not None:
+                self._clients.move_to_end(key)
+                return existing
+            self._clients[key] = client
+            while len(self._clients) > self._max_size:
+                self._clients.popitem(last=False)
+                self._evictions += 1
+        return client
+
+    def invalidate(self, provider_id: str | None = None) -> int:
+        with self._lock:
+            keys = [k for k in self._clients if provider_id is None or k[0] == provider_id]
+            for k in keys:
+                del self._clients[k]
+            return len(keys)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._clients),
+                "max_size": self._max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
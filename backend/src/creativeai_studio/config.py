@@ -3,22 +3,216 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw.strip())
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {raw!r}") from None
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw.strip())
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {raw!r}") from None
+
+
+def parse_lane_concurrency(raw: str) -> tuple[tuple[str, int], ...]:
+    # "google/video.generate=2,volcengine_ark/image.generate=4"
+    out: dict[str, int] = {}
+    for item in raw.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        lane, sep, value = item.partition("=")
+        if not sep or not lane.strip():
+            raise ValueError(f"RUNNER_LANE_CONCURRENCY entry must be lane=N, got {item!r}")
+        try:
+            out[lane.strip()] = int(value.strip())
+        except ValueError:
+            raise ValueError(f"RUNNER_LANE_CONCURRENCY value for {lane.strip()!r} must be an integer") from None
+    return tuple(sorted(out.items()))
 
 
 @dataclass(frozen=True)
 class AppConfig:
     data_dir: Path
+    runner_concurrency: int = 1
+    runner_lane_concurrency: tuple[tuple[str, int], ...] = ()
+    queue_poll_interval_seconds: float = 2.0
+    job_lease_seconds: float = 60.0
+    job_max_attempts: int = 3
+    retry_base_delay_seconds: float = 2.0
+    retry_max_delay_seconds: float = 60.0
+    circuit_failure_threshold: int = 5
+    circuit_cooldown_seconds: float = 30.0
+    circuit_recovery_successes: int = 3
+    result_cache_ttl_seconds: float = 0.0
+    idempotency_key_ttl_seconds: float = 24 * 3600.0
+    db_pool_size: int = 8
+    db_busy_timeout_ms: int = 5000
+    db_cache_size_kib: int = 16384
+    db_mmap_size_bytes: int = 256 * 1024 * 1024
+    download_chunk_size: int = 1024 * 1024
+    download_timeout_seconds: float = 60.0
+    download_max_bytes: int = 2 * 1024 * 1024 * 1024
+    download_max_attempts: int = 3
+    output_fetch_workers: int = 4
+    video_poll_interval_seconds: float = 10.0
+    video_poll_workers: int = 4
+    video_timeout_seconds: float = 1800.0
+    provider_client_cache_size: int = 8
+    reference_cache_bytes: int = 256 * 1024 * 1024
+    max_upload_bytes: int = 1024 * 1024 * 1024
+
+    def __post_init__(self) -> None:
+        self.validate()
 
     @staticmethod
     def from_env() -> "AppConfig":
-        return AppConfig(data_dir=Path(os.getenv("DATA_DIR", "./data")).resolve())
+        return AppConfig(
+            data_dir=Path(os.getenv("DATA_DIR", "./data")).resolve(),
+            runner_concurrency=_env_int("RUNNER_CONCURRENCY", 1),
+            runner_lane_concurrency=parse_lane_concurrency(os.getenv("RUNNER_LANE_CONCURRENCY", "")),
+            queue_poll_interval_seconds=_env_float("QUEUE_POLL_INTERVAL_SECONDS", 2.0),
+            job_lease_seconds=_env_float("JOB_LEASE_SECONDS", 60.0),
+            job_max_attempts=_env_int("JOB_MAX_ATTEMPTS", 3),
+            retry_base_delay_seconds=_env_float("RETRY_BASE_DELAY_SECONDS", 2.0),
+            retry_max_delay_seconds=_env_float("RETRY_MAX_DELAY_SECONDS", 60.0),
+            circuit_failure_threshold=_env_int("CIRCUIT_FAILURE_THRESHOLD", 5),
+            circuit_cooldown_seconds=_env_float("CIRCUIT_COOLDOWN_SECONDS", 30.0),
+            circuit_recovery_successes=_env_int("CIRCUIT_RECOVERY_SUCCESSES", 3),
+            result_cache_ttl_seconds=_env_float("RESULT_CACHE_TTL_SECONDS", 0.0),
+            idempotency_key_ttl_seconds=_env_float("IDEMPOTENCY_KEY_TTL_SECONDS", 24 * 3600.0),
+            db_pool_size=_env_int("DB_POOL_SIZE", 8),
+            db_busy_timeout_ms=_env_int("DB_BUSY_TIMEOUT_MS", 5000),
+            db_cache_size_kib=_env_int("DB_CACHE_SIZE_KIB", 16384),
+            db_mmap_size_bytes=_env_int("DB_MMAP_SIZE_BYTES", 256 * 1024 * 1024),
+            download_chunk_size=_env_int("DOWNLOAD_CHUNK_SIZE", 1024 * 1024),
+            download_timeout_seconds=_env_float("DOWNLOAD_TIMEOUT_SECONDS", 60.0),
+            download_max_bytes=_env_int("DOWNLOAD_MAX_BYTES", 2 * 1024 * 1024 * 1024),
+            download_max_attempts=_env_int("DOWNLOAD_MAX_ATTEMPTS", 3),
+            output_fetch_workers=_env_int("OUTPUT_FETCH_WORKERS", 4),
+            video_poll_interval_seconds=_env_float("VIDEO_POLL_INTERVAL_SECONDS", 10.0),
+            video_poll_workers=_env_int("VIDEO_POLL_WORKERS", 4),
+            video_timeout_seconds=_env_float("VIDEO_TIMEOUT_SECONDS", 1800.0),
+            provider_client_cache_size=_env_int("PROVIDER_CLIENT_CACHE_SIZE", 8),
+            reference_cache_bytes=_env_int("REFERENCE_CACHE_BYTES", 256 * 1024 * 1024),
+            max_upload_bytes=_env_int("MAX_UPLOAD_BYTES", 1024 * 1024 * 1024),
+        )
+
+    def validate(self) -> None:
+        errors: list[str] = []
+
+        def at_least(name: str, value: float, minimum: float) -> None:
+            if value < minimum:
+                errors.append(f"{name} must be >= {minimum}, got {value}")
+
+        at_least("runner_concurrency", self.runner_concurrency, 1)
+        for lane, value in self.runner_lane_concurrency:
+            at_least(f"runner_lane_concurrency[{lane}]", value, 1)
+        at_least("queue_poll_interval_seconds", self.queue_poll_interval_seconds, 0.05)
+        at_least("job_lease_seconds", self.job_lease_seconds, 5)
+        at_least("job_max_attempts", self.job_max_attempts, 1)
+        at_least("retry_base_delay_seconds", self.retry_base_delay_seconds, 0)
+        at_least(
+            "retry_max_delay_seconds", self.retry_max_delay_seconds, self.retry_base_delay_seconds
+        )
+        at_least("circuit_failure_threshold", self.circuit_failure_threshold, 1)
+        at_least("circuit_cooldown_seconds", self.circuit_cooldown_seconds, 0)
+        at_least("circuit_recovery_successes", self.circuit_recovery_successes, 1)
+        at_least("result_cache_ttl_seconds", self.result_cache_ttl_seconds, 0)
+        at_least("idempotency_key_ttl_seconds", self.idempotency_key_ttl_seconds, 1)
+        at_least("db_pool_size", self.db_pool_size, 1)
+        at_least("db_busy_timeout_ms", self.db_busy_timeout_ms, 0)
+        at_least("db_cache_size_kib", self.db_cache_size_kib, 0)
+        at_least("db_mmap_size_bytes", self.db_mmap_size_bytes, 0)
+        at_least("download_chunk_size", self.download_chunk_size, 4096)
+        at_least("download_timeout_seconds", self.download_timeout_seconds, 1)
+        at_least("download_max_bytes", self.download_max_bytes, 1)
+        at_least("download_max_attempts", self.download_max_attempts, 1)
+        at_least("output_fetch_workers", self.output_fetch_workers, 1)
+        at_least("video_poll_interval_seconds", self.video_poll_interval_seconds, 0.1)
+        at_least("video_poll_workers", self.video_poll_workers, 1)
+        at_least("video_timeout_seconds", self.video_timeout_seconds, 1)
+        at_least("provider_client_cache_size", self.provider_client_cache_size, 1)
+        at_least("reference_cache_bytes", self.reference_cache_bytes, 0)
+        at_least("max_upload_bytes", self.max_upload_bytes, 1)
+
+        if errors:
+            raise ValueError("Invalid configuration: " + "; ".join(errors))
 
     @property
     def db_path(self) -> Path:
         return self.data_dir / "app.db"
 
+    @property
+    def lane_concurrency(self) -> dict[str, int]:
+        return dict(self.runner_lane_concurrency)
+
+    def performance_profile(self) -> dict[str, Any]:
+        return {
+            "runner": {
+                "concurrency": self.runner_concurrency,
+                "lane_concurrency": self.lane_concurrency,
+                "queue_poll_interval_seconds": self.queue_poll_interval_seconds,
+                "lease_seconds": self.job_lease_seconds,
+                "max_attempts": self.job_max_attempts,
+            },
+            "retry": {
+                "base_delay_seconds": self.retry_base_delay_seconds,
+                "max_delay_seconds": self.retry_max_delay_seconds,
+            },
+            "circuit_breaker": {
+                "failure_threshold": self.circuit_failure_threshold,
+                "cooldown_seconds": self.circuit_cooldown_seconds,
+                "recovery_successes": self.circuit_recovery_successes,
+            },
+            "db": {
+                "pool_size": self.db_pool_size,
+                "busy_timeout_ms": self.db_busy_timeout_ms,
+                "cache_size_kib": self.db_cache_size_kib,
+                "mmap_size_bytes": self.db_mmap_size_bytes,
+            },
+            "download": {
+                "chunk_size": self.download_chunk_size,
+                "timeout_seconds": self.download_timeout_seconds,
+                "max_bytes": self.download_max_bytes,
+                "max_attempts": self.download_max_attempts,
+                "output_workers": self.output_fetch_workers,
+            },
+            "upload": {
+                "max_bytes": self.max_upload_bytes,
+            },
+            "video": {
+                "poll_interval_seconds": self.video_poll_interval_seconds,
+                "poll_workers": self.video_poll_workers,
+                "timeout_seconds": self.video_timeout_seconds,
+            },
+            "provider_clients": {
+                "cache_size": self.provider_client_cache_size,
+            },
+            "reference_cache": {
+                "max_bytes": self.reference_cache_bytes,
+            },
+            "result_cache": {
+                "enabled": self.result_cache_ttl_seconds > 0,
+                "ttl_seconds": self.result_cache_ttl_seconds,
+            },
+            "idempotency": {
+                "ttl_seconds": self.idempotency_key_ttl_seconds,
+            },
+        }
+
     def ensure_dirs(self) -> None:
-        (self.data_dir / "assets/uploads").mkdir(parents=True, exist_ok=True)
-        (self.data_dir / "assets/generated").mkdir(parents=True, exist_ok=True)
         (self.data_dir / "credentials").mkdir(parents=True, exist_ok=True)
         (self.data_dir / "tmp").mkdir(parents=True, exist_ok=True)
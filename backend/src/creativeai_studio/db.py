@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import queue
 import sqlite3
-from dataclasses import dataclass
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Iterator
 
 SCHEMA_SQL = """
 CREATE TABLE IF NOT EXISTS settings (
@@ -52,18 +58,366 @@ CREATE TABLE IF NOT EXISTS job_assets (
 );
 """
 
+LIST_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_type_created ON jobs(job_type, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_model_created ON jobs(model_id, created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_assets_created ON assets(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_assets_media_created ON assets(media_type, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_assets_media_origin_created ON assets(media_type, origin, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_assets_origin_created ON assets(origin, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_assets_source_job ON assets(source_job_id);
+
+CREATE INDEX IF NOT EXISTS idx_job_assets_asset ON job_assets(asset_id);
+"""
+
+
+VIDEO_OPERATIONS_SQL = """
+ALTER TABLE jobs ADD COLUMN provider_operation_json TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_pending_operations
+  ON jobs(started_at)
+  WHERE status = 'running' AND provider_operation_json IS NOT NULL;
+"""
+
+
+JOB_LANES_SQL = """
+ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE jobs ADD COLUMN lane TEXT;
+"""
+
+
+CONTENT_HASHES_SQL = """
+ALTER TABLE assets ADD COLUMN content_hash TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_assets_content_hash ON assets(content_hash, created_at);
+"""
+
+
+JOB_BATCHES_SQL = """
+ALTER TABLE jobs ADD COLUMN batch_id TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_batch_created
+  ON jobs(batch_id, created_at, id)
+  WHERE batch_id IS NOT NULL;
+"""
+
+
+JOB_LEASES_SQL = """
+ALTER TABLE jobs ADD COLUMN lease_owner TEXT;
+ALTER TABLE jobs ADD COLUMN lease_expires_at TEXT;
+ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_claim
+  ON jobs(lane, priority DESC, created_at, id)
+  WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_jobs_running_lease
+  ON jobs(lease_expires_at)
+  WHERE status = 'running';
+"""
+
+
+JOB_REQUEST_KEYS_SQL = """
+ALTER TABLE jobs ADD COLUMN request_key TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_request_key
+  ON jobs(request_key, finished_at)
+  WHERE status = 'succeeded' AND request_key IS NOT NULL;
+"""
+
+
+IDEMPOTENCY_KEYS_SQL = """
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+  key TEXT PRIMARY KEY,
+  request_hash TEXT NOT NULL,
+  job_id TEXT,
+  batch_id TEXT,
+  created_at TEXT NOT NULL,
+  expires_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires ON idempotency_keys(expires_at);
+"""
+
+
+JOB_RETRIES_SQL = """
+ALTER TABLE jobs ADD COLUMN available_at TEXT;
+"""
+
 
 @dataclass(frozen=True)
-class Database:
-    path: Path
+class Migration:
+    version: int
+    name: str
+    sql: str
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "initial_schema", SCHEMA_SQL),
+    Migration(2, "list_indexes", LIST_INDEXES_SQL),
+    Migration(3, "video_operations", VIDEO_OPERATIONS_SQL),
+    Migration(4, "job_lanes", JOB_LANES_SQL),
+    Migration(5, "content_hashes", CONTENT_HASHES_SQL),
+    Migration(6, "job_batches", JOB_BATCHES_SQL),
+    Migration(7, "job_leases", JOB_LEASES_SQL),
+    Migration(8, "job_request_keys", JOB_REQUEST_KEYS_SQL),
+    Migration(9, "idempotency_keys", IDEMPOTENCY_KEYS_SQL),
+    Migration(10, "job_retries", JOB_RETRIES_SQL),
+)
+
+
+def _split_statements(script: str) -> list[str]:
+    statements: list[str] = []
+    pending = ""
+    for line in script.splitlines(keepends=True):
+        pending += line
+        if sqlite3.complete_statement(pending):
+            stmt = pending.strip()
+            if stmt:
+                statements.append(stmt)
+            pending = ""
+    if pending.strip():
+        raise ValueError("Incomplete SQL statement in migration")
+    return statements
+
+
+def current_schema_version(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return int(row[0] or 0)
+
+
+def apply_migrations(
+    conn: sqlite3.Connection,
+    migrations: tuple[Migration, ...] = MIGRATIONS,
+) -> list[int]:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+          version INTEGER PRIMARY KEY,
+          name TEXT NOT NULL,
+          applied_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.commit()
+
+    applied: list[int] = []
+    for migration in sorted(migrations, key=lambda m: m.version):
+        # BEGIN IMMEDIATE serializes concurrent initializers; re-check the version under the lock.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if migration.version <= current_schema_version(conn):
+                conn.rollback()
+                continue
+            for stmt in _split_statements(migration.sql):
+                conn.execute(stmt)
+            conn.execute(
+                "INSERT INTO schema_version(version, name, applied_at) VALUES(?, ?, ?)",
+                (
+                    migration.version,
+                    migration.name,
+                    datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+                ),
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        applied.append(migration.version)
+    return applied
+
+
+class PoolTimeoutError(RuntimeError):
+    pass
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    reentrant_checkouts: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+    timeouts: int = 0
+    connections_created: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "reentrant_checkouts": self.reentrant_checkouts,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 6),
+            "timeouts": self.timeouts,
+            "connections_created": self.connections_created,
+        }
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        size: int = 8,
+        busy_timeout_ms: int = 5000,
+        cache_size_kib: int = 16384,
+        mmap_size_bytes: int = 256 * 1024 * 1024,
+        checkout_timeout_seconds: float = 30.0,
+    ):
+        self._path = path
+        self._size = max(1, int(size))
+        self._busy_timeout_ms = int(busy_timeout_ms)
+        self._cache_size_kib = int(cache_size_kib)
+        self._mmap_size_bytes = int(mmap_size_bytes)
+        self._checkout_timeout_seconds = float(checkout_timeout_seconds)
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._all: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = PoolStats()
+
+    @property
+    def size(self) -> int:
+        return self._size
 
-    def connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.path)
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            out = self._stats.as_dict()
+            out["size"] = self._size
+            out["open"] = len(self._all)
+            out["idle"] = self._idle.qsize()
+        return out
+
+    @contextmanager
+    def checkout(self) -> Iterator[sqlite3.Connection]:
+        # Nested checkouts on the same thread reuse the held connection so they share its
+        # transaction instead of competing for another pool slot.
+        held: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if held is not None:
+            self._local.depth += 1
+            with self._lock:
+                self._stats.reentrant_checkouts += 1
+            try:
+                yield held
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        self._local.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            if conn.in_transaction:
+                conn.commit()
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            conns, self._all = self._all, []
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for conn in conns:
+            conn.close()
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+        if conn is None:
+            with self._lock:
+                can_create = len(self._all) < self._size
+                if can_create:
+                    self._stats.connections_created += 1
+            if can_create:
+                conn = self._open()
+                with self._lock:
+                    self._all.append(conn)
+            else:
+                started = time.monotonic()
+                try:
+                    conn = self._idle.get(timeout=self._checkout_timeout_seconds)
+                except queue.Empty:
+                    with self._lock:
+                        self._stats.timeouts += 1
+                    raise PoolTimeoutError("Timed out waiting for a database connection") from None
+                with self._lock:
+                    self._stats.waits += 1
+                    self._stats.wait_seconds += time.monotonic() - started
+        with self._lock:
+            self._stats.checkouts += 1
+        return conn
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._path,
+            timeout=self._busy_timeout_ms / 1000.0,
+            check_same_thread=False,
+        )
         conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA busy_timeout = {self._busy_timeout_ms}")
+        conn.execute(f"PRAGMA cache_size = -{self._cache_size_kib}")
+        conn.execute(f"PRAGMA mmap_size = {self._mmap_size_bytes}")
+        conn.execute("PRAGMA temp_store = MEMORY")
         return conn
 
+
+@dataclass(frozen=True)
+class Database:
+    path: Path
+    pool_size: int = 8
+    busy_timeout_ms: int = 5000
+    cache_size_kib: int = 16384
+    mmap_size_bytes: int = 256 * 1024 * 1024
+    _pool: ConnectionPool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        pool = ConnectionPool(
+            self.path,
+            size=self.pool_size,
+            busy_timeout_ms=self.busy_timeout_ms,
+            cache_size_kib=self.cache_size_kib,
+            mmap_size_bytes=self.mmap_size_bytes,
+        )
+        object.__setattr__(self, "_pool", pool)
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        with self._pool.checkout() as conn:
+            yield conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        # Unit of work: every repo call made on this thread inside the block shares one
+        # connection and lands in a single commit (or a single rollback on error).
+        with self.connect() as conn:
+            if conn.in_transaction:
+                yield conn
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+
+    def pool_stats(self) -> dict[str, Any]:
+        return self._pool.stats()
+
+    def close(self) -> None:
+        self._pool.close()
+
     def init(self) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
         with self.connect() as conn:
-            conn.executescript(SCHEMA_SQL)
-            conn.commit()
+            apply_migrations(conn)
+            conn.execute("PRAGMA optimize")
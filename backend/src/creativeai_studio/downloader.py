@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import hashlib
+import socket
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+
+class DownloadError(RuntimeError):
+    pass
+
+
+class DownloadTooLargeError(DownloadError):
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Download exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+@dataclass(frozen=True)
+class DownloadProgress:
+    bytes_done: int
+    total_bytes: int | None
+    bytes_per_second: float
+
+    @property
+    def fraction(self) -> float | None:
+        if not self.total_bytes:
+            return None
+        return min(1.0, self.bytes_done / self.total_bytes)
+
+
+@dataclass(frozen=True)
+class DownloadResult:
+    path: Path
+    size_bytes: int
+    sha256: str
+    content_type: str | None
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, urllib.error.HTTPError):
+        return exc.code >= 500 or exc.code in (408, 429)
+    return isinstance(exc, (urllib.error.URLError, socket.timeout, TimeoutError, ConnectionError))
+
+
+class Downloader:
+    def __init__(
+        self,
+        *,
+        chunk_size: int = 1024 * 1024,
+        timeout_seconds: float = 60.0,
+        max_bytes: int = 2 * 1024 * 1024 * 1024,
+        max_attempts: int = 3,
+        backoff_seconds: float = 0.5,
+        progress_interval_seconds: float = 1.0,
+        opener: Callable[..., Any] = urllib.request.urlopen,
+    ):
+        self._chunk_size = chunk_size
+        self._timeout_seconds = timeout_seconds
+        self._max_bytes = max_bytes
+        self._max_attempts = max(1, max_attempts)
+        self._backoff_seconds = backoff_seconds
+        self._progress_interval_seconds = progress_interval_seconds
+        self._opener = opener
+
+    def download(
+        self,
+        url: str,
+        dest: Path,
+        *,
+        on_progress: Callable[[DownloadProgress], None] | None = None,
+    ) -> DownloadResult:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        done = 0
+        total: int | None = None
+        content_type: str | None = None
+        # ETag or Last-Modified of the response being resumed; sent as If-Range so a changed
+        # object comes back whole (200) instead of being stitched onto the old bytes.
+        validator: str | None = None
+        started = time.monotonic()
+        last_report = started
+
+        with dest.open("wb") as out:
+            attempt = 0
+            while True:
+                attempt += 1
+                req = urllib.request.Request(url)
+                if done and validator:
+                    req.add_header("Range", f"bytes={done}-")
+                    req.add_header("If-Range", validator)
+                try:
+                    with self._opener(req, timeout=self._timeout_seconds) as resp:
+                        status = getattr(resp, "status", 200)
+                        if done and status != 206:
+                            # The server ignored Range, the object changed, or there was nothing
+                            # to resume against; start over rather than corrupt the file.
+                            out.seek(0)
+                            out.truncate()
+                            digest = hashlib.sha256()
+                            done = 0
+                        if not done:
+                            validator = self._validator(resp)
+                        content_type = content_type or resp.headers.get_content_type()
+                        total = self._expected_total(resp, done) or total
+                        if total is not None and total > self._max_bytes:
+                            raise DownloadTooLargeError(self._max_bytes)
+
+                        while True:
+                            chunk = resp.read(self._chunk_size)
+                            if not chunk:
+                                break
+                            done += len(chunk)
+                            if done > self._max_bytes:
+                                raise DownloadTooLargeError(self._max_bytes)
+                            digest.update(chunk)
+                            out.write(chunk)
+
+                            now = time.monotonic()
+                            if on_progress is not None and now - last_report >= self._progress_interval_seconds:
+                                last_report = now
+                                on_progress(DownloadProgress(done, total, done / max(now - started, 1e-6)))
+
+                    if total is not None and done < total:
+                        raise ConnectionError(f"Connection closed after {done} of {total} bytes")
+                    break
+                except DownloadError:
+                    raise
+                except Exception as e:  # noqa: BLE001
+                    if attempt >= self._max_attempts or not _is_retryable(e):
+                        raise DownloadError(f"Download failed after {attempt} attempt(s): {e}") from e
+                    out.flush()
+                    time.sleep(self._backoff_seconds * (2 ** (attempt - 1)))
+
+        if on_progress is not None:
+            elapsed = max(time.monotonic() - started, 1e-6)
+            on_progress(DownloadProgress(done, total or done, done / elapsed))
+        return DownloadResult(path=dest, size_bytes=done, sha256=digest.hexdigest(), content_type=content_type)
+
+    @staticmethod
+    def _validator(resp: Any) -> str | None:
+        # If-Range only works with a strong validator; a weak ETag would never match.
+        etag = resp.headers.get("ETag")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return resp.headers.get("Last-Modified")
+
+    @staticmethod
+    def _expected_total(resp: Any, done: int) -> int | None:
+        content_range = resp.headers.get("Content-Range")
+        if content_range and "/" in content_range:
+            size = content_range.rsplit("/", 1)[1].strip()
+            if size.isdigit():
+                return int(size)
+        length = resp.headers.get("Content-Length")
+        if length and length.isdigit():
+            return done + int(length)
+        return None
@@ -3,8 +3,6 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
-from google.cloud import storage
-
 
 def parse_gs_uri(gs_uri: str) -> tuple[str, str]:
     if not gs_uri.startswith("gs://"):
@@ -18,6 +16,9 @@ def parse_gs_uri(gs_uri: str) -> tuple[str, str]:
 
 class GcsClient:
     def __init__(self, *, project: str | None, credentials: Any):
+        # Imported here so importing this module does not pull in the GCS SDK.
+        from google.cloud import storage
+
         self._client = storage.Client(project=project, credentials=credentials)
 
     def upload_file(self, bucket: str, object_name: str, local_path: Path) -> str:
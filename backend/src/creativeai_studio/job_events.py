@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from creativeai_studio.repositories.job_assets_repo import JobAssetsRepo
+from creativeai_studio.repositories.jobs_repo import JobsRepo
+
+TERMINAL_JOB_STATUSES = frozenset({"succeeded", "failed", "canceled"})
+
+
+@dataclass(eq=False)
+class JobSubscription:
+    job_ids: frozenset[str]
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue[dict[str, Any]] = field(default_factory=lambda: asyncio.Queue(maxsize=64))
+
+    async def get(self) -> dict[str, Any]:
+        return await self.queue.get()
+
+    def _offer(self, event: dict[str, Any]) -> None:
+        # Events are full job snapshots, so a slow consumer only needs the newest ones.
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(event)
+
+
+class JobEventBus:
+    def __init__(self, jobs: JobsRepo, job_assets: JobAssetsRepo):
+        self._jobs = jobs
+        self._job_assets = job_assets
+        self._lock = threading.Lock()
+        self._by_job: dict[str, set[JobSubscription]] = {}
+        self._published = 0
+
+    def subscribe(self, job_ids: Iterable[str], *, loop: asyncio.AbstractEventLoop) -> JobSubscription:
+        sub = JobSubscription(job_ids=frozenset(job_ids), loop=loop)
+        with self._lock:
+            for job_id in sub.job_ids:
+                self._by_job.setdefault(job_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: JobSubscription) -> None:
+        with self._lock:
+            for job_id in sub.job_ids:
+                subs = self._by_job.get(job_id)
+                if subs is None:
+                    continue
+                subs.discard(sub)
+                if not subs:
+                    del self._by_job[job_id]
+
+    def has_subscribers(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._by_job
+
+    def snapshot(self, job_id: str) -> dict[str, Any] | None:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        return {**job, "job_assets": self._job_assets.list_by_job(job_id)}
+
+    def publish_job(self, job_id: str) -> None:
+        # Nobody is watching most jobs; skip the snapshot read entirely in that case.
+        if not self.has_subscribers(job_id):
+            return
+        snapshot = self.snapshot(job_id)
+        if snapshot is not None:
+            self.publish(snapshot)
+
+    def publish(self, snapshot: dict[str, Any]) -> None:
+        job_id = str(snapshot.get("id") or "")
+        with self._lock:
+            subs = list(self._by_job.get(job_id) or ())
+            self._published += 1
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub._offer, snapshot)
+            except RuntimeError:
+                self.unsubscribe(sub)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "watched_jobs": len(self._by_job),
+                "subscriptions": len({s for subs in self._by_job.values() for s in subs}),
+                "published": self._published,
+            }
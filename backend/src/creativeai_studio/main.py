@@ -10,60 +10,92 @@ from creativeai_studio.api.health import router as health_router
 from creativeai_studio.api.jobs import router as jobs_router
 from creativeai_studio.api.models import router as models_router
 from creativeai_studio.api.settings import router as settings_router
+from creativeai_studio.asset_delivery import AssetDeliveryCache
 from creativeai_studio.asset_store import AssetStore
+from creativeai_studio.client_cache import ProviderClientCache
 from creativeai_studio.config import AppConfig
 from creativeai_studio.db import Database
+from creativeai_studio.job_events import JobEventBus
+from creativeai_studio.reference_cache import ReferenceCache
+from creativeai_studio.renditions import RenditionService
 from creativeai_studio.repositories.assets_repo import AssetsRepo
+from creativeai_studio.repositories.idempotency_repo import IdempotencyKeysRepo
 from creativeai_studio.repositories.job_assets_repo import JobAssetsRepo
 from creativeai_studio.repositories.jobs_repo import JobsRepo
 from creativeai_studio.repositories.settings_repo import SettingsRepo
 from creativeai_studio.providers.google_provider import GoogleProvider
 from creativeai_studio.providers.nano_banana_provider import NanoBananaProvider
+from creativeai_studio.providers.registry import ProviderRegistry
 from creativeai_studio.providers.veo_provider import VeoProvider
 from creativeai_studio.providers.volcengine_ark_provider import VolcengineArkProvider
 from creativeai_studio.runner import JobRunner
 
 
+# Provider SDKs are heavy to import; they load the first time a job needs the provider.
+def _google_provider() -> GoogleProvider:
+    from google import genai
+
+    return GoogleProvider(
+        client_factory=genai.Client,
+        nano_banana_provider=NanoBananaProvider(client_factory=genai.Client),
+        veo_provider=VeoProvider(client_factory=genai.Client),
+    )
+
+
+def _volcengine_ark_provider() -> VolcengineArkProvider:
+    from openai import OpenAI
+
+    return VolcengineArkProvider(client_factory=OpenAI)
+
+
 def create_app(cfg: AppConfig | None = None) -> FastAPI:
     cfg = cfg or AppConfig.from_env()
     cfg.ensure_dirs()
 
-    db = Database(cfg.db_path)
+    db = Database(
+        cfg.db_path,
+        pool_size=cfg.db_pool_size,
+        busy_timeout_ms=cfg.db_busy_timeout_ms,
+        cache_size_kib=cfg.db_cache_size_kib,
+        mmap_size_bytes=cfg.db_mmap_size_bytes,
+    )
     db.init()
 
+    jobs = JobsRepo(db)
+    job_assets = JobAssetsRepo(db)
+    asset_store = AssetStore(cfg.data_dir)
     ctx = AppContext(
         cfg=cfg,
         db=db,
         settings=SettingsRepo(db),
         assets=AssetsRepo(db),
-        jobs=JobsRepo(db),
-        job_assets=JobAssetsRepo(db),
-        asset_store=AssetStore(cfg.data_dir),
+        jobs=jobs,
+        job_assets=job_assets,
+        asset_store=asset_store,
+        events=JobEventBus(jobs=jobs, job_assets=job_assets),
+        clients=ProviderClientCache(max_size=cfg.provider_client_cache_size),
+        renditions=RenditionService(cfg.data_dir, asset_store),
+        asset_paths=AssetDeliveryCache(),
+        references=ReferenceCache(max_bytes=cfg.reference_cache_bytes),
+        idempotency=IdempotencyKeysRepo(db),
     )
 
-    providers: dict[str, object] = {}
-
-    try:
-        from google import genai
-
-        nano_banana_provider = NanoBananaProvider(client_factory=genai.Client)
-        veo_provider = VeoProvider(client_factory=genai.Client)
-        providers["google"] = GoogleProvider(
-            client_factory=genai.Client,
-            nano_banana_provider=nano_banana_provider,
-            veo_provider=veo_provider,
-        )
-    except Exception:  # noqa: BLE001
-        pass
-
-    try:
-        from openai import OpenAI
-
-        providers["volcengine_ark"] = VolcengineArkProvider(client_factory=OpenAI)
-    except Exception:  # noqa: BLE001
-        pass
+    providers = ProviderRegistry(
+        {
+            "google": _google_provider,
+            "volcengine_ark": _volcengine_ark_provider,
+        }
+    )
 
-    runner = JobRunner(ctx, providers=providers, concurrency=1)
+    runner = JobRunner(
+        ctx,
+        providers=providers,
+        concurrency=cfg.runner_concurrency,
+        lane_concurrency=cfg.lane_concurrency,
+        operation_poll_interval_seconds=cfg.video_poll_interval_seconds,
+        operation_timeout_seconds=cfg.video_timeout_seconds,
+        operation_workers=cfg.video_poll_workers,
+    )
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):  # noqa: ARG001
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
-from functools import lru_cache
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
+
+logger = logging.getLogger(__name__)
+
+# Edits to the catalog file are picked up on the next lookup after this many seconds.
+RELOAD_CHECK_INTERVAL_SECONDS = 2.0
+
 
 def _default_catalog_path() -> Path:
     repo_root = Path(__file__).resolve().parents[3]
@@ -18,32 +28,181 @@ def _catalog_path() -> Path:
     return _default_catalog_path()
 
 
-@lru_cache(maxsize=1)
-def _load_catalog() -> list[dict[str, Any]]:
-    path = _catalog_path()
-    raw = json.loads(path.read_text(encoding="utf-8"))
+def parse_aspect_ratio(r: str) -> float | None:
+    if ":" not in r:
+        return None
+    a, b = r.split(":", 1)
+    try:
+        return float(a) / float(b)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+@dataclass(frozen=True)
+class ModelConstraints:
+    # Normalized once at load so validation does set lookups instead of re-parsing the catalog.
+    resolution_presets: frozenset[str]
+    aspect_ratios: tuple[str, ...]
+    aspect_ratio_values: tuple[tuple[str, float], ...]
+    duration_seconds: tuple[int, ...]
+    # Longest edge the model actually looks at; larger references are downsized before sending.
+    reference_image_max_edge: int | None = None
+    # Runs allowed per job, including retries of transient provider errors.
+    retry_max_attempts: int | None = None
+
+
+@dataclass(frozen=True)
+class ModelCatalog:
+    models: tuple[dict[str, Any], ...]
+    by_id: Mapping[str, dict[str, Any]]
+    by_provider: Mapping[str, tuple[dict[str, Any], ...]]
+    by_media_type: Mapping[str, tuple[dict[str, Any], ...]]
+    constraints: Mapping[str, ModelConstraints]
+    path: Path
+    # (mtime_ns, size) of the file this catalog was built from.
+    signature: tuple[int, int]
+
+
+def _constraints_for(idx: int, item: dict[str, Any]) -> ModelConstraints:
+    presets = frozenset(
+        str(v).strip().lower() for v in (item.get("resolution_presets") or []) if str(v).strip()
+    )
+    ratios = tuple(str(r) for r in (item.get("aspect_ratios") or []) if r != "auto")
+    ratio_values = tuple((r, v) for r in ratios if (v := parse_aspect_ratio(r)) is not None)
+    try:
+        durations = tuple(int(v) for v in (item.get("duration_seconds") or []))
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Model catalog entry #{idx} has non-integer duration_seconds") from exc
+    return ModelConstraints(
+        resolution_presets=presets,
+        aspect_ratios=ratios,
+        aspect_ratio_values=ratio_values,
+        duration_seconds=durations,
+        reference_image_max_edge=_positive_int(idx, item, "reference_image_max_edge"),
+        retry_max_attempts=_positive_int(idx, item, "retry_max_attempts"),
+    )
+
+
+def _positive_int(idx: int, item: dict[str, Any], key: str) -> int | None:
+    value = item.get(key)
+    if value is None:
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Model catalog entry #{idx} has non-integer {key}") from exc
+    if value <= 0:
+        raise ValueError(f"Model catalog entry #{idx} {key} must be positive")
+    return value
+
+
+def _group_by(models: tuple[dict[str, Any], ...], key: str) -> Mapping[str, tuple[dict[str, Any], ...]]:
+    groups: dict[str, list[dict[str, Any]]] = {}
+    for m in models:
+        value = m.get(key)
+        if value:
+            groups.setdefault(str(value), []).append(m)
+    return MappingProxyType({k: tuple(v) for k, v in groups.items()})
+
+
+def _file_signature(path: Path) -> tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def build_catalog(raw: Any, path: Path, signature: tuple[int, int] = (0, 0)) -> ModelCatalog:
     if not isinstance(raw, list):
         raise ValueError("Model catalog must be a JSON list")
-    out: list[dict[str, Any]] = []
+    models: list[dict[str, Any]] = []
+    constraints: dict[str, ModelConstraints] = {}
     for idx, item in enumerate(raw):
         if not isinstance(item, dict):
             raise ValueError(f"Model catalog entry #{idx} must be an object")
         if not item.get("model_id"):
             raise ValueError(f"Model catalog entry #{idx} missing model_id")
-        out.append(item)
-    return out
+        models.append(item)
+        constraints[str(item["model_id"])] = _constraints_for(idx, item)
+
+    frozen = tuple(models)
+    return ModelCatalog(
+        models=frozen,
+        by_id=MappingProxyType({str(m["model_id"]): m for m in frozen}),
+        by_provider=_group_by(frozen, "provider_id"),
+        by_media_type=_group_by(frozen, "media_type"),
+        constraints=MappingProxyType(constraints),
+        path=path,
+        signature=signature,
+    )
+
+
+def _read_catalog(path: Path) -> ModelCatalog:
+    signature = _file_signature(path)
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    return build_catalog(raw, path, signature)
+
+
+_lock = threading.Lock()
+_catalog: ModelCatalog | None = None
+_next_check = 0.0
 
 
-def list_models() -> list[dict[str, Any]]:
-    return _load_catalog()
+def get_catalog() -> ModelCatalog:
+    global _catalog, _next_check
+    catalog = _catalog
+    now = time.monotonic()
+    if catalog is not None and now < _next_check:
+        return catalog
+
+    with _lock:
+        if _catalog is not None and now < _next_check:
+            return _catalog
+        path = _catalog_path()
+        if _catalog is None:
+            _catalog = _read_catalog(path)
+        else:
+            try:
+                changed = _catalog.path != path or _catalog.signature != _file_signature(path)
+                if changed:
+                    _catalog = _read_catalog(path)
+                    logger.info("Reloaded model catalog from %s", path)
+            except (OSError, ValueError):
+                # A missing, half-written or invalid file (JSONDecodeError is a ValueError)
+                # keeps the last good catalog in service.
+                logger.warning("Failed to reload model catalog from %s", path, exc_info=True)
+        _next_check = now + RELOAD_CHECK_INTERVAL_SECONDS
+        return _catalog
+
+
+def list_models(provider_id: str | None = None, media_type: str | None = None) -> list[dict[str, Any]]:
+    catalog = get_catalog()
+    models = catalog.models
+    if provider_id is not None:
+        models = catalog.by_provider.get(provider_id, ())
+    if media_type is not None:
+        if provider_id is None:
+            models = catalog.by_media_type.get(media_type, ())
+        else:
+            models = tuple(m for m in models if m.get("media_type") == media_type)
+    return list(models)
 
 
 def get_model(model_id: str) -> dict[str, Any] | None:
-    for m in _load_catalog():
-        if m["model_id"] == model_id:
-            return m
+    return get_catalog().by_id.get(model_id)
+
+
+def get_model_constraints(model_id: str) -> ModelConstraints | None:
+    return get_catalog().constraints.get(model_id)
+
+
+def get_model_display_name(model_id: str) -> str | None:
+    model = get_model(model_id)
+    if model and model.get("display_name"):
+        return str(model["display_name"])
     return None
 
 
 def reload_model_catalog() -> None:
-    _load_catalog.cache_clear()
+    global _catalog, _next_check
+    with _lock:
+        _catalog = None
+        _next_check = 0.0
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 from creativeai_studio.providers.google_provider import GoogleProvider
 from creativeai_studio.providers.nano_banana_provider import NanoBananaProvider
+from creativeai_studio.providers.registry import ProviderRegistry
 from creativeai_studio.providers.veo_provider import VeoProvider
 from creativeai_studio.providers.volcengine_ark_provider import VolcengineArkProvider
 
 __all__ = [
     "GoogleProvider",
     "NanoBananaProvider",
+    "ProviderRegistry",
     "VeoProvider",
     "VolcengineArkProvider",
 ]
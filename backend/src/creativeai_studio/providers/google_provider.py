@@ -74,3 +74,27 @@ class GoogleProvider:
             poll_interval_seconds=poll_interval_seconds,
             max_polls=max_polls,
         )
+
+    def submit_video(
+        self,
+        provider_model: str,
+        prompt: str | None,
+        duration_seconds: int,
+        aspect_ratio: str,
+        *,
+        start_image: dict[str, Any] | None = None,
+        end_image: dict[str, Any] | None = None,
+        client: Any | None = None,
+    ) -> dict[str, Any]:
+        return self._veo_provider.submit_video(
+            provider_model=provider_model,
+            prompt=prompt,
+            duration_seconds=duration_seconds,
+            aspect_ratio=aspect_ratio,
+            start_image=start_image,
+            end_image=end_image,
+            client=client,
+        )
+
+    def poll_video(self, operation_name: str, *, client: Any | None = None) -> dict[str, Any] | None:
+        return self._veo_provider.poll_video(operation_name, client=client)
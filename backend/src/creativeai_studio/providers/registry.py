@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable, Mapping
+
+logger = logging.getLogger(__name__)
+
+_UNAVAILABLE = object()
+
+
+class ProviderRegistry:
+    # Providers are built on first lookup, so a provider's SDK is only imported once a job
+    # actually needs it. A factory that fails (e.g. the SDK is not installed) marks the
+    # provider unavailable instead of breaking startup.
+    def __init__(
+        self,
+        factories: Mapping[str, Callable[[], Any]] | None = None,
+        *,
+        instances: Mapping[str, Any] | None = None,
+    ):
+        self._lock = threading.Lock()
+        self._factories: dict[str, Callable[[], Any]] = dict(factories or {})
+        self._instances: dict[str, Any] = dict(instances or {})
+
+    def register(self, provider_id: str, factory: Callable[[], Any]) -> None:
+        with self._lock:
+            self._factories[provider_id] = factory
+            self._instances.pop(provider_id, None)
+
+    def get(self, provider_id: str) -> Any | None:
+        instance = self._instances.get(provider_id)
+        if instance is None:
+            instance = self._load(provider_id)
+        return None if instance is _UNAVAILABLE else instance
+
+    def _load(self, provider_id: str) -> Any:
+        with self._lock:
+            instance = self._instances.get(provider_id)
+            if instance is not None:
+                return instance
+            factory = self._factories.get(provider_id)
+            if factory is None:
+                return None
+            try:
+                instance = factory()
+            except Exception:  # noqa: BLE001
+                logger.warning("Provider %s is unavailable", provider_id, exc_info=True)
+                instance = _UNAVAILABLE
+            self._instances[provider_id] = instance
+            return instance
+
+    def __contains__(self, provider_id: object) -> bool:
+        return provider_id in self._factories or provider_id in self._instances
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            ids = sorted(set(self._factories) | set(self._instances))
+            return {
+                pid: (
+                    "unavailable"
+                    if self._instances.get(pid) is _UNAVAILABLE
+                    else "loaded"
+                    if pid in self._instances
+                    else "deferred"
+                )
+                for pid in ids
+            }
@@ -21,9 +21,74 @@ class VeoProvider:
         poll_interval_seconds: float = 10.0,
         max_polls: int = 120,
     ) -> dict[str, Any]:
+        client = client or self._client_factory()
+        operation = self._start_operation(
+            client=client,
+            provider_model=provider_model,
+            prompt=prompt,
+            duration_seconds=duration_seconds,
+            aspect_ratio=aspect_ratio,
+            start_image=start_image,
+            end_image=end_image,
+        )
+        polls = 0
+        while not operation.done:
+            if polls >= max_polls:
+                raise TimeoutError("Video generation timed out")
+            if poll_interval_seconds:
+                time.sleep(poll_interval_seconds)
+            operation = client.operations.get(operation)
+            polls += 1
+
+        return self._operation_output(client=client, operation=operation)
+
+    def submit_video(
+        self,
+        provider_model: str,
+        prompt: str | None,
+        duration_seconds: int,
+        aspect_ratio: str,
+        *,
+        start_image: dict[str, Any] | None = None,
+        end_image: dict[str, Any] | None = None,
+        client: Any | None = None,
+    ) -> dict[str, Any]:
+        client = client or self._client_factory()
+        operation = self._start_operation(
+            client=client,
+            provider_model=provider_model,
+            prompt=prompt,
+            duration_seconds=duration_seconds,
+            aspect_ratio=aspect_ratio,
+            start_image=start_image,
+            end_image=end_image,
+        )
+        name = getattr(operation, "name", None)
+        if not isinstance(name, str) or not name:
+            raise RuntimeError("Video operation has no name")
+        return {"operation_name": name}
+
+    def poll_video(self, operation_name: str, *, client: Any | None = None) -> dict[str, Any] | None:
         from google.genai import types
 
         client = client or self._client_factory()
+        operation = client.operations.get(types.GenerateVideosOperation(name=operation_name))
+        if not operation.done:
+            return None
+        return self._operation_output(client=client, operation=operation)
+
+    @staticmethod
+    def _start_operation(
+        *,
+        client: Any,
+        provider_model: str,
+        prompt: str | None,
+        duration_seconds: int,
+        aspect_ratio: str,
+        start_image: dict[str, Any] | None,
+        end_image: dict[str, Any] | None,
+    ) -> Any:
+        from google.genai import types
 
         source = types.GenerateVideosSource(prompt=prompt) if prompt else types.GenerateVideosSource()
         if start_image:
@@ -39,15 +104,13 @@ class VeoProvider:
                 mime_type=end_image.get("mime_type"),
             )
 
-        operation = client.models.generate_videos(model=provider_model, source=source, config=config)
-        polls = 0
-        while not operation.done:
-            if polls >= max_polls:
-                raise TimeoutError("Video generation timed out")
-            if poll_interval_seconds:
-                time.sleep(poll_interval_seconds)
-            operation = client.operations.get(operation)
-            polls += 1
+        return client.models.generate_videos(model=provider_model, source=source, config=config)
+
+    @classmethod
+    def _operation_output(cls, *, client: Any, operation: Any) -> dict[str, Any]:
+        error = getattr(operation, "error", None)
+        if isinstance(error, dict) and error:
+            raise RuntimeError(f"Video generation failed: {error}")
 
         op_result = getattr(operation, "result", None) or getattr(operation, "response", None)
         generated_videos = getattr(op_result, "generated_videos", None) or []
@@ -58,7 +121,7 @@ class VeoProvider:
         video = getattr(generated_video, "video", generated_video)
         video_bytes = getattr(video, "video_bytes", None)
         if not isinstance(video_bytes, (bytes, bytearray, memoryview)):
-            downloaded_bytes = self._download_video_bytes_with_client(client=client, video=video)
+            downloaded_bytes = cls._download_video_bytes_with_client(client=client, video=video)
             if downloaded_bytes is not None:
                 return {"bytes": downloaded_bytes, "mime_type": getattr(video, "mime_type", "video/mp4")}
 
@@ -5,6 +5,9 @@ from typing import Any, Callable
 
 
 class VolcengineArkProvider:
+    # References are sent as data URLs; the runner caches them per asset via encode_reference.
+    reference_encodings = ("data_url",)
+
     def __init__(
         self,
         client_factory: Callable[..., Any],
@@ -17,6 +20,11 @@ class VolcengineArkProvider:
     def make_client_api_key(self, api_key: str):
         return self._client_factory(base_url=self._base_url, api_key=api_key)
 
+    def encode_reference(self, kind: str, data: bytes, mime_type: str) -> str:
+        if kind != "data_url":
+            raise ValueError(f"Unsupported reference encoding: {kind}")
+        return self._to_data_url(data, mime_type)
+
     def generate_image(
         self,
         provider_model: str,
@@ -171,6 +179,9 @@ class VolcengineArkProvider:
         refs: list[str] = []
         if reference_images:
             for ref in reference_images:
+                if isinstance(ref.get("data_url"), str):
+                    refs.append(ref["data_url"])
+                    continue
                 data = ref.get("bytes")
                 if not isinstance(data, (bytes, bytearray, memoryview)):
                     continue
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+# (asset_id, content version, kind): "bytes" for the raw file, otherwise a provider encoding.
+_Key = tuple[str, str, str]
+
+
+class ReferenceCache:
+    # Byte-budgeted LRU of reference image payloads shared by every job in the process.
+    # Keys include the asset's content hash, so a changed file can never be served stale.
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self._max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[_Key, tuple[bytes | str, int]] = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_bytes(self, asset_id: str, version: str, load: Callable[[], bytes]) -> bytes:
+        value = self._get_or_create((asset_id, version, "bytes"), load)
+        assert isinstance(value, bytes)
+        return value
+
+    def get_encoded(self, asset_id: str, version: str, kind: str, encode: Callable[[], str]) -> str:
+        value = self._get_or_create((asset_id, version, kind), encode)
+        assert isinstance(value, str)
+        return value
+
+    def invalidate(self, asset_id: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == asset_id]:
+                _, size = self._entries.pop(key)
+                self._size_bytes -= size
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size_bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    def _get_or_create(self, key: _Key, create: Callable[[], bytes | str]) -> bytes | str:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        # Loaded outside the lock; two concurrent misses for one key both read, one copy is kept.
+        value = create()
+        size = len(value)
+        if size > self._max_bytes:
+            return value
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._size_bytes += size
+            while self._size_bytes > self._max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted
+                self._evictions += 1
+        return value
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+from PIL import Image, ImageOps, features
+
+from creativeai_studio.asset_store import AssetStore
+
+logger = logging.getLogger(__name__)
+
+# Requested widths snap up to one of these so the cache stays small and URLs stay shareable.
+THUMBNAIL_WIDTHS = (128, 256, 512, 1024)
+DEFAULT_THUMBNAIL_WIDTH = 256
+PREWARM_WIDTHS = (DEFAULT_THUMBNAIL_WIDTH,)
+
+
+def snap_width(width: int | None) -> int:
+    if width is None:
+        return DEFAULT_THUMBNAIL_WIDTH
+    for w in THUMBNAIL_WIDTHS:
+        if width <= w:
+            return w
+    return THUMBNAIL_WIDTHS[-1]
+
+
+# A tile that failed to render (e.g. no ffmpeg for a video poster) is not retried for this
+# long, so grid requests do not start a doomed subprocess for every view.
+RENDER_FAILURE_RETRY_SECONDS = 600.0
+MAX_RENDER_FAILURES = 4096
+
+# Downsized references keep transparency as PNG; everything else becomes a JPEG.
+_REFERENCE_FORMATS = (("JPEG", ".jpg", "image/jpeg"), ("PNG", ".png", "image/png"))
+
+
+def _thumbnail_format() -> tuple[str, str, str]:
+    if features.check("webp"):
+        return "WEBP", ".webp", "image/webp"
+    return "JPEG", ".jpg", "image/jpeg"
+
+
+@dataclass
+class _KeyLock:
+    lock: threading.Lock
+    users: int = 0
+
+
+class RenditionService:
+    def __init__(self, data_dir: Path, asset_store: AssetStore, *, workers: int = 2):
+        self._root = data_dir / "renditions"
+        # Not data/tmp: that is the asset store's staging area, and poster frames extracted by
+        # a background prewarm should not show up among its in-flight downloads.
+        self._tmp_dir = self._root / ".tmp"
+        self._asset_store = asset_store
+        self._format, self._ext, self.mime_type = _thumbnail_format()
+        self._workers = max(1, int(workers))
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._key_locks: dict[tuple[str, int | str], _KeyLock] = {}
+        # Oldest failure first, so expired entries and the overflow both come off the front.
+        self._failures: OrderedDict[tuple[str, int], float] = OrderedDict()
+
+    def path_for(self, asset_id: str, width: int) -> Path:
+        return self._root / asset_id / f"w{width}{self._ext}"
+
+    def get_or_create(self, asset: dict[str, Any], width: int | None = None) -> Path | None:
+        width = snap_width(width)
+        out = self.path_for(str(asset["id"]), width)
+        if out.exists():
+            return out
+
+        # One generator per (asset, width); a prewarm and a request for the same tile share the work.
+        key = (str(asset["id"]), width)
+        if self._recently_failed(key):
+            return None
+        with self._key_lock(key):
+            if not out.exists() and not self._recently_failed(key):
+                try:
+                    self._render(asset, width, out)
+                except Exception:  # noqa: BLE001
+                    logger.exception("Failed to render %spx thumbnail for asset %s", width, key[0])
+                    self._record_failure(key)
+        return out if out.exists() else None
+
+    def get_reference(self, asset: dict[str, Any], max_edge: int) -> tuple[Path, str] | None:
+        # A copy no larger than max_edge on either side, or None when the original already fits.
+        width, height = asset.get("width"), asset.get("height")
+        if width and height and max(int(width), int(height)) <= max_edge:
+            return None
+
+        asset_id = str(asset["id"])
+        # The content hash is part of the name so a replaced original never reuses an old copy.
+        version = str(asset.get("content_hash") or "")[:16]
+        stem = f"ref{max_edge}-{version}" if version else f"ref{max_edge}"
+        found = self._find_reference(asset_id, stem)
+        if found is not None:
+            return found
+
+        try:
+            with self._key_lock((asset_id, stem)):
+                found = self._find_reference(asset_id, stem)
+                if found is None:
+                    found = self._render_reference(asset, max_edge, stem)
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to downsize reference image %s; sending the original", asset_id)
+            return None
+        return found
+
+    def _find_reference(self, asset_id: str, stem: str) -> tuple[Path, str] | None:
+        for _, ext, mime_type in _REFERENCE_FORMATS:
+            path = self._root / asset_id / f"{stem}{ext}"
+            if path.exists():
+                return path, mime_type
+        return None
+
+    def _render_reference(
+        self, asset: dict[str, Any], max_edge: int, stem: str
+    ) -> tuple[Path, str] | None:
+        src = self._asset_store.resolve(str(asset["file_path"]))
+        with Image.open(src) as img:
+            if max(img.size) <= max_edge:
+                return None
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+            has_alpha = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+            fmt, ext, mime_type = _REFERENCE_FORMATS[1] if has_alpha else _REFERENCE_FORMATS[0]
+            img = img.convert("RGBA" if has_alpha else "RGB")
+            out = self._root / str(asset["id"]) / f"{stem}{ext}"
+            self._save_atomic(img, out, fmt, quality=90)
+        return out, mime_type
+
+    def prewarm(self, asset: dict[str, Any], widths: tuple[int, ...] = PREWARM_WIDTHS) -> Future | None:
+        if asset.get("media_type") not in ("image", "video"):
+            return None
+        return self._get_executor().submit(self._prewarm, dict(asset), widths)
+
+    def _prewarm(self, asset: dict[str, Any], widths: tuple[int, ...]) -> None:
+        for w in widths:
+            self.get_or_create(asset, w)
+
+    def _render(self, asset: dict[str, Any], width: int, out: Path) -> None:
+        src = self._asset_store.resolve(str(asset["file_path"]))
+        if asset.get("media_type") == "video":
+            frame = self._extract_poster_frame(src, asset.get("duration_seconds"))
+            try:
+                self._write_thumbnail(frame, width, out)
+            finally:
+                frame.unlink(missing_ok=True)
+        else:
+            self._write_thumbnail(src, width, out)
+
+    def _write_thumbnail(self, src: Path, width: int, out: Path) -> None:
+        with Image.open(src) as img:
+            img = ImageOps.exif_transpose(img)
+            if img.width > width:
+                height = max(1, round(img.height * width / img.width))
+                img = img.resize((width, height), Image.Resampling.LANCZOS)
+            if self._format == "JPEG" or img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGB" if self._format == "JPEG" else "RGBA")
+            self._save_atomic(img, out, self._format, quality=80)
+
+    @staticmethod
+    def _save_atomic(img: Image.Image, out: Path, fmt: str, **params: Any) -> None:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(suffix=out.suffix, dir=out.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                img.save(f, format=fmt, **params)
+            os.replace(tmp_name, out)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _extract_poster_frame(self, src: Path, duration_seconds: Any) -> Path:
+        # Skip the first instants, which are often black, but stay inside very short clips.
+        try:
+            offset = min(1.0, float(duration_seconds) / 2)
+        except (TypeError, ValueError):
+            offset = 0.0
+        self._tmp_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(suffix=".png", dir=self._tmp_dir)
+        os.close(fd)
+        cmd = [
+            "ffmpeg",
+            "-v",
+            "error",
+            "-y",
+            "-ss",
+            f"{offset:.2f}",
+            "-i",
+            str(src),
+            "-frames:v",
+            "1",
+            tmp_name,
+        ]
+        try:
+            subprocess.run(cmd, check=True, capture_output=True, timeout=60)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return Path(tmp_name)
+
+    def _recently_failed(self, key: tuple[str, int]) -> bool:
+        with self._lock:
+            failed_at = self._failures.get(key)
+            if failed_at is None:
+                return False
+            if time.monotonic() - failed_at < RENDER_FAILURE_RETRY_SECONDS:
+                return True
+            del self._failures[key]
+            return False
+
+    def _record_failure(self, key: tuple[str, int]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._failures[key] = now
+            self._failures.move_to_end(key)
+            while self._failures:
+                oldest_key, failed_at = next(iter(self._failures.items()))
+                expired = now - failed_at >= RENDER_FAILURE_RETRY_SECONDS
+                if not expired and len(self._failures) <= MAX_RENDER_FAILURES:
+                    break
+                del self._failures[oldest_key]
+
+    @contextmanager
+    def _key_lock(self, key: tuple[str, int | str]) -> Iterator[None]:
+        # The entry is dropped by the last user only; dropping it while others still wait
+        # would let a newcomer create a second lock and render the same file again.
+        with self._lock:
+            entry = self._key_locks.get(key)
+            if entry is None:
+                entry = self._key_locks[key] = _KeyLock(threading.Lock())
+            entry.users += 1
+        try:
+            with entry.lock:
+                yield
+        finally:
+            with self._lock:
+                entry.users -= 1
+                if entry.users == 0:
+                    self._key_locks.pop(key, None)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="renditions")
+            return self._executor
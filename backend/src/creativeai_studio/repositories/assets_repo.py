@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from typing import Any
 
 from creativeai_studio.db import Database
+from creativeai_studio.repositories.pagination import decode_cursor, keyset_page
 
 
 def _now_iso() -> str:
@@ -31,6 +32,7 @@ class AssetsRepo:
         width: int | None = None,
         height: int | None = None,
         duration_seconds: float | None = None,
+        content_hash: str | None = None,
     ) -> dict[str, Any]:
         created_at = _now_iso()
         with self._db.connect() as conn:
@@ -40,9 +42,9 @@ class AssetsRepo:
                   id, media_type, origin, file_path, mime_type, size_bytes,
                   width, height, duration_seconds,
                   parent_asset_id, source_job_id,
-                  metadata_json, created_at
+                  metadata_json, content_hash, created_at
                 )
-                VALUES(?, ?, 'upload', ?, ?, ?, ?, ?, ?, NULL, NULL, '{}', ?)
+                VALUES(?, ?, 'upload', ?, ?, ?, ?, ?, ?, NULL, NULL, '{}', ?, ?)
                 """,
                 (
                     asset_id,
@@ -53,11 +55,11 @@ class AssetsRepo:
                     width,
                     height,
                     duration_seconds,
+                    content_hash,
                     created_at,
                 ),
             )
             row = conn.execute("SELECT * FROM assets WHERE id = ?", (asset_id,)).fetchone()
-            conn.commit()
         assert row is not None
         return _row_to_asset(row)
 
@@ -73,71 +75,116 @@ class AssetsRepo:
         width: int | None = None,
         height: int | None = None,
         duration_seconds: float | None = None,
+        content_hash: str | None = None,
     ) -> dict[str, Any]:
+        return self.insert_generated_many(
+            [
+                {
+                    "asset_id": asset_id,
+                    "media_type": media_type,
+                    "file_path": file_path,
+                    "mime_type": mime_type,
+                    "size_bytes": size_bytes,
+                    "source_job_id": source_job_id,
+                    "parent_asset_id": parent_asset_id,
+                    "width": width,
+                    "height": height,
+                    "duration_seconds": duration_seconds,
+                    "content_hash": content_hash,
+                }
+            ]
+        )[0]
+
+    def insert_generated_many(self, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if not rows:
+            return []
         created_at = _now_iso()
+        asset_ids = [str(r["asset_id"]) for r in rows]
         with self._db.connect() as conn:
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT INTO assets(
                   id, media_type, origin, file_path, mime_type, size_bytes,
                   width, height, duration_seconds,
                   parent_asset_id, source_job_id,
-                  metadata_json, created_at
+                  metadata_json, content_hash, created_at
                 )
-                VALUES(?, ?, 'generated', ?, ?, ?, ?, ?, ?, ?, ?, '{}', ?)
+                VALUES(?, ?, 'generated', ?, ?, ?, ?, ?, ?, ?, ?, '{}', ?, ?)
                 """,
-                (
-                    asset_id,
-                    media_type,
-                    file_path,
-                    mime_type,
-                    size_bytes,
-                    width,
-                    height,
-                    duration_seconds,
-                    parent_asset_id,
-                    source_job_id,
-                    created_at,
-                ),
+                [
+                    (
+                        r["asset_id"],
+                        r["media_type"],
+                        r["file_path"],
+                        r["mime_type"],
+                        r["size_bytes"],
+                        r.get("width"),
+                        r.get("height"),
+                        r.get("duration_seconds"),
+                        r.get("parent_asset_id"),
+                        r["source_job_id"],
+                        r.get("content_hash"),
+                        created_at,
+                    )
+                    for r in rows
+                ],
             )
-            row = conn.execute("SELECT * FROM assets WHERE id = ?", (asset_id,)).fetchone()
-            conn.commit()
-        assert row is not None
+            placeholders = ", ".join("?" for _ in asset_ids)
+            fetched = conn.execute(f"SELECT * FROM assets WHERE id IN ({placeholders})", asset_ids).fetchall()
+        by_id = {row["id"]: _row_to_asset(row) for row in fetched}
+        return [by_id[asset_id] for asset_id in asset_ids]
+
+    def get(self, asset_id: str, *, include_source_model: bool = False) -> dict[str, Any] | None:
+        with self._db.connect() as conn:
+            row = conn.execute(
+                f"SELECT {self._select_columns(include_source_model)} WHERE a.id = ?",
+                (asset_id,),
+            ).fetchone()
+        if row is None:
+            return None
         return _row_to_asset(row)
 
-    def get(self, asset_id: str) -> dict[str, Any] | None:
+    def find_by_content_hash(self, content_hash: str) -> dict[str, Any] | None:
         with self._db.connect() as conn:
-            row = conn.execute("SELECT * FROM assets WHERE id = ?", (asset_id,)).fetchone()
+            row = conn.execute(
+                """
+                SELECT a.* FROM assets AS a
+                WHERE a.content_hash = ?
+                ORDER BY a.created_at, a.id
+                LIMIT 1
+                """,
+                (content_hash,),
+            ).fetchone()
         if row is None:
             return None
         return _row_to_asset(row)
 
+    def set_content_hash(self, asset_id: str, content_hash: str) -> None:
+        with self._db.connect() as conn:
+            conn.execute(
+                "UPDATE assets SET content_hash = ? WHERE id = ? AND content_hash IS NULL",
+                (content_hash, asset_id),
+            )
+
     def list(
         self,
         media_type: str | None = None,
         origin: str | None = None,
         limit: int = 50,
         offset: int = 0,
+        *,
+        include_source_model: bool = False,
     ) -> list[dict[str, Any]]:
-        where = []
-        params: list[Any] = []
-
-        if media_type is not None:
-            where.append("media_type = ?")
-            params.append(media_type)
-        if origin is not None:
-            where.append("origin = ?")
-            params.append(origin)
-
+        where, params = self._list_filters(media_type=media_type, origin=origin)
         where_sql = f"WHERE {' AND '.join(where)}" if where else ""
         params.extend([limit, offset])
 
         with self._db.connect() as conn:
             rows = conn.execute(
                 f"""
-                SELECT * FROM assets
+                SELECT {self._select_columns(include_source_model)}
                 {where_sql}
-                ORDER BY created_at DESC
+                ORDER BY a.created_at DESC, a.id DESC
                 LIMIT ? OFFSET ?
                 """,
                 params,
@@ -145,3 +192,61 @@ class AssetsRepo:
 
         return [_row_to_asset(r) for r in rows]
 
+    def list_page(
+        self,
+        media_type: str | None = None,
+        origin: str | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+        *,
+        include_source_model: bool = False,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        where, params = self._list_filters(media_type=media_type, origin=origin)
+        if cursor:
+            created_at, asset_id = decode_cursor(cursor)
+            where.append("(a.created_at, a.id) < (?, ?)")
+            params.extend([created_at, asset_id])
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+        params.append(limit + 1)
+
+        with self._db.connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT {self._select_columns(include_source_model)}
+                {where_sql}
+                ORDER BY a.created_at DESC, a.id DESC
+                LIMIT ?
+                """,
+                params,
+            ).fetchall()
+
+        page, next_cursor = keyset_page(rows, limit)
+        return [_row_to_asset(r) for r in page], next_cursor
+
+    @staticmethod
+    def _select_columns(include_source_model: bool) -> str:
+        # The source job's model_id comes from a PK lookup on jobs in the same query, so
+        # list pages never fan out into per-asset job reads.
+        if include_source_model:
+            return (
+                "a.*, j.model_id AS source_model_id FROM assets AS a "
+                "LEFT JOIN jobs AS j ON j.id = a.source_job_id"
+            )
+        return "a.* FROM assets AS a"
+
+    @staticmethod
+    def _list_filters(
+        *,
+        media_type: str | None,
+        origin: str | None,
+    ) -> tuple[list[str], list[Any]]:
+        where: list[str] = []
+        params: list[Any] = []
+
+        if media_type is not None:
+            where.append("a.media_type = ?")
+            params.append(media_type)
+        if origin is not None:
+            where.append("a.origin = ?")
+            params.append(origin)
+        return where, params
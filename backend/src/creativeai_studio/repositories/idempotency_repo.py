@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from creativeai_studio.db import Database
+
+
+def _iso(dt: datetime) -> str:
+    return dt.replace(microsecond=0).isoformat()
+
+
+class IdempotencyKeysRepo:
+    def __init__(self, db: Database):
+        self._db = db
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        # Expired records are treated as absent even before they are purged.
+        with self._db.connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM idempotency_keys WHERE key = ? AND expires_at > ?",
+                (key, _iso(datetime.now(timezone.utc))),
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def put(
+        self,
+        key: str,
+        request_hash: str,
+        *,
+        ttl_seconds: float,
+        job_id: str | None = None,
+        batch_id: str | None = None,
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        with self._db.connect() as conn:
+            # Purging here keeps the table bounded without a sweeper and frees an expired key
+            # for reuse; the primary key still rejects a live duplicate.
+            conn.execute("DELETE FROM idempotency_keys WHERE expires_at <= ?", (_iso(now),))
+            conn.execute(
+                """
+                INSERT INTO idempotency_keys(
+                  key, request_hash, job_id, batch_id, created_at, expires_at
+                )
+                VALUES(?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key,
+                    request_hash,
+                    job_id,
+                    batch_id,
+                    _iso(now),
+                    _iso(now + timedelta(seconds=ttl_seconds)),
+                ),
+            )
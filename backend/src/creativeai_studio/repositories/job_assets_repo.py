@@ -15,7 +15,23 @@ class JobAssetsRepo:
                 "INSERT OR IGNORE INTO job_assets(job_id, asset_id, role) VALUES(?, ?, ?)",
                 (job_id, asset_id, role),
             )
-            conn.commit()
+
+    def add_many(self, job_id: str, asset_ids: list[str], role: str) -> None:
+        with self._db.connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO job_assets(job_id, asset_id, role) VALUES(?, ?, ?)",
+                [(job_id, asset_id, role) for asset_id in asset_ids],
+            )
+
+    def add_links(self, links: list[tuple[str, str, str]]) -> None:
+        # (job_id, asset_id, role) rows for several jobs at once, e.g. a batch submission.
+        if not links:
+            return
+        with self._db.connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO job_assets(job_id, asset_id, role) VALUES(?, ?, ?)",
+                links,
+            )
 
     def list_by_job(self, job_id: str) -> list[dict[str, Any]]:
         with self._db.connect() as conn:
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from creativeai_studio.db import Database
+from creativeai_studio.repositories.pagination import decode_cursor, keyset_page
 
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
 
+def _iso_after(seconds: float) -> str:
+    return (datetime.now(timezone.utc) + timedelta(seconds=seconds)).replace(microsecond=0).isoformat()
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 def _json_dumps(value: Any) -> str:
     return json.dumps(value, ensure_ascii=False)
 
@@ -23,6 +32,8 @@ def _row_to_job(row: Any) -> dict[str, Any]:
     else:
         d.pop("result_json", None)
         d["result"] = None
+    operation_json = d.pop("provider_operation_json", None)
+    d["provider_operation"] = json.loads(operation_json) if operation_json else None
     return d
 
 
@@ -37,26 +48,65 @@ class JobsRepo:
         model_id: str,
         auth_mode: str,
         params: dict[str, Any],
+        priority: int = 0,
+        lane: str | None = None,
+        batch_id: str | None = None,
+        request_key: str | None = None,
     ) -> dict[str, Any]:
+        return self.create_many(
+            [
+                {
+                    "job_id": job_id,
+                    "job_type": job_type,
+                    "model_id": model_id,
+                    "auth_mode": auth_mode,
+                    "params": params,
+                    "priority": priority,
+                    "lane": lane,
+                    "batch_id": batch_id,
+                    "request_key": request_key,
+                }
+            ]
+        )[0]
+
+    def create_many(self, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if not rows:
+            return []
         created_at = _now_iso()
+        job_ids = [str(r["job_id"]) for r in rows]
         with self._db.connect() as conn:
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT INTO jobs(
                   id, job_type, model_id, auth_mode,
                   status, cancel_requested, progress, status_message,
                   params_json, result_json,
                   error_message, error_detail,
-                  created_at, started_at, finished_at
+                  created_at, started_at, finished_at,
+                  priority, lane, batch_id, request_key
                 )
-                VALUES(?, ?, ?, ?, 'queued', 0, NULL, NULL, ?, NULL, NULL, NULL, ?, NULL, NULL)
+                VALUES(?, ?, ?, ?, 'queued', 0, NULL, NULL, ?, NULL, NULL, NULL, ?, NULL, NULL, ?, ?, ?, ?)
                 """,
-                (job_id, job_type, model_id, auth_mode, _json_dumps(params), created_at),
+                [
+                    (
+                        r["job_id"],
+                        r["job_type"],
+                        r["model_id"],
+                        r["auth_mode"],
+                        _json_dumps(r["params"]),
+                        created_at,
+                        int(r.get("priority") or 0),
+                        r.get("lane"),
+                        r.get("batch_id"),
+                        r.get("request_key"),
+                    )
+                    for r in rows
+                ],
             )
-            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
-            conn.commit()
-        assert row is not None
-        return _row_to_job(row)
+            placeholders = ", ".join("?" for _ in job_ids)
+            fetched = conn.execute(f"SELECT * FROM jobs WHERE id IN ({placeholders})", job_ids).fetchall()
+        by_id = {row["id"]: _row_to_job(row) for row in fetched}
+        return [by_id[job_id] for job_id in job_ids]
 
     def get(self, job_id: str) -> dict[str, Any] | None:
         with self._db.connect() as conn:
@@ -72,8 +122,69 @@ class JobsRepo:
         model_id: str | None = None,
         limit: int = 50,
         offset: int = 0,
+        batch_id: str | None = None,
     ) -> list[dict[str, Any]]:
-        where = []
+        where, params = self._list_filters(
+            status=status, job_type=job_type, model_id=model_id, batch_id=batch_id
+        )
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+        params.extend([limit, offset])
+
+        with self._db.connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT * FROM jobs
+                {where_sql}
+                ORDER BY created_at DESC, id DESC
+                LIMIT ? OFFSET ?
+                """,
+                params,
+            ).fetchall()
+
+        return [_row_to_job(r) for r in rows]
+
+    def list_page(
+        self,
+        status: str | None = None,
+        job_type: str | None = None,
+        model_id: str | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+        batch_id: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        where, params = self._list_filters(
+            status=status, job_type=job_type, model_id=model_id, batch_id=batch_id
+        )
+        if cursor:
+            created_at, job_id = decode_cursor(cursor)
+            where.append("(created_at, id) < (?, ?)")
+            params.extend([created_at, job_id])
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+        params.append(limit + 1)
+
+        with self._db.connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT * FROM jobs
+                {where_sql}
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+                """,
+                params,
+            ).fetchall()
+
+        page, next_cursor = keyset_page(rows, limit)
+        return [_row_to_job(r) for r in page], next_cursor
+
+    @staticmethod
+    def _list_filters(
+        *,
+        status: str | None,
+        job_type: str | None,
+        model_id: str | None,
+        batch_id: str | None = None,
+    ) -> tuple[list[str], list[Any]]:
+        where: list[str] = []
         params: list[Any] = []
 
         if status is not None:
@@ -85,80 +196,373 @@ class JobsRepo:
         if model_id is not None:
             where.append("model_id = ?")
             params.append(model_id)
+        if batch_id is not None:
+            where.append("batch_id = ?")
+            params.append(batch_id)
+        return where, params
 
-        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
-        params.extend([limit, offset])
+    def find_cached_result(self, request_key: str, finished_after: str) -> dict[str, Any] | None:
+        # Newest succeeded job for the same normalized request that still has its outputs linked.
+        with self._db.connect() as conn:
+            row = conn.execute(
+                """
+                SELECT * FROM jobs
+                WHERE request_key = ? AND status = 'succeeded' AND finished_at >= ?
+                  AND EXISTS (
+                    SELECT 1 FROM job_assets
+                    WHERE job_assets.job_id = jobs.id AND job_assets.role = 'output'
+                  )
+                ORDER BY finished_at DESC
+                LIMIT 1
+                """,
+                (request_key, finished_after),
+            ).fetchone()
+        return _row_to_job(row) if row is not None else None
+
+    def list_batch(self, batch_id: str) -> list[dict[str, Any]]:
+        # Submission order: a batch is inserted by one executemany, so rowid follows the request.
+        with self._db.connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE batch_id = ? ORDER BY rowid",
+                (batch_id,),
+            ).fetchall()
+        return [_row_to_job(r) for r in rows]
+
+    def batch_summary(self, batch_id: str) -> dict[str, Any] | None:
+        with self._db.connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT status, COUNT(*) AS n, MIN(created_at) AS created_at, MAX(finished_at) AS finished_at
+                FROM jobs
+                WHERE batch_id = ?
+                GROUP BY status
+                """,
+                (batch_id,),
+            ).fetchall()
+        if not rows:
+            return None
+        counts = {str(r["status"]): int(r["n"]) for r in rows}
+        return {
+            "batch_id": batch_id,
+            "total": sum(counts.values()),
+            "counts": counts,
+            "created_at": min(r["created_at"] for r in rows),
+            "finished_at": max((r["finished_at"] for r in rows if r["finished_at"]), default=None),
+        }
+
+    # Durable queue. A claim flips one queued row to running under a lease in a single
+    # UPDATE, so any number of runner processes can share the database; a lease that is not
+    # renewed by heartbeats expires and the job becomes claimable again.
+
+    def claim_next(
+        self,
+        owner: str,
+        lease_seconds: float,
+        *,
+        lane: str | None = None,
+        exclude_lanes: list[str] | None = None,
+        exclude_providers: list[str] | None = None,
+    ) -> dict[str, Any] | None:
+        # Jobs waiting out a retry backoff stay queued but are not claimable until available_at.
+        where = ["status = 'queued'", "(available_at IS NULL OR available_at <= ?)"]
+        params: list[Any] = [_now_iso()]
+        if lane is not None:
+            where.append("lane = ?")
+            params.append(lane)
+        if exclude_lanes:
+            where.append(f"COALESCE(lane, '') NOT IN ({', '.join('?' for _ in exclude_lanes)})")
+            params.extend(exclude_lanes)
+        for provider_id in exclude_providers or ():
+            # Lanes are "<provider_id>/<job_type>".
+            where.append("COALESCE(lane, '') NOT LIKE ? ESCAPE '\\'")
+            params.append(_like_escape(provider_id) + "/%")
+        pick = f"""
+            SELECT id FROM jobs
+            WHERE {' AND '.join(where)}
+            ORDER BY priority DESC, created_at, id
+            LIMIT 1
+        """
+        return self._claim(pick, params, owner, lease_seconds)
+
+    def claim(self, job_id: str, owner: str, lease_seconds: float) -> dict[str, Any] | None:
+        return self._claim("SELECT ?", [job_id], owner, lease_seconds)
+
+    def _claim(self, pick_sql: str, pick_params: list[Any], owner: str, lease_seconds: float) -> dict[str, Any] | None:
+        now = _now_iso()
+        with self._db.connect() as conn:
+            row = conn.execute(
+                f"""
+                UPDATE jobs
+                SET status = 'running',
+                    lease_owner = ?,
+                    lease_expires_at = ?,
+                    attempts = attempts + 1,
+                    started_at = COALESCE(started_at, ?)
+                WHERE id = ({pick_sql})
+                  AND status = 'queued'
+                  AND (available_at IS NULL OR available_at <= ?)
+                RETURNING *
+                """,
+                [owner, _iso_after(lease_seconds), now, *pick_params, now],
+            ).fetchone()
+        return _row_to_job(row) if row is not None else None
+
+    def claim_operation(self, job_id: str, owner: str, lease_seconds: float) -> dict[str, Any] | None:
+        # Pollers of long-running provider operations lease the job too, so two processes
+        # never poll (and store the output of) the same operation.
+        now = _now_iso()
+        with self._db.connect() as conn:
+            row = conn.execute(
+                """
+                UPDATE jobs
+                SET lease_owner = ?, lease_expires_at = ?
+                WHERE id = ?
+                  AND status = 'running'
+                  AND provider_operation_json IS NOT NULL
+                  AND (lease_expires_at IS NULL OR lease_expires_at < ? OR lease_owner = ?)
+                RETURNING *
+                """,
+                (owner, _iso_after(lease_seconds), job_id, now, owner),
+            ).fetchone()
+        return _row_to_job(row) if row is not None else None
+
+    def renew_leases(self, owner: str, job_ids: list[str], lease_seconds: float) -> int:
+        if not job_ids:
+            return 0
+        with self._db.connect() as conn:
+            cur = conn.execute(
+                f"""
+                UPDATE jobs SET lease_expires_at = ?
+                WHERE lease_owner = ? AND status = 'running' AND id IN ({', '.join('?' for _ in job_ids)})
+                """,
+                [_iso_after(lease_seconds), owner, *job_ids],
+            )
+        return cur.rowcount
+
+    def unclaim(self, job_id: str, owner: str) -> bool:
+        # Hand a claimed job back before it ran: queued again, and the claim's attempt undone.
+        with self._db.connect() as conn:
+            cur = conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'queued', lease_owner = NULL, lease_expires_at = NULL,
+                    attempts = MAX(0, attempts - 1)
+                WHERE id = ? AND lease_owner = ? AND status = 'running'
+                """,
+                (job_id, owner),
+            )
+        return cur.rowcount > 0
+
+    def release_lease(self, job_id: str, owner: str) -> None:
+        with self._db.connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET lease_owner = NULL, lease_expires_at = NULL WHERE id = ? AND lease_owner = ?",
+                (job_id, owner),
+            )
+
+    def schedule_retry(
+        self,
+        job_id: str,
+        owner: str,
+        delay_seconds: float,
+        *,
+        status_message: str | None = None,
+        error_detail: str | None = None,
+    ) -> bool:
+        # Back to the queue after a transient failure, claimable again once the backoff has
+        # passed. Conditional on the lease so a runner that lost the job cannot requeue it.
+        with self._db.connect() as conn:
+            cur = conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'queued', lease_owner = NULL, lease_expires_at = NULL,
+                    progress = NULL, status_message = ?, error_detail = ?, available_at = ?
+                WHERE id = ? AND lease_owner = ? AND status = 'running'
+                """,
+                (status_message, error_detail, _iso_after(delay_seconds), job_id, owner),
+            )
+        return cur.rowcount > 0
+
+    def recover_expired_leases(self, max_attempts: int) -> tuple[list[str], list[str]]:
+        # Running rows whose owner stopped heartbeating: retried while attempts remain,
+        # failed after that. Rows waiting on a provider operation are left to the poller,
+        # and rows with no lease at all predate the queue or were orphaned.
+        now = _now_iso()
+        expired = "status = 'running' AND provider_operation_json IS NULL AND (lease_expires_at IS NULL OR lease_expires_at < ?)"
+        with self._db.transaction() as conn:
+            requeued = conn.execute(
+                f"""
+                UPDATE jobs
+                SET status = 'queued', lease_owner = NULL, lease_expires_at = NULL,
+                    progress = NULL, status_message = '执行中断，重新排队'
+                WHERE {expired} AND attempts < ?
+                RETURNING id
+                """,
+                (now, max_attempts),
+            ).fetchall()
+            failed = conn.execute(
+                f"""
+                UPDATE jobs
+                SET status = 'failed', lease_owner = NULL, lease_expires_at = NULL,
+                    status_message = NULL, error_message = ?, finished_at = ?
+                WHERE {expired}
+                RETURNING id
+                """,
+                (f"runner lost the job after {max_attempts} attempt(s)", now, now),
+            ).fetchall()
+        return [r["id"] for r in requeued], [r["id"] for r in failed]
+
+    def count_queued(self) -> int:
+        with self._db.connect() as conn:
+            row = conn.execute("SELECT COUNT(*) AS n FROM jobs WHERE status = 'queued'").fetchone()
+        return int(row["n"])
 
+    def queue_depths(self) -> dict[str, dict[str, Any]]:
+        with self._db.connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT COALESCE(lane, '') AS lane, COUNT(*) AS depth, MIN(created_at) AS oldest_created_at
+                FROM jobs
+                WHERE status = 'queued'
+                GROUP BY COALESCE(lane, '')
+                """
+            ).fetchall()
+        return {r["lane"]: {"depth": int(r["depth"]), "oldest_created_at": r["oldest_created_at"]} for r in rows}
+
+    def list_pending_operations(
+        self,
+        limit: int = 500,
+        after: tuple[str, str] | None = None,
+    ) -> list[dict[str, Any]]:
+        # Keyset over (started_at, id) so callers can walk every pending operation in pages.
+        where = ""
+        params: list[Any] = [_now_iso()]
+        if after is not None:
+            where = "AND (started_at, id) > (?, ?)"
+            params.extend(after)
+        params.append(limit)
         with self._db.connect() as conn:
             rows = conn.execute(
                 f"""
                 SELECT * FROM jobs
-                {where_sql}
-                ORDER BY created_at DESC
-                LIMIT ? OFFSET ?
+                WHERE status = 'running' AND provider_operation_json IS NOT NULL
+                  AND (lease_expires_at IS NULL OR lease_expires_at < ?)
+                  {where}
+                ORDER BY started_at, id
+                LIMIT ?
                 """,
                 params,
             ).fetchall()
-
         return [_row_to_job(r) for r in rows]
 
-    def set_status(self, job_id: str, status: str, status_message: str | None = None) -> None:
+    def set_provider_operation(
+        self,
+        job_id: str,
+        operation: dict[str, Any],
+        status_message: str | None = None,
+    ) -> None:
+        with self._db.connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET provider_operation_json = ?, status_message = ? WHERE id = ?",
+                (_json_dumps(operation), status_message, job_id),
+            )
+
+    def set_progress(self, job_id: str, progress: float | None, status_message: str | None = None) -> None:
+        with self._db.connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET progress = ?, status_message = ? WHERE id = ?",
+                (progress, status_message, job_id),
+            )
+
+    def set_status(
+        self, job_id: str, status: str, status_message: str | None = None, *, owner: str | None = None
+    ) -> bool:
+        # With `owner`, terminal writes only land while that runner still holds the lease, so a
+        # runner whose lease expired cannot overwrite the job after another one took it over.
         started_at = _now_iso() if status == "running" else None
+        lease_sql, lease_params = self._lease_filter(owner)
         with self._db.connect() as conn:
             if started_at is None:
-                conn.execute(
-                    "UPDATE jobs SET status = ?, status_message = ? WHERE id = ?",
-                    (status, status_message, job_id),
+                cur = conn.execute(
+                    f"""
+                    UPDATE jobs
+                    SET status = ?, status_message = ?, lease_owner = NULL, lease_expires_at = NULL
+                    WHERE id = ?{lease_sql}
+                    """,
+                    (status, status_message, job_id, *lease_params),
                 )
             else:
-                conn.execute(
-                    """
+                cur = conn.execute(
+                    f"""
                     UPDATE jobs
                     SET status = ?, status_message = ?, started_at = COALESCE(started_at, ?)
-                    WHERE id = ?
+                    WHERE id = ?{lease_sql}
                     """,
-                    (status, status_message, started_at, job_id),
+                    (status, status_message, started_at, job_id, *lease_params),
                 )
-            conn.commit()
+        return cur.rowcount > 0
 
-    def set_succeeded(self, job_id: str, result_dict: dict[str, Any]) -> None:
+    def set_succeeded(self, job_id: str, result_dict: dict[str, Any], *, owner: str | None = None) -> bool:
         now = _now_iso()
+        lease_sql, lease_params = self._lease_filter(owner)
         with self._db.connect() as conn:
-            conn.execute(
-                """
+            cur = conn.execute(
+                f"""
                 UPDATE jobs
                 SET status = 'succeeded',
+                    lease_owner = NULL,
+                    lease_expires_at = NULL,
                     status_message = NULL,
                     result_json = ?,
                     error_message = NULL,
                     error_detail = NULL,
                     started_at = COALESCE(started_at, ?),
                     finished_at = ?
-                WHERE id = ?
+                WHERE id = ?{lease_sql}
                 """,
-                (_json_dumps(result_dict), now, now, job_id),
+                (_json_dumps(result_dict), now, now, job_id, *lease_params),
             )
-            conn.commit()
+        return cur.rowcount > 0
 
-    def set_failed(self, job_id: str, message: str, detail: Any | None = None) -> None:
+    def set_failed(
+        self, job_id: str, message: str, detail: Any | None = None, *, owner: str | None = None
+    ) -> bool:
         now = _now_iso()
         error_detail = None if detail is None else (detail if isinstance(detail, str) else _json_dumps(detail))
+        lease_sql, lease_params = self._lease_filter(owner)
         with self._db.connect() as conn:
-            conn.execute(
-                """
+            cur = conn.execute(
+                f"""
                 UPDATE jobs
                 SET status = 'failed',
+                    lease_owner = NULL,
+                    lease_expires_at = NULL,
                     status_message = NULL,
                     result_json = NULL,
                     error_message = ?,
                     error_detail = ?,
                     started_at = COALESCE(started_at, ?),
                     finished_at = ?
-                WHERE id = ?
+                WHERE id = ?{lease_sql}
                 """,
-                (message, error_detail, now, now, job_id),
+                (message, error_detail, now, now, job_id, *lease_params),
+            )
+        return cur.rowcount > 0
+
+    @staticmethod
+    def _lease_filter(owner: str | None) -> tuple[str, tuple[Any, ...]]:
+        if owner is None:
+            return "", ()
+        return " AND lease_owner = ?", (owner,)
+
+    def cancel_if_queued(self, job_id: str) -> bool:
+        # Conditional so a cancel can never overwrite a job a runner has just claimed.
+        with self._db.connect() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = 'canceled' WHERE id = ? AND status = 'queued'",
+                (job_id,),
             )
-            conn.commit()
+        return cur.rowcount > 0
 
     def request_cancel(self, job_id: str) -> None:
         with self._db.connect() as conn:
@@ -166,5 +570,4 @@ class JobsRepo:
                 "UPDATE jobs SET cancel_requested = 1 WHERE id = ?",
                 (job_id,),
             )
-            conn.commit()
 
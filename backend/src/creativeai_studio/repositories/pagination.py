@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any
+
+MAX_PAGE_LIMIT = 200
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(created_at: str, row_id: str) -> str:
+    raw = json.dumps([created_at, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        value = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+    if (
+        not isinstance(value, list)
+        or len(value) != 2
+        or not all(isinstance(v, str) for v in value)
+    ):
+        raise InvalidCursorError("Invalid cursor")
+    return value[0], value[1]
+
+
+def clamp_page_limit(limit: int) -> int:
+    return max(1, min(int(limit), MAX_PAGE_LIMIT))
+
+
+def keyset_page(
+    rows: list[Any],
+    limit: int,
+) -> tuple[list[Any], str | None]:
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(str(last["created_at"]), str(last["id"]))
@@ -21,7 +21,6 @@ class SettingsRepo:
                 """,
                 (key, value_json),
             )
-            conn.commit()
 
     def get_json(self, key: str, default: Any | None = None) -> Any:
         with self._db.connect() as conn:
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+# HTTP statuses that mean "try again later" rather than "this request is wrong".
+TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Provider SDKs do not share exception types, so fall back to what they put in the message.
+_TRANSIENT_MARKERS = (
+    "503 UNAVAILABLE",
+    "'status': 'UNAVAILABLE'",
+    "currently experiencing high demand",
+    "429 RESOURCE_EXHAUSTED",
+    "'status': 'RESOURCE_EXHAUSTED'",
+    "ServerOverloaded",
+    "RateLimitExceeded",
+)
+
+# Transport failures raised by the HTTP clients under the SDKs (httpx, requests).
+_TRANSIENT_EXCEPTION_NAMES = frozenset(
+    {
+        "ConnectError",
+        "ConnectTimeout",
+        "ReadError",
+        "ReadTimeout",
+        "WriteTimeout",
+        "PoolTimeout",
+        "RemoteProtocolError",
+        "APIConnectionError",
+        "APITimeoutError",
+    }
+)
+
+
+def _status_code(error: BaseException) -> int | None:
+    for attr in ("status_code", "code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    value = getattr(getattr(error, "response", None), "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def is_transient_error(error: BaseException) -> bool:
+    # TimeoutError is deliberately not transient: the runner raises it itself when a video
+    # operation runs past its deadline, and retrying that would never end.
+    if isinstance(error, ConnectionError):
+        return True
+    if type(error).__name__ in _TRANSIENT_EXCEPTION_NAMES:
+        return True
+    if _status_code(error) in TRANSIENT_STATUS_CODES:
+        return True
+    detail = str(error)
+    return any(marker in detail for marker in _TRANSIENT_MARKERS)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay_seconds: float = 2.0
+    max_delay_seconds: float = 60.0
+
+    def should_retry(self, error: BaseException, attempts: int) -> bool:
+        # `attempts` counts the runs so far, including the one that just failed.
+        return attempts < self.max_attempts and is_transient_error(error)
+
+    def backoff_seconds(self, attempts: int, rng: random.Random | None = None) -> float:
+        # Exponential steps with "equal jitter": at least half the step, so jobs that failed
+        # together in an outage come back spread out instead of as another burst.
+        step = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** max(0, attempts - 1))
+        return step / 2 + (rng or random).uniform(0, step / 2)
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    # Consecutive transient failures open the breaker and stop dispatch to the provider.
+    # After the cooldown it admits one probe; each success widens admission by one more
+    # concurrent job until `recovery_successes` in a row close it. A failure re-opens it.
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 30.0,
+        recovery_successes: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._failure_threshold = max(1, int(failure_threshold))
+        self._cooldown_seconds = float(cooldown_seconds)
+        self._recovery_successes = max(1, int(recovery_successes))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._successes = 0
+        self._in_flight = 0
+        self._opened_at = 0.0
+        self._opened_total = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow(self) -> bool:
+        # Advisory only: another thread may take the last slot before the caller acts on it.
+        with self._lock:
+            self._maybe_half_open()
+            return self._admits()
+
+    def try_acquire(self) -> bool:
+        # Check and take a dispatch slot in one step, so concurrent workers cannot both get
+        # the single half-open probe. Pair with record_result(), or release() if unused.
+        with self._lock:
+            self._maybe_half_open()
+            if not self._admits():
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self) -> None:
+        # Give back a slot from try_acquire() that never reached the provider.
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    def record_result(self, ok: bool | None) -> None:
+        # ok=None: the job ended without telling us anything about the provider (canceled).
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            if ok is None:
+                return
+            if ok:
+                self._failures = 0
+                if self._state == HALF_OPEN:
+                    self._successes += 1
+                    if self._successes >= self._recovery_successes:
+                        self._state = CLOSED
+                return
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self._failure_threshold:
+                self._open()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            self._maybe_half_open()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "in_flight": self._in_flight,
+                "opened_total": self._opened_total,
+            }
+
+    def _admits(self) -> bool:
+        if self._state == OPEN:
+            return False
+        if self._state == HALF_OPEN:
+            return self._in_flight < self._successes + 1
+        return True
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._opened_total += 1
+        self._successes = 0
+
+    def _maybe_half_open(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self._cooldown_seconds:
+            self._state = HALF_OPEN
+            self._successes = 0
+
+
+class CircuitBreakers:
+    def __init__(self, **breaker_kwargs: Any):
+        self._breaker_kwargs = breaker_kwargs
+        self._lock = threading.Lock()
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, provider_id: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(provider_id)
+            if breaker is None:
+                breaker = CircuitBreaker(**self._breaker_kwargs)
+                self._breakers[provider_id] = breaker
+            return breaker
+
+    def blocked(self) -> list[str]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return [provider_id for provider_id, b in breakers.items() if not b.allow()]
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {provider_id: b.stats() for provider_id, b in breakers.items()}
@@ -1,16 +1,49 @@
 from __future__ import annotations
 
 import base64
+import logging
 import mimetypes
-import queue
+import os
+import random
+import socket
 import threading
-import urllib.request
 import uuid
-from typing import Any
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator
 
 from creativeai_studio.api.deps import AppContext
+from creativeai_studio.downloader import Downloader, DownloadProgress
 from creativeai_studio.media_meta import read_image_size
-from creativeai_studio.model_catalog import get_model
+from creativeai_studio.model_catalog import get_model, get_model_constraints
+from creativeai_studio.providers.registry import ProviderRegistry
+from creativeai_studio.retry_policy import CircuitBreakers, RetryPolicy, is_transient_error
+from creativeai_studio.scheduling import Claimed, LaneScheduler, lane_for_model, provider_of_lane
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseLostError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class _PendingOutputs:
+    # Output files are already on disk; the asset rows are written when the job completes.
+    rows: list[dict[str, Any]]
+
+    @property
+    def result(self) -> dict[str, Any]:
+        outputs = [
+            {"asset_id": row["asset_id"], "media_type": row["media_type"], "role": "output", "index": idx}
+            for idx, row in enumerate(self.rows)
+        ]
+        out: dict[str, Any] = {"outputs": outputs}
+        if outputs:
+            out["output_asset_id"] = outputs[0]["asset_id"]
+        return out
 
 
 class JobRunner:
@@ -19,30 +52,116 @@ class JobRunner:
         ctx: AppContext,
         provider: Any = None,
         *,
-        providers: dict[str, Any] | None = None,
+        providers: ProviderRegistry | dict[str, Any] | None = None,
         concurrency: int = 1,
+        lane_concurrency: dict[str, int] | None = None,
+        default_lane_concurrency: int | None = None,
+        operation_poll_interval_seconds: float = 10.0,
+        operation_timeout_seconds: float = 1800.0,
+        operation_workers: int = 4,
+        downloader: Downloader | None = None,
     ):
         self._ctx = ctx
-        self._providers: dict[str, Any] = dict(providers or {})
+        self._providers = (
+            providers if isinstance(providers, ProviderRegistry) else ProviderRegistry(instances=providers)
+        )
         if provider is not None and "google" not in self._providers:
-            self._providers["google"] = provider
-        self._q: queue.Queue[str] = queue.Queue()
+            self._providers.register("google", lambda: provider)
         self._started = False
+        self._workers = 0
         self._lock = threading.Lock()
-        self._concurrency = max(1, int(concurrency))
+        self._scheduler = LaneScheduler(
+            default_concurrency=concurrency if default_lane_concurrency is None else default_lane_concurrency,
+            lane_concurrency=lane_concurrency,
+        )
+        self._operation_poll_interval_seconds = max(0.1, float(operation_poll_interval_seconds))
+        self._operation_timeout_seconds = float(operation_timeout_seconds)
+        self._operation_workers = max(1, int(operation_workers))
+        cfg = ctx.cfg
+        self._downloader = downloader or Downloader(
+            chunk_size=cfg.download_chunk_size,
+            timeout_seconds=cfg.download_timeout_seconds,
+            max_bytes=cfg.download_max_bytes,
+            max_attempts=cfg.download_max_attempts,
+        )
+        self._operations_executor: ThreadPoolExecutor | None = None
+        self._outputs_executor: ThreadPoolExecutor | None = None
+        self._operations_in_flight: set[str] = set()
+        self._stop = threading.Event()
+        # Pending jobs live in the jobs table; this process claims them under leases it
+        # keeps renewing while it works on them.
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._queue_poll_interval_seconds = cfg.queue_poll_interval_seconds
+        self._lease_seconds = cfg.job_lease_seconds
+        self._max_attempts = cfg.job_max_attempts
+        self._leased_jobs: set[str] = set()
+        self._retry_rng = random.Random()
+        self._breakers = CircuitBreakers(
+            failure_threshold=cfg.circuit_failure_threshold,
+            cooldown_seconds=cfg.circuit_cooldown_seconds,
+            recovery_successes=cfg.circuit_recovery_successes,
+        )
 
     def qsize(self) -> int:
-        return self._q.qsize()
+        return self._ctx.jobs.count_queued()
+
+    def lane_stats(self) -> dict[str, dict[str, Any]]:
+        local = self._scheduler.stats()
+        depths = self._ctx.jobs.queue_depths()
+        now = datetime.now(timezone.utc)
+        out: dict[str, dict[str, Any]] = {}
+        for lane in [*local, *(k for k in depths if k not in local)]:
+            queued = depths.get(lane) or {}
+            oldest = queued.get("oldest_created_at")
+            out[lane] = {
+                **(local.get(lane) or {}),
+                "depth": int(queued.get("depth") or 0),
+                "oldest_wait_seconds": (
+                    round((now - datetime.fromisoformat(str(oldest))).total_seconds(), 3) if oldest else 0.0
+                ),
+            }
+        return out
 
-    def enqueue(self, job_id: str) -> None:
-        self._q.put(job_id)
+    def provider_stats(self) -> dict[str, str]:
+        return self._providers.stats()
 
-    def recover_on_startup(self) -> None:
-        for j in self._ctx.jobs.list(status="running", limit=1000, offset=0):
-            self._ctx.jobs.set_failed(j["id"], "server restarted")
+    def circuit_stats(self) -> dict[str, dict[str, Any]]:
+        return self._breakers.stats()
+
+    def enqueue(self, job_id: str, job: dict[str, Any] | None = None) -> None:
+        # The committed row is the queue entry; this only wakes a local worker to claim it.
+        job = job if job is not None else self._ctx.jobs.get(job_id)
+        if not job:
+            return
+        self._scheduler.wake(self._lane_for_job(job))
+        self._ensure_workers()
+
+    def enqueue_many(self, jobs: list[dict[str, Any]]) -> None:
+        for lane in dict.fromkeys(self._lane_for_job(job) for job in jobs):
+            self._scheduler.wake(lane)
+        self._ensure_workers()
 
-        for j in self._ctx.jobs.list(status="queued", limit=1000, offset=0):
-            self.enqueue(j["id"])
+    @staticmethod
+    def _lane_for_job(job: dict[str, Any]) -> str:
+        lane = job.get("lane")
+        if lane:
+            return str(lane)
+        return lane_for_model(get_model(str(job.get("model_id") or "")), str(job.get("job_type") or ""))
+
+    def recover_on_startup(self) -> None:
+        # Jobs whose runner died mid-flight go back to the queue (or fail once out of
+        # attempts); jobs with a persisted provider operation are resumed by the poller.
+        self.recover_expired_leases()
+        for lane in self._ctx.jobs.queue_depths():
+            self._scheduler.wake(lane or None)
+
+    def recover_expired_leases(self) -> list[str]:
+        requeued, failed = self._ctx.jobs.recover_expired_leases(self._max_attempts)
+        for job_id in [*requeued, *failed]:
+            self._ctx.events.publish_job(job_id)
+        if requeued:
+            self._scheduler.wake()
+        return requeued
 
     def start(self) -> None:
         with self._lock:
@@ -50,39 +169,269 @@ class JobRunner:
                 return
             self._started = True
 
-        for i in range(self._concurrency):
-            t = threading.Thread(target=self._worker_loop, name=f"job-runner-{i}", daemon=True)
-            t.start()
+        self._ensure_workers()
 
-    def _worker_loop(self) -> None:
+        t = threading.Thread(target=self._operation_poll_loop, name="job-operation-poller", daemon=True)
+        t.start()
+
+        t = threading.Thread(target=self._lease_loop, name="job-lease-keeper", daemon=True)
+        t.start()
+
+    def _ensure_workers(self) -> None:
+        # One worker per lane slot: the pool grows with the sum of the lane caps as lanes are
+        # seen, so every lane can always run up to its cap whatever the others are doing.
+        with self._lock:
+            if not self._started:
+                return
+            while self._workers < max(1, self._scheduler.capacity()):
+                t = threading.Thread(target=self._worker_loop, name=f"job-runner-{self._workers}", daemon=True)
+                self._workers += 1
+                t.start()
+
+    def _lease_loop(self) -> None:
+        # Heartbeat well inside the lease so one slow round never lets a live job expire.
+        while not self._stop.wait(self._lease_seconds / 3):
+            try:
+                with self._lock:
+                    job_ids = list(self._leased_jobs)
+                self._ctx.jobs.renew_leases(self._owner, job_ids, self._lease_seconds)
+                self.recover_expired_leases()
+            except Exception:  # noqa: BLE001
+                # Keep renewing: a missed round is fine, a dead loop lets every lease expire.
+                logger.exception("Lease renewal failed for runner %s", self._owner)
+
+    @contextmanager
+    def _leased(self, job_id: str) -> Iterator[None]:
+        with self._lock:
+            self._leased_jobs.add(job_id)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._leased_jobs.discard(job_id)
+
+    def poll_operations_once(self, page_size: int = 500) -> list[Future[None]]:
+        futures: list[Future[None]] = []
+        after: tuple[str, str] | None = None
         while True:
-            job_id = self._q.get()
+            page = self._ctx.jobs.list_pending_operations(limit=page_size, after=after)
+            for job in page:
+                job_id = str(job["id"])
+                with self._lock:
+                    if job_id in self._operations_in_flight:
+                        continue
+                    self._operations_in_flight.add(job_id)
+                futures.append(self._get_operations_executor().submit(self._poll_operation, job_id))
+            if len(page) < page_size:
+                return futures
+            after = (str(page[-1]["started_at"]), str(page[-1]["id"]))
+
+    def _operation_poll_loop(self) -> None:
+        while not self._stop.wait(self._operation_poll_interval_seconds):
             try:
-                self._run_one(job_id)
-            finally:
-                self._q.task_done()
+                self.poll_operations_once()
+            except Exception:  # noqa: BLE001
+                logger.exception("Polling provider operations failed")
 
-    def _run_one(self, job_id: str) -> None:
-        job = self._ctx.jobs.get(job_id)
-        if not job:
-            return
+    def _get_operations_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._operations_executor is None:
+                self._operations_executor = ThreadPoolExecutor(
+                    max_workers=self._operation_workers,
+                    thread_name_prefix="job-operation",
+                )
+            return self._operations_executor
+
+    def _poll_operation(self, job_id: str) -> None:
+        try:
+            job = self._ctx.jobs.claim_operation(job_id, self._owner, self._lease_seconds)
+            if not job:
+                return
+            with self._leased(job_id):
+                if job.get("cancel_requested"):
+                    if self._ctx.jobs.set_status(job_id, "canceled", owner=self._owner):
+                        self._ctx.events.publish_job(job_id)
+                    return
+
+                try:
+                    pending = self._check_operation(job)
+                    if pending is None:
+                        self._ctx.jobs.release_lease(job_id, self._owner)
+                        return
+                    self._finish_succeeded(job_id, pending)
+                except LeaseLostError:
+                    return
+                except Exception as e:  # noqa: BLE001
+                    if is_transient_error(e):
+                        # The operation is still running at the provider; poll it next round.
+                        self._ctx.jobs.release_lease(job_id, self._owner)
+                        return
+                    error_message, error_detail = self._format_job_error(job=job, error=e)
+                    if not self._ctx.jobs.set_failed(job_id, error_message, detail=error_detail, owner=self._owner):
+                        return
+                self._ctx.events.publish_job(job_id)
+        finally:
+            with self._lock:
+                self._operations_in_flight.discard(job_id)
+
+    def _check_operation(self, job: dict[str, Any]) -> _PendingOutputs | None:
+        operation = job.get("provider_operation") or {}
+        submitted_at = operation.get("submitted_at")
+        if submitted_at:
+            elapsed = (datetime.now(timezone.utc) - datetime.fromisoformat(str(submitted_at))).total_seconds()
+            if elapsed > self._operation_timeout_seconds:
+                raise TimeoutError("Video generation timed out")
 
-        if job.get("cancel_requested"):
-            self._ctx.jobs.set_status(job_id, "canceled")
-            return
+        model = get_model(str(job.get("model_id") or ""))
+        if model is None:
+            raise RuntimeError("Unknown model_id")
+        provider = self._get_provider_for_model(model)
+        if provider is None or not hasattr(provider, "poll_video"):
+            raise RuntimeError("Provider not configured")
+        client = self._make_client(job=job, model=model, provider=provider)
 
-        if job.get("status") != "queued":
-            return
+        out = provider.poll_video(str(operation.get("operation_name") or ""), client=client)
+        if out is None:
+            return None
+        return self._store_video_output(job=job, out=out)
 
-        self._ctx.jobs.set_status(job_id, "running")
+    def _worker_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                # The timeout doubles as the poll for jobs committed by other processes.
+                picked = self._scheduler.get(self._claim_next, timeout=self._queue_poll_interval_seconds)
+            except Exception:  # noqa: BLE001
+                logger.exception("Claiming the next job failed")
+                self._stop.wait(self._queue_poll_interval_seconds)
+                continue
+            if picked is None:
+                continue
+            lane, job = picked
+            self._ensure_workers()
+            try:
+                self._execute(job)
+            except Exception:  # noqa: BLE001
+                logger.exception("Job %s failed outside the job error path", job.get("id"))
+            finally:
+                self._scheduler.done(lane)
+
+    def _claim_next(self, lane: str | None, known_lanes: list[str]) -> Claimed | None:
+        jobs = self._ctx.jobs
+        # Providers whose circuit is open (or half-open and already probing) are skipped like
+        # full lanes; their jobs stay queued until the breaker admits them again.
+        if lane is not None:
+            breaker = self._breakers.get(provider_of_lane(lane))
+            if not breaker.try_acquire():
+                return None
+            job = jobs.claim_next(self._owner, self._lease_seconds, lane=lane)
+            if job is None:
+                breaker.release()
+                return None
+            return lane, job, self._queued_seconds(job)
+        job = jobs.claim_next(
+            self._owner,
+            self._lease_seconds,
+            exclude_lanes=known_lanes,
+            exclude_providers=self._breakers.blocked(),
+        )
+        if job is None:
+            return None
+        if not self._admit(job):
+            return None
+        return self._lane_for_job(job), job, self._queued_seconds(job)
+
+    def _admit(self, job: dict[str, Any]) -> bool:
+        # The provider is only known once the job is claimed; if its breaker filled up in the
+        # meantime the job goes back to the queue untouched.
+        if self._breakers.get(provider_of_lane(self._lane_for_job(job))).try_acquire():
+            return True
+        self._ctx.jobs.unclaim(str(job["id"]), self._owner)
+        return False
+
+    @staticmethod
+    def _queued_seconds(job: dict[str, Any]) -> float:
+        created_at = job.get("created_at")
+        if not created_at:
+            return 0.0
+        elapsed = (datetime.now(timezone.utc) - datetime.fromisoformat(str(created_at))).total_seconds()
+        return max(0.0, elapsed)
+
+    def _run_one(self, job_id: str) -> None:
+        job = self._ctx.jobs.claim(job_id, self._owner, self._lease_seconds)
+        if job is not None and self._admit(job):
+            self._execute(job)
+
+    def _execute(self, job: dict[str, Any]) -> None:
+        # Every admitted job reports back to its provider's breaker exactly once: True when the
+        # provider answered, False on a transient error, None when the outcome says nothing
+        # about provider health (never called, canceled, or a non-transient failure).
+        breaker = self._breakers.get(provider_of_lane(self._lane_for_job(job)))
+        outcome: bool | None = None
         try:
-            result = self._dispatch(job)
-            self._ctx.jobs.set_succeeded(job_id, result_dict=result or {})
-        except Exception as e:  # noqa: BLE001
-            error_message, error_detail = self._format_job_error(job=job, error=e)
-            self._ctx.jobs.set_failed(job_id, error_message, detail=error_detail)
+            outcome = self._execute_leased(job)
+        finally:
+            breaker.record_result(outcome)
+
+    def _execute_leased(self, job: dict[str, Any]) -> bool | None:
+        job_id = str(job["id"])
+        with self._leased(job_id):
+            if job.get("cancel_requested"):
+                if self._ctx.jobs.set_status(job_id, "canceled", owner=self._owner):
+                    self._ctx.events.publish_job(job_id)
+                return None
+
+            self._ctx.events.publish_job(job_id)
+            try:
+                pending = self._dispatch(job)
+                if pending is None:
+                    # Submitted to a long-running provider operation; the poller finishes the job.
+                    self._ctx.jobs.release_lease(job_id, self._owner)
+                    self._ctx.events.publish_job(job_id)
+                    return True
+                self._finish_succeeded(job_id, pending)
+            except LeaseLostError:
+                return None
+            except Exception as e:  # noqa: BLE001
+                # A bad prompt or an unsupported option says nothing about the provider's health.
+                outcome = False if is_transient_error(e) else None
+                if not self._schedule_retry(job, e):
+                    error_message, error_detail = self._format_job_error(job=job, error=e)
+                    # Same outcome when the lease was lost: the new owner's state stands.
+                    if not self._ctx.jobs.set_failed(job_id, error_message, detail=error_detail, owner=self._owner):
+                        return outcome
+                self._ctx.events.publish_job(job_id)
+                return outcome
+            self._ctx.events.publish_job(job_id)
+            return True
+
+    def _retry_policy(self, job: dict[str, Any]) -> RetryPolicy:
+        constraints = get_model_constraints(str(job.get("model_id") or ""))
+        max_attempts = constraints.retry_max_attempts if constraints else None
+        cfg = self._ctx.cfg
+        return RetryPolicy(
+            max_attempts=max_attempts or self._max_attempts,
+            base_delay_seconds=cfg.retry_base_delay_seconds,
+            max_delay_seconds=cfg.retry_max_delay_seconds,
+        )
+
+    def _schedule_retry(self, job: dict[str, Any], error: Exception) -> bool:
+        # Transient provider errors (overload, rate limits, dropped connections) go back to the
+        # queue with exponential backoff; `attempts` was already bumped by the claim.
+        attempts = int(job.get("attempts") or 1)
+        policy = self._retry_policy(job)
+        if not policy.should_retry(error, attempts):
+            return False
+        delay = policy.backoff_seconds(attempts, self._retry_rng)
+        message = f"模型服务暂时不可用，{delay:.0f} 秒后重试（第 {attempts + 1}/{policy.max_attempts} 次）"
+        return self._ctx.jobs.schedule_retry(
+            str(job["id"]),
+            self._owner,
+            delay,
+            status_message=message,
+            error_detail=str(error),
+        )
 
-    def _dispatch(self, job: dict[str, Any]) -> dict[str, Any]:
+    def _dispatch(self, job: dict[str, Any]) -> _PendingOutputs | None:
         job_type = job.get("job_type")
         if job_type == "image.generate":
             return self._run_image_generate(job)
@@ -90,7 +439,7 @@ class JobRunner:
             return self._run_video_generate(job)
         raise NotImplementedError(f"Unsupported job_type: {job_type}")
 
-    def _run_image_generate(self, job: dict[str, Any]) -> dict[str, Any]:
+    def _run_image_generate(self, job: dict[str, Any]) -> _PendingOutputs:
         model = get_model(str(job.get("model_id") or ""))
         if model is None:
             raise RuntimeError("Unknown model_id")
@@ -112,7 +461,10 @@ class JobRunner:
         sequential_image_generation = params.get("sequential_image_generation")
         sequential_image_generation_options = params.get("sequential_image_generation_options")
         ref_ids = self._get_reference_image_asset_ids(params)
-        refs = [self._load_image_bytes(ref_id) for ref_id in ref_ids]
+        max_edge = self._reference_max_edge(model)
+        refs = [
+            self._load_image_bytes(ref_id, provider=provider, max_edge=max_edge) for ref_id in ref_ids
+        ]
         refs = [r for r in refs if r is not None]
 
         if refs:
@@ -156,10 +508,9 @@ class JobRunner:
                 client=client,
             )
 
-        outputs = self._store_image_outputs(job_id=str(job["id"]), out=out)
-        return self._result_with_outputs(outputs)
+        return self._store_image_outputs(job_id=str(job["id"]), out=out)
 
-    def _run_video_generate(self, job: dict[str, Any]) -> dict[str, Any]:
+    def _run_video_generate(self, job: dict[str, Any]) -> _PendingOutputs | None:
         model = get_model(str(job.get("model_id") or ""))
         if model is None:
             raise RuntimeError("Unknown model_id")
@@ -174,19 +525,35 @@ class JobRunner:
         params = job.get("params") or {}
         client = self._make_client(job=job, model=model, provider=provider)
 
-        start_image = self._load_image_bytes(params.get("start_image_asset_id"))
-        end_image = self._load_image_bytes(params.get("end_image_asset_id"))
-
-        out = provider.generate_video(
-            provider_model=str(provider_model),
-            prompt=str(params.get("prompt") or ""),
-            duration_seconds=int(params.get("duration_seconds") or 5),
-            aspect_ratio=str(params.get("aspect_ratio") or "16:9"),
-            start_image=start_image,
-            end_image=end_image,
-            client=client,
+        max_edge = self._reference_max_edge(model)
+        start_image, end_image = (
+            self._load_image_bytes(params.get(key), provider=provider, max_edge=max_edge)
+            for key in ("start_image_asset_id", "end_image_asset_id")
         )
+        request = {
+            "provider_model": str(provider_model),
+            "prompt": str(params.get("prompt") or ""),
+            "duration_seconds": int(params.get("duration_seconds") or 5),
+            "aspect_ratio": str(params.get("aspect_ratio") or "16:9"),
+            "start_image": start_image,
+            "end_image": end_image,
+            "client": client,
+        }
+
+        if hasattr(provider, "submit_video") and hasattr(provider, "poll_video"):
+            handle = provider.submit_video(**request)
+            operation = {
+                **handle,
+                "provider_id": str(model.get("provider_id") or "google"),
+                "submitted_at": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+            }
+            self._ctx.jobs.set_provider_operation(str(job["id"]), operation, status_message="视频生成中")
+            return None
+
+        out = provider.generate_video(**request)
+        return self._store_video_output(job=job, out=out)
 
+    def _store_video_output(self, *, job: dict[str, Any], out: dict[str, Any]) -> _PendingOutputs:
         mime_type = str(out.get("mime_type") or "video/mp4")
         ext = mimetypes.guess_extension(mime_type) or ".mp4"
         asset_id = uuid.uuid4().hex
@@ -194,29 +561,60 @@ class JobRunner:
         if "bytes" in out:
             stored = self._ctx.asset_store.save_generated(asset_id=asset_id, ext=ext, content=out["bytes"])
         else:
-            stored = self._download_video_output(asset_id=asset_id, ext=ext, out=out)
-
-        self._ctx.assets.insert_generated(
-            asset_id=asset_id,
-            media_type="video",
-            file_path=stored.rel_path,
-            mime_type=mime_type,
-            size_bytes=stored.size_bytes,
-            source_job_id=str(job["id"]),
-        )
-        self._ctx.job_assets.add(job_id=str(job["id"]), asset_id=asset_id, role="output")
-        return self._result_with_outputs(
-            [{"asset_id": asset_id, "media_type": "video", "role": "output", "index": 0}]
-        )
+            stored = self._download_video_output(asset_id=asset_id, ext=ext, out=out, job_id=str(job["id"]))
+
+        row = {
+            "asset_id": asset_id,
+            "media_type": "video",
+            "file_path": stored.rel_path,
+            "mime_type": mime_type,
+            "size_bytes": stored.size_bytes,
+            "content_hash": stored.sha256,
+            "deduplicated": stored.deduplicated,
+            "source_job_id": str(job["id"]),
+        }
+        return _PendingOutputs(rows=[row])
+
+    @staticmethod
+    def _reference_max_edge(model: dict[str, Any]) -> int | None:
+        constraints = get_model_constraints(str(model.get("model_id") or ""))
+        return constraints.reference_image_max_edge if constraints else None
 
-    def _load_image_bytes(self, asset_id: Any) -> dict[str, Any] | None:
+    def _load_image_bytes(
+        self, asset_id: Any, *, provider: Any = None, max_edge: int | None = None
+    ) -> dict[str, Any] | None:
         if not asset_id:
             return None
         a = self._ctx.assets.get(str(asset_id))
         if not a:
             raise RuntimeError("Image asset not found")
+        asset_id = str(a["id"])
+        # Assets stored before content hashing are keyed by their (never rewritten) path.
+        version = str(a.get("content_hash") or a["file_path"])
         p = self._ctx.asset_store.resolve(a["file_path"])
-        return {"bytes": p.read_bytes(), "mime_type": a.get("mime_type")}
+        mime_type = str(a.get("mime_type") or "image/png")
+
+        # Oversized references are swapped for a downsized copy kept on disk with the
+        # asset's other renditions, so only the first job using it pays for the resize.
+        if max_edge:
+            derived = self._ctx.renditions.get_reference(a, max_edge)
+            if derived is not None:
+                p, mime_type = derived
+                version = f"{version}@{max_edge}"
+
+        data = self._ctx.references.get_bytes(asset_id, version, p.read_bytes)
+        ref: dict[str, Any] = {"bytes": data, "mime_type": mime_type}
+
+        # Providers that send references in another form (e.g. Ark's data URLs) get that
+        # encoding from the same cache instead of re-encoding the bytes for every job.
+        for kind in getattr(provider, "reference_encodings", ()):
+            ref[kind] = self._ctx.references.get_encoded(
+                asset_id,
+                version,
+                kind,
+                lambda kind=kind: provider.encode_reference(kind, data, mime_type),
+            )
+        return ref
 
     def _make_client(self, *, job: dict[str, Any], model: dict[str, Any], provider: Any):
         provider_id = str(model.get("provider_id") or "google")
@@ -228,28 +626,51 @@ class JobRunner:
                 raise RuntimeError(f"{setting_key} not configured")
             if not hasattr(provider, "make_client_api_key"):
                 raise RuntimeError("Provider does not support api_key auth")
-            return provider.make_client_api_key(api_key)
+            return self._ctx.clients.get_or_create(provider_id, api_key, provider.make_client_api_key)
         raise RuntimeError("Unknown auth mode")
 
-    def _download_video_output(self, *, asset_id: str, ext: str, out: dict[str, Any], gcs: Any | None = None):
+    def _download_video_output(
+        self,
+        *,
+        asset_id: str,
+        ext: str,
+        out: dict[str, Any],
+        gcs: Any | None = None,
+        job_id: str | None = None,
+    ):
         uri = out.get("gcs_uri")
         if not uri:
             raise RuntimeError("No video uri")
 
-        tmp_path = self._ctx.cfg.data_dir / "tmp" / f"{asset_id}{ext}"
-        if uri.startswith("gs://"):
-            if gcs is None:
-                raise RuntimeError("GCS client not configured")
-            gcs.download_to_file(uri, tmp_path)
-        elif uri.startswith("http://") or uri.startswith("https://"):
-            import urllib.request
+        store = self._ctx.asset_store
+        tmp_path = store.temp_path(asset_id)
+        try:
+            sha256 = None
+            if uri.startswith("gs://"):
+                if gcs is None:
+                    raise RuntimeError("GCS client not configured")
+                gcs.download_to_file(uri, tmp_path)
+            elif uri.startswith("http://") or uri.startswith("https://"):
+                result = self._downloader.download(uri, tmp_path, on_progress=self._download_progress(job_id))
+                sha256 = result.sha256
+            else:
+                raise RuntimeError("Unsupported video uri")
+            # Renamed into the blob store; the downloaded bytes are never copied a second time.
+            return store.adopt_generated_file(asset_id=asset_id, ext=ext, tmp_path=tmp_path, sha256=sha256)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _download_progress(self, job_id: str | None) -> Callable[[DownloadProgress], None] | None:
+        if job_id is None:
+            return None
 
-            tmp_path.parent.mkdir(parents=True, exist_ok=True)
-            urllib.request.urlretrieve(uri, tmp_path)  # noqa: S310
-        else:
-            raise RuntimeError("Unsupported video uri")
+        def report(p: DownloadProgress) -> None:
+            mb_done = p.bytes_done / (1024 * 1024)
+            rate = p.bytes_per_second / (1024 * 1024)
+            self._ctx.jobs.set_progress(job_id, p.fraction, f"下载中 {mb_done:.1f} MB · {rate:.1f} MB/s")
+            self._ctx.events.publish_job(job_id)
 
-        return self._ctx.asset_store.save_generated_from_file(asset_id=asset_id, ext=ext, src_path=tmp_path)
+        return report
 
     def _get_provider_for_model(self, model: dict[str, Any]) -> Any | None:
         provider_id = str(model.get("provider_id") or "google")
@@ -277,7 +698,7 @@ class JobRunner:
             ids.insert(0, single)
         return ids
 
-    def _store_image_outputs(self, *, job_id: str, out: dict[str, Any]) -> list[dict[str, Any]]:
+    def _store_image_outputs(self, *, job_id: str, out: dict[str, Any]) -> _PendingOutputs:
         raw_items = out.get("items")
         items: list[dict[str, Any]]
         if isinstance(raw_items, list):
@@ -285,34 +706,84 @@ class JobRunner:
         else:
             items = [out]
 
-        outputs: list[dict[str, Any]] = []
-        for idx, item in enumerate(items):
-            asset_id = self._store_image_output_asset(job_id=job_id, item=item)
-            outputs.append({"asset_id": asset_id, "media_type": "image", "role": "output", "index": idx})
-        return outputs
+        # Fetch, write and probe in parallel; results are collected in output index order.
+        if len(items) > 1:
+            executor = self._get_outputs_executor()
+            futures = [executor.submit(self._materialize_image_output, item) for item in items]
+            wait(futures)
+            errors = [e for e in (f.exception() for f in futures) if e is not None]
+            if errors:
+                # One bad item fails the job; the siblings already written must not be orphaned.
+                self._discard_outputs(
+                    _PendingOutputs(rows=[f.result() for f in futures if f.exception() is None])
+                )
+                raise errors[0]
+            rows = [f.result() for f in futures]
+        else:
+            rows = [self._materialize_image_output(item) for item in items]
+
+        return _PendingOutputs(rows=[{**row, "source_job_id": job_id} for row in rows])
 
-    def _store_image_output_asset(self, *, job_id: str, item: dict[str, Any]) -> str:
-        content, mime_type = self._read_image_output_bytes(item)
-        ext = mimetypes.guess_extension(mime_type) or ".bin"
+    def _finish_succeeded(self, job_id: str, pending: _PendingOutputs) -> None:
+        # Output assets, their job links and the job's terminal state commit together:
+        # one fsync per job, and no succeeded job without outputs (or vice versa) after a crash.
+        try:
+            with self._ctx.db.transaction():
+                if not self._ctx.jobs.set_succeeded(job_id, result_dict=pending.result, owner=self._owner):
+                    # The lease expired and another runner took the job over; its result wins.
+                    raise LeaseLostError(f"lost lease on job {job_id}")
+                assets = self._ctx.assets.insert_generated_many(pending.rows)
+                self._ctx.job_assets.add_many(job_id, [a["id"] for a in assets], role="output")
+        except LeaseLostError:
+            self._discard_outputs(pending)
+            raise
+        for asset in assets:
+            self._ctx.renditions.prewarm(asset)
+
+    def _discard_outputs(self, pending: _PendingOutputs) -> None:
+        # Output files written for a job that will not commit them. Blobs are shared by
+        # content, so only files this run created and no committed asset points at go; a
+        # row without a hash cannot be checked and is left alone.
+        for row in pending.rows:
+            content_hash = row.get("content_hash")
+            if row.get("deduplicated") or content_hash is None:
+                continue
+            if self._ctx.assets.find_by_content_hash(str(content_hash)) is not None:
+                continue
+            self._ctx.asset_store.resolve(str(row["file_path"])).unlink(missing_ok=True)
+
+    def _materialize_image_output(self, item: dict[str, Any]) -> dict[str, Any]:
         asset_id = uuid.uuid4().hex
-        stored = self._ctx.asset_store.save_generated(asset_id=asset_id, ext=ext, content=content)
+        url = item.get("url")
+        if isinstance(url, str) and url and not item.get("bytes") and not item.get("b64_json"):
+            stored, mime_type = self._download_image_output(asset_id=asset_id, url=url, item=item)
+        else:
+            content, mime_type = self._read_image_output_bytes(item)
+            ext = mimetypes.guess_extension(mime_type) or ".bin"
+            stored = self._ctx.asset_store.save_generated(asset_id=asset_id, ext=ext, content=content)
         width, height = read_image_size(stored.abs_path)
-
-        self._ctx.assets.insert_generated(
-            asset_id=asset_id,
-            media_type="image",
-            file_path=stored.rel_path,
-            mime_type=mime_type,
-            size_bytes=stored.size_bytes,
-            source_job_id=job_id,
-            width=width,
-            height=height,
-        )
-        self._ctx.job_assets.add(job_id=job_id, asset_id=asset_id, role="output")
-        return asset_id
-
-    @staticmethod
-    def _read_image_output_bytes(item: dict[str, Any]) -> tuple[bytes, str]:
+        return {
+            "asset_id": asset_id,
+            "media_type": "image",
+            "file_path": stored.rel_path,
+            "mime_type": mime_type,
+            "size_bytes": stored.size_bytes,
+            "content_hash": stored.sha256,
+            "deduplicated": stored.deduplicated,
+            "width": width,
+            "height": height,
+        }
+
+    def _get_outputs_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._outputs_executor is None:
+                self._outputs_executor = ThreadPoolExecutor(
+                    max_workers=self._ctx.cfg.output_fetch_workers,
+                    thread_name_prefix="job-output",
+                )
+            return self._outputs_executor
+
+    def _read_image_output_bytes(self, item: dict[str, Any]) -> tuple[bytes, str]:
         raw = item.get("bytes")
         if isinstance(raw, (bytes, bytearray, memoryview)):
             return bytes(raw), str(item.get("mime_type") or "image/png")
@@ -321,21 +792,22 @@ class JobRunner:
         if isinstance(b64_json, str) and b64_json:
             return base64.b64decode(b64_json), str(item.get("mime_type") or "image/png")
 
-        url = item.get("url")
-        if isinstance(url, str) and url:
-            with urllib.request.urlopen(url) as resp:  # noqa: S310
-                content = resp.read()
-                mime_type = resp.headers.get_content_type() or "image/png"
-            return content, mime_type
-
         raise RuntimeError("Unsupported image output item")
 
-    @staticmethod
-    def _result_with_outputs(outputs: list[dict[str, Any]]) -> dict[str, Any]:
-        out: dict[str, Any] = {"outputs": outputs}
-        if outputs:
-            out["output_asset_id"] = outputs[0]["asset_id"]
-        return out
+    def _download_image_output(self, *, asset_id: str, url: str, item: dict[str, Any]):
+        store = self._ctx.asset_store
+        tmp_path = store.temp_path(asset_id)
+        try:
+            result = self._downloader.download(url, tmp_path)
+            content_type = result.content_type
+            if content_type == "application/octet-stream":
+                content_type = None
+            mime_type = str(content_type or item.get("mime_type") or "image/png")
+            ext = mimetypes.guess_extension(mime_type) or ".bin"
+            stored = store.adopt_generated_file(asset_id=asset_id, ext=ext, tmp_path=tmp_path, sha256=result.sha256)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return stored, mime_type
 
     @staticmethod
     def _format_job_error(*, job: dict[str, Any], error: Exception) -> tuple[str, str]:
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+def lane_key(provider_id: str, job_type: str) -> str:
+    return f"{provider_id}/{job_type}"
+
+
+def provider_of_lane(lane: str) -> str:
+    return lane.split("/", 1)[0]
+
+
+def lane_for_model(model: dict[str, Any] | None, job_type: str) -> str:
+    provider_id = str((model or {}).get("provider_id") or "google")
+    return lane_key(provider_id, job_type)
+
+
+# (lane, item, seconds the item waited before being claimed)
+Claimed = tuple[str, Any, float]
+
+
+@dataclass
+class _Lane:
+    key: str
+    concurrency: int
+    running: int = 0
+    dispatched_total: int = 0
+    wait_seconds_total: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "dispatched_total": self.dispatched_total,
+            "avg_wait_seconds": (
+                round(self.wait_seconds_total / self.dispatched_total, 3) if self.dispatched_total else 0.0
+            ),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+        }
+
+
+class LaneScheduler:
+    # Pending work lives in the database; the scheduler only decides which lanes this
+    # process may claim from next (round-robin, per-lane concurrency) and wakes workers.
+    # The runner keeps one worker per lane slot (see `capacity`), so a lane that is busy
+    # up to its cap never holds the workers another lane needs.
+    def __init__(
+        self,
+        *,
+        default_concurrency: int = 1,
+        lane_concurrency: dict[str, int] | None = None,
+    ):
+        self._default_concurrency = max(1, int(default_concurrency))
+        self._lane_concurrency = {k: max(1, int(v)) for k, v in (lane_concurrency or {}).items()}
+        self._lanes: dict[str, _Lane] = {}
+        self._order: list[str] = []
+        self._next_lane = 0
+        self._discovering = False
+        self._wakeups = 0
+        self._cond = threading.Condition()
+
+    def wake(self, lane: str | None = None) -> None:
+        with self._cond:
+            if lane is not None:
+                self._lane(lane)
+            self._wakeups += 1
+            self._cond.notify()
+
+    def capacity(self) -> int:
+        with self._cond:
+            return sum(entry.concurrency for entry in self._lanes.values())
+
+    def get(
+        self,
+        claim: Callable[[str | None, list[str]], Claimed | None],
+        timeout: float | None = None,
+    ) -> tuple[str, Any] | None:
+        # `claim(lane, known_lanes)` takes one item from the shared store: from `lane`, or with
+        # lane=None from any lane not in `known_lanes`. It runs outside the scheduler lock (it
+        # is a database write); the lane slot is reserved first and handed back on a miss.
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                wakeups = self._wakeups
+            picked = self._claim(claim)
+            if picked is not None:
+                return picked
+            with self._cond:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                if self._wakeups == wakeups:
+                    # Otherwise we were woken while claiming and the new work may not have
+                    # been seen yet, so go round again instead of waiting.
+                    self._cond.wait(remaining)
+
+    def done(self, lane: str) -> None:
+        with self._cond:
+            entry = self._lanes.get(lane)
+            if entry is not None and entry.running > 0:
+                entry.running -= 1
+            self._wakeups += 1
+            self._cond.notify_all()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._cond:
+            return {key: self._lanes[key].stats() for key in self._order}
+
+    def _lane(self, key: str) -> _Lane:
+        entry = self._lanes.get(key)
+        if entry is None:
+            entry = _Lane(key=key, concurrency=self._lane_concurrency.get(key, self._default_concurrency))
+            self._lanes[key] = entry
+            self._order.append(key)
+        return entry
+
+    def _claim(self, claim: Callable[[str | None, list[str]], Claimed | None]) -> tuple[str, Any] | None:
+        # Round-robin: lanes are offered starting after the last one served, so a burst in one
+        # lane cannot starve the others.
+        with self._cond:
+            n = len(self._order)
+            order = [self._order[(self._next_lane + i) % n] for i in range(n)]
+        for lane in order:
+            with self._cond:
+                entry = self._lanes[lane]
+                if entry.running >= entry.concurrency:
+                    continue
+                entry.running += 1
+            picked = None
+            try:
+                picked = claim(lane, order)
+            finally:
+                if picked is None:
+                    self._release(lane)
+            if picked is not None:
+                return self._record(picked)
+
+        # Lanes this process has not seen yet, e.g. jobs submitted through another process.
+        # One worker looks at a time, so two cannot both pick up the first jobs of a new lane.
+        with self._cond:
+            if self._discovering:
+                return None
+            self._discovering = True
+            known = list(self._order)
+        try:
+            picked = claim(None, known)
+            if picked is None:
+                return None
+            with self._cond:
+                self._lane(picked[0]).running += 1
+            return self._record(picked)
+        finally:
+            with self._cond:
+                self._discovering = False
+
+    def _release(self, lane: str) -> None:
+        with self._cond:
+            entry = self._lanes[lane]
+            entry.running = max(0, entry.running - 1)
+
+    def _record(self, picked: Claimed) -> tuple[str, Any]:
+        lane, item, waited = picked
+        with self._cond:
+            entry = self._lane(lane)
+            entry.dispatched_total += 1
+            entry.wait_seconds_total += waited
+            entry.max_wait_seconds = max(entry.max_wait_seconds, waited)
+            self._next_lane = (self._order.index(lane) + 1) % len(self._order)
+        return lane, item
@@ -4,10 +4,13 @@ from dataclasses import dataclass
 from typing import Any, Literal
 
 from creativeai_studio.api.deps import AppContext
-from creativeai_studio.model_catalog import get_model
+from creativeai_studio.model_catalog import ModelConstraints, get_catalog
 
 AuthMode = Literal["api_key"]
 
+MIN_JOB_PRIORITY = -10
+MAX_JOB_PRIORITY = 10
+
 
 class ValidationError(ValueError):
     pass
@@ -19,6 +22,9 @@ class ValidatedJobCreate:
     model_id: str
     auth_mode: AuthMode
     params: dict[str, Any]
+    priority: int = 0
+    # False when the caller asked for a fresh generation even if a cached result exists.
+    use_result_cache: bool = True
 
 
 def resolve_auth_mode(payload: dict[str, Any], ctx: AppContext) -> AuthMode:
@@ -38,9 +44,11 @@ def validate_job_create(payload: dict[str, Any], ctx: AppContext) -> ValidatedJo
     if not model_id:
         raise ValidationError("model_id is required")
 
-    model = get_model(model_id)
+    catalog = get_catalog()
+    model = catalog.by_id.get(model_id)
     if model is None:
         raise ValidationError("Unknown model_id")
+    constraints = catalog.constraints[model_id]
     if model.get("coming_soon"):
         raise ValidationError("Model is coming soon and cannot be selected yet")
 
@@ -57,13 +65,37 @@ def validate_job_create(payload: dict[str, Any], ctx: AppContext) -> ValidatedJo
 
     if job_type == "image.generate":
         params = _normalize_reference_images(params, model)
-        _validate_image_size(params, model)
+        _validate_image_size(params, model, constraints)
         _validate_sequential_image_generation(params, model)
     elif job_type == "video.generate":
-        _validate_video_duration(params, model)
+        _validate_video_duration(params, constraints)
+
+    params = _normalize_aspect_ratio(params, model, constraints, ctx)
+    priority = _validate_priority(payload.get("priority"))
+    use_result_cache = payload.get("cache", True)
+    if not isinstance(use_result_cache, bool):
+        raise ValidationError("cache must be a boolean")
+    return ValidatedJobCreate(
+        job_type=job_type,
+        model_id=model_id,
+        auth_mode=auth_mode,
+        params=params,
+        priority=priority,
+        use_result_cache=use_result_cache,
+    )
+
 
-    params = _normalize_aspect_ratio(params, model, ctx)
-    return ValidatedJobCreate(job_type=job_type, model_id=model_id, auth_mode=auth_mode, params=params)
+def _validate_priority(value: Any) -> int:
+    if value is None:
+        return 0
+    # Strings, floats and booleans are rejected rather than coerced, so "3" or 2.9 never
+    # silently become a different priority.
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValidationError("priority must be an integer")
+    priority = value
+    if priority < MIN_JOB_PRIORITY or priority > MAX_JOB_PRIORITY:
+        raise ValidationError(f"priority must be between {MIN_JOB_PRIORITY} and {MAX_JOB_PRIORITY}")
+    return priority
 
 
 def _normalize_reference_images(params: dict[str, Any], model: dict[str, Any]) -> dict[str, Any]:
@@ -156,31 +188,28 @@ def _validate_image_total_limit(
         raise ValidationError(f"reference_image count + max_images exceeds {int(total_limit)}")
 
 
-def _validate_image_size(params: dict[str, Any], model: dict[str, Any]) -> None:
+def _validate_image_size(params: dict[str, Any], model: dict[str, Any], constraints: ModelConstraints) -> None:
     image_size = params.get("image_size")
     if image_size is None:
         return
 
-    supported = model.get("resolution_presets")
-    if not supported:
+    if not constraints.resolution_presets:
         return
 
     value = str(image_size).strip().lower()
     if not value:
         return
 
-    supported_norm = {str(v).strip().lower() for v in supported if str(v).strip()}
-    if supported_norm and value not in supported_norm:
-        allowed = ", ".join(str(v) for v in supported)
+    if value not in constraints.resolution_presets:
+        allowed = ", ".join(str(v) for v in model.get("resolution_presets") or [])
         raise ValidationError(f"image_size not supported; allowed: {allowed}")
 
 
-def _validate_video_duration(params: dict[str, Any], model: dict[str, Any]) -> None:
-    supported = model.get("duration_seconds")
-    if not supported:
+def _validate_video_duration(params: dict[str, Any], constraints: ModelConstraints) -> None:
+    supported_ints = constraints.duration_seconds
+    if not supported_ints:
         return
 
-    supported_ints = [int(v) for v in supported]
     if params.get("duration_seconds") is None:
         params["duration_seconds"] = supported_ints[0]
         return
@@ -196,35 +225,23 @@ def _validate_video_duration(params: dict[str, Any], model: dict[str, Any]) -> N
     params["duration_seconds"] = value
 
 
-def _parse_ratio(r: str) -> float | None:
-    if ":" not in r:
-        return None
-    a, b = r.split(":", 1)
-    try:
-        return float(a) / float(b)
-    except Exception:
-        return None
-
-
-def _pick_nearest_ratio(target: float, candidates: list[str]) -> str | None:
-    scored: list[tuple[float, str]] = []
-    for r in candidates:
-        v = _parse_ratio(r)
-        if v is None:
-            continue
-        scored.append((abs(v - target), r))
-    if not scored:
+def _pick_nearest_ratio(target: float, candidates: tuple[tuple[str, float], ...]) -> str | None:
+    if not candidates:
         return None
-    scored.sort(key=lambda t: t[0])
-    return scored[0][1]
+    return min(candidates, key=lambda c: abs(c[1] - target))[0]
 
 
-def _normalize_aspect_ratio(params: dict[str, Any], model: dict[str, Any], ctx: AppContext) -> dict[str, Any]:
+def _normalize_aspect_ratio(
+    params: dict[str, Any],
+    model: dict[str, Any],
+    constraints: ModelConstraints,
+    ctx: AppContext,
+) -> dict[str, Any]:
     aspect = params.get("aspect_ratio")
     if not aspect:
         return params
 
-    supported = [r for r in (model.get("aspect_ratios") or []) if r != "auto"]
+    supported = constraints.aspect_ratios
     if aspect != "auto":
         if supported and aspect not in supported:
             raise ValidationError("aspect_ratio not supported")
@@ -246,6 +263,6 @@ def _normalize_aspect_ratio(params: dict[str, Any], model: dict[str, Any], ctx:
         return params
 
     target = float(asset["width"]) / float(asset["height"])
-    chosen = _pick_nearest_ratio(target, supported) or default_aspect
+    chosen = _pick_nearest_ratio(target, constraints.aspect_ratio_values) or default_aspect
     params["aspect_ratio"] = chosen
     return params
@@ -0,0 +1,52 @@
+from io import BytesIO
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+
+
+def _image_job(prompt: str, **extra: Any) -> dict[str, Any]:
+    params = {"prompt": prompt, "aspect_ratio": "1:1", "image_size": "1k"}
+    params.update(extra.pop("params", {}))
+    return {
+        "job_type": "image.generate",
+        "model_id": "nano-banana-pro",
+        "params": params,
+        "auth": {"mode": "api_key"},
+        **extra,
+    }
+
+
+def _png(color: tuple[int, int, int] = (0, 0, 0), size: tuple[int, int] = (4, 4)) -> bytes:
+    buf = BytesIO()
+    Image.new("RGB", size, color=color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def image_job():
+    # Request body for POST /api/jobs; `params=` merges into the job params, other keys go top-level.
+    return _image_job
+
+
+@pytest.fixture
+def png():
+    return _png
+
+
+@pytest.fixture
+def jobs_app(tmp_path):
+    # API tests that create jobs but never run them: the runner only records what gets enqueued.
+    def make(**cfg: Any) -> tuple[Any, TestClient, list[str]]:
+        cfg.setdefault("data_dir", tmp_path / "data")
+        app = create_app(AppConfig(**cfg))
+        enqueued: list[str] = []
+        app.state.runner.enqueue = lambda job_id, job=None: enqueued.append(job_id)
+        app.state.runner.enqueue_many = lambda jobs: enqueued.extend(j["id"] for j in jobs)
+        return app, TestClient(app), enqueued
+
+    return make
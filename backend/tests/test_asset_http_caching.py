@@ -0,0 +1,123 @@
+import hashlib
+import os
+
+from fastapi.testclient import TestClient
+
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+
+
+def _generated_video(app, size: int = 3 * 1024 * 1024):
+    ctx = app.state.ctx
+    payload = os.urandom(size)
+    stored = ctx.asset_store.save_generated("v1", ".mp4", payload)
+    ctx.jobs.create(job_id="j1", job_type="video.generate", model_id="veo-3.1", auth_mode="api_key", params={})
+    ctx.assets.insert_generated(
+        asset_id="v1",
+        media_type="video",
+        file_path=stored.rel_path,
+        mime_type="video/mp4",
+        size_bytes=stored.size_bytes,
+        content_hash=stored.sha256,
+        source_job_id="j1",
+    )
+    return payload
+
+
+def test_generated_content_has_strong_etag_and_immutable_caching(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+    payload = _generated_video(app, size=1024)
+
+    res = client.get("/api/assets/v1/content")
+    assert res.status_code == 200
+    assert res.content == payload
+    assert res.headers["etag"] == f'"{hashlib.sha256(payload).hexdigest()}"'
+    assert res.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert res.headers["accept-ranges"] == "bytes"
+
+    again = client.get("/api/assets/v1/content", headers={"If-None-Match": res.headers["etag"]})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == res.headers["etag"]
+
+    since = client.get("/api/assets/v1/content", headers={"If-Modified-Since": res.headers["last-modified"]})
+    assert since.status_code == 304
+
+    stale = client.get("/api/assets/v1/content", headers={"If-None-Match": '"other"'})
+    assert stale.status_code == 200
+
+
+def test_range_requests_on_large_video(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+    payload = _generated_video(app)
+    total = len(payload)
+
+    head = client.get("/api/assets/v1/content", headers={"Range": "bytes=0-1023"})
+    assert head.status_code == 206
+    assert head.content == payload[:1024]
+    assert head.headers["content-range"] == f"bytes 0-1023/{total}"
+
+    tail = client.get("/api/assets/v1/content", headers={"Range": "bytes=-4096"})
+    assert tail.status_code == 206
+    assert tail.content == payload[-4096:]
+
+    etag = head.headers["etag"]
+    resumed = client.get("/api/assets/v1/content", headers={"Range": f"bytes={total - 10}-", "If-Range": etag})
+    assert resumed.status_code == 206
+    assert resumed.content == payload[-10:]
+
+    changed = client.get("/api/assets/v1/content", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert changed.status_code == 200
+    assert len(changed.content) == total
+
+    beyond = client.get("/api/assets/v1/content", headers={"Range": f"bytes={total + 10}-"})
+    assert beyond.status_code == 416
+
+
+def test_content_lookups_are_served_from_the_path_cache(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+    ctx = app.state.ctx
+    _generated_video(app, size=64)
+
+    calls = []
+    original_get = ctx.assets.get
+
+    def counting_get(asset_id, **kwargs):
+        calls.append(asset_id)
+        return original_get(asset_id, **kwargs)
+
+    ctx.assets.get = counting_get
+    for _ in range(3):
+        assert client.get("/api/assets/v1/content").status_code == 200
+    assert calls == ["v1"]
+    assert ctx.asset_paths.stats()["hits"] == 2
+
+
+def test_legacy_upload_gets_hash_backfilled_and_revalidates(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+    ctx = app.state.ctx
+    legacy = tmp_path / "data/assets/uploads/u1.png"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_bytes(b"legacy-bytes")
+    ctx.assets.insert_upload(
+        asset_id="u1",
+        media_type="image",
+        file_path="assets/uploads/u1.png",
+        mime_type="image/png",
+        size_bytes=12,
+    )
+
+    res = client.get("/api/assets/u1/content")
+    assert res.status_code == 200
+    assert res.headers["cache-control"] == "no-cache"
+    digest = hashlib.sha256(b"legacy-bytes").hexdigest()
+    assert res.headers["etag"] == f'"{digest}"'
+    assert ctx.assets.get("u1")["content_hash"] == digest
+
+    legacy.unlink()
+    assert client.get("/api/assets/u1/content").status_code == 404
+    assert ctx.asset_paths.get("u1") is None
@@ -0,0 +1,100 @@
+import hashlib
+from io import BytesIO
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from creativeai_studio.asset_store import AssetStore, UploadTooLargeError
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+
+
+def _png(width: int, height: int) -> bytes:
+    buf = BytesIO()
+    Image.new("RGB", (width, height), color=(10, 20, 30)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_save_upload_stream_hashes_in_chunks_and_renames(tmp_path):
+    store = AssetStore(tmp_path)
+    payload = b"x" * 10_000
+
+    stored = store.save_upload_stream("a1", "clip.MP4", BytesIO(payload), max_bytes=20_000, chunk_size=4096)
+
+    digest = hashlib.sha256(payload).hexdigest()
+    assert stored.rel_path == f"assets/blobs/{digest[:2]}/{digest[2:4]}/{digest}"
+    assert stored.mime_type == "video/mp4"
+    assert stored.abs_path.read_bytes() == payload
+    assert stored.size_bytes == len(payload)
+    assert stored.sha256 == digest
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+
+def test_save_upload_stream_stops_at_limit_and_cleans_up(tmp_path):
+    store = AssetStore(tmp_path)
+
+    with pytest.raises(UploadTooLargeError):
+        store.save_upload_stream("a1", "big.png", BytesIO(b"x" * 10_000), max_bytes=5000, chunk_size=4096)
+
+    assert list((tmp_path / "tmp").iterdir()) == []
+    assert not (tmp_path / "assets/blobs").exists()
+
+
+def test_upload_endpoint_probes_written_file(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+
+    up = client.post("/api/assets/upload", files={"file": ("x.png", _png(40, 24), "image/png")})
+    assert up.status_code == 200
+    body = up.json()
+    assert (body["width"], body["height"]) == (40, 24)
+
+    asset = app.state.ctx.assets.get(body["id"])
+    assert asset["size_bytes"] == len(_png(40, 24))
+
+
+def test_upload_endpoint_rejects_oversized_file_with_413(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data", max_upload_bytes=100))
+    client = TestClient(app)
+
+    up = client.post("/api/assets/upload", files={"file": ("x.png", _png(64, 64), "image/png")})
+    assert up.status_code == 413
+    assert app.state.ctx.assets.list() == []
+    assert not (tmp_path / "data/assets/blobs").exists()
+
+
+def test_upload_endpoint_rejects_declared_oversized_body_before_reading_it(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data", max_upload_bytes=100))
+    client = TestClient(app)
+
+    up = client.post(
+        "/api/assets/upload",
+        files={"file": ("x.mp4", b"x" * 200_000, "video/mp4")},
+    )
+    assert up.status_code == 413
+    assert list((tmp_path / "data/tmp").iterdir()) == []
+
+
+def test_upload_endpoint_caps_bodies_without_content_length(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data", max_upload_bytes=100))
+    client = TestClient(app)
+    boundary = "b0undary"
+    head = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="x.mp4"\r\n'
+        "Content-Type: video/mp4\r\n\r\n"
+    ).encode()
+
+    def body():
+        yield head
+        for _ in range(64):
+            yield b"x" * 4096
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    up = client.post(
+        "/api/assets/upload",
+        content=body(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+    assert up.status_code == 413
+    assert app.state.ctx.assets.list() == []
@@ -60,3 +60,48 @@ def test_generated_asset_includes_source_model_info(tmp_path):
     item = next(a for a in listed if a["id"] == "a1")
     assert item["source_model_id"] == "nano-banana-pro"
     assert item["source_model_name"] == "Nano Banana Pro"
+
+
+def test_list_assets_resolves_source_models_without_per_row_job_lookups(tmp_path, monkeypatch):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+    ctx = app.state.ctx
+
+    for i, model_id in enumerate(["nano-banana-pro", "nano-banana", "veo-3.1"]):
+        ctx.jobs.create(
+            job_id=f"j{i}",
+            job_type="image.generate",
+            model_id=model_id,
+            auth_mode="api_key",
+            params={"prompt": "x"},
+        )
+        ctx.assets.insert_generated(
+            asset_id=f"a{i}",
+            media_type="image",
+            file_path=f"assets/generated/a{i}.png",
+            mime_type="image/png",
+            size_bytes=1,
+            source_job_id=f"j{i}",
+        )
+    ctx.assets.insert_upload(
+        asset_id="u1",
+        media_type="image",
+        file_path="assets/uploads/u1.png",
+        mime_type="image/png",
+        size_bytes=1,
+    )
+
+    def _no_job_lookups(*_, **__):
+        raise AssertionError("list_assets must not look up jobs per asset")
+
+    monkeypatch.setattr(ctx.jobs, "get", _no_job_lookups)
+
+    listed = {a["id"]: a for a in client.get("/api/assets").json()}
+    assert listed["a0"]["source_model_name"] == "Nano Banana Pro"
+    assert listed["a1"]["source_model_name"] == "Nano Banana"
+    assert listed["a2"]["source_model_id"] == "veo-3.1"
+    assert listed["u1"]["source_model_id"] is None
+    assert listed["u1"]["source_model_name"] is None
+
+    page = client.get("/api/assets", params={"cursor": "", "origin": "generated"}).json()
+    assert {a["source_model_id"] for a in page["items"]} == {"nano-banana-pro", "nano-banana", "veo-3.1"}
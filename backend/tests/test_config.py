@@ -1,12 +1,43 @@
 from pathlib import Path
 
+import pytest
+
 from creativeai_studio.config import AppConfig
 
 
 def test_ensure_dirs(tmp_path: Path):
     cfg = AppConfig(data_dir=tmp_path / "data")
     cfg.ensure_dirs()
-    assert (cfg.data_dir / "assets/uploads").exists()
-    assert (cfg.data_dir / "assets/generated").exists()
     assert (cfg.data_dir / "credentials").exists()
     assert (cfg.data_dir / "tmp").exists()
+
+
+def test_from_env_reads_performance_profile(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("RUNNER_CONCURRENCY", "3")
+    monkeypatch.setenv("RUNNER_LANE_CONCURRENCY", "google/video.generate=2, volcengine_ark/image.generate=4")
+    monkeypatch.setenv("DB_POOL_SIZE", "4")
+    monkeypatch.setenv("VIDEO_POLL_INTERVAL_SECONDS", "2.5")
+
+    cfg = AppConfig.from_env()
+    assert cfg.runner_concurrency == 3
+    assert cfg.lane_concurrency == {"google/video.generate": 2, "volcengine_ark/image.generate": 4}
+    assert cfg.db_pool_size == 4
+    assert cfg.video_poll_interval_seconds == 2.5
+    assert cfg.download_chunk_size == 1024 * 1024
+
+
+def test_invalid_performance_settings_fail_fast(tmp_path: Path, monkeypatch):
+    with pytest.raises(ValueError, match="runner_concurrency"):
+        AppConfig(data_dir=tmp_path, runner_concurrency=0)
+    with pytest.raises(ValueError, match=r"runner_lane_concurrency\[google/video.generate\]"):
+        AppConfig(data_dir=tmp_path, runner_lane_concurrency=(("google/video.generate", 0),))
+
+    monkeypatch.setenv("DB_POOL_SIZE", "many")
+    with pytest.raises(ValueError, match="DB_POOL_SIZE"):
+        AppConfig.from_env()
+
+    monkeypatch.delenv("DB_POOL_SIZE")
+    monkeypatch.setenv("RUNNER_LANE_CONCURRENCY", "google/video.generate")
+    with pytest.raises(ValueError, match="lane=N"):
+        AppConfig.from_env()
@@ -0,0 +1,59 @@
+from io import BytesIO
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from creativeai_studio.asset_store import AssetStore
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+
+
+def _png() -> bytes:
+    buf = BytesIO()
+    Image.new("RGB", (20, 10), color=(1, 2, 3)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_store_writes_identical_content_once(tmp_path):
+    store = AssetStore(tmp_path)
+
+    first = store.save_generated("a1", ".png", b"same")
+    second = store.save_upload("a2", "other.JPG", b"same")
+    third = store.save_generated("a3", "png", b"different")
+
+    assert first.deduplicated is False
+    assert second.deduplicated is True
+    assert second.rel_path == first.rel_path
+    # The shared blob has no extension; each caller keeps the mime type it asked for.
+    assert (first.mime_type, second.mime_type) == ("image/png", "image/jpeg")
+    assert third.rel_path != first.rel_path
+    assert first.rel_path == f"assets/blobs/{first.sha256[:2]}/{first.sha256[2:4]}/{first.sha256}"
+    assert len([p for p in (tmp_path / "assets/blobs").rglob("*") if p.is_file()]) == 2
+
+
+def test_duplicate_upload_is_a_metadata_insert(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+    ctx = app.state.ctx
+    payload = _png()
+
+    ids = []
+    for name in ("a.png", "b.png", "c.png"):
+        up = client.post("/api/assets/upload", files={"file": (name, payload, "image/png")})
+        assert up.status_code == 200
+        assert (up.json()["width"], up.json()["height"]) == (20, 10)
+        ids.append(up.json()["id"])
+
+    assets = [ctx.assets.get(i) for i in ids]
+    assert len({a["id"] for a in assets}) == 3
+    assert len({a["file_path"] for a in assets}) == 1
+    content_hash = assets[0]["content_hash"]
+    assert ctx.assets.find_by_content_hash(content_hash)["id"] in ids
+
+    blobs = [p for p in (tmp_path / "data/assets/blobs").rglob("*") if p.is_file()]
+    assert len(blobs) == 1
+    assert list((tmp_path / "data/tmp").iterdir()) == []
+
+    content = client.get(f"/api/assets/{ids[2]}/content")
+    assert content.status_code == 200
+    assert content.content == payload
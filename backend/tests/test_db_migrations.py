@@ -0,0 +1,84 @@
+import sqlite3
+
+from creativeai_studio.db import MIGRATIONS, SCHEMA_SQL, Database, apply_migrations
+
+
+def test_init_records_schema_version_and_is_idempotent(tmp_path):
+    db = Database(tmp_path / "app.db")
+    db.init()
+    db.init()
+
+    with db.connect() as conn:
+        versions = [r[0] for r in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+    assert versions == [m.version for m in MIGRATIONS]
+
+
+def test_init_upgrades_legacy_database_without_version_table(tmp_path):
+    path = tmp_path / "app.db"
+    legacy = sqlite3.connect(path)
+    legacy.executescript(SCHEMA_SQL)
+    legacy.execute(
+        """
+        INSERT INTO jobs(id, job_type, model_id, auth_mode, status, params_json, created_at)
+        VALUES('j1', 'image.generate', 'nano-banana-pro', 'api_key', 'queued', '{}', '2026-01-01T00:00:00+00:00')
+        """
+    )
+    legacy.commit()
+    legacy.close()
+
+    db = Database(path)
+    db.init()
+    with db.connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 1
+        indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    assert {"idx_jobs_status_created", "idx_assets_source_job", "idx_job_assets_asset"} <= indexes
+
+
+def test_list_queries_use_indexes(tmp_path):
+    db = Database(tmp_path / "app.db")
+    db.init()
+
+    with db.connect() as conn:
+        plan = " ".join(
+            str(r[3])
+            for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT 50",
+                ("queued",),
+            )
+        )
+        assert "idx_jobs_status_created" in plan
+        assert "TEMP B-TREE" not in plan
+
+        plan = " ".join(
+            str(r[3])
+            for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM assets WHERE origin = ? ORDER BY created_at DESC LIMIT 50",
+                ("generated",),
+            )
+        )
+        assert "idx_assets_origin_created" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_apply_migrations_only_runs_pending(tmp_path):
+    conn = sqlite3.connect(tmp_path / "app.db")
+    assert apply_migrations(conn, MIGRATIONS[:1]) == [1]
+    assert apply_migrations(conn) == [m.version for m in MIGRATIONS[1:]]
+    assert apply_migrations(conn) == []
+
+
+def test_queued_claims_use_the_partial_claim_index(tmp_path):
+    db = Database(tmp_path / "app.db")
+    db.init()
+    with db.connect() as conn:
+        names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        plan = " ".join(
+            str(r[-1])
+            for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM jobs WHERE status = 'queued' AND lane = ? "
+                "ORDER BY priority DESC, created_at, id LIMIT 1",
+                ("google/image.generate",),
+            )
+        )
+    assert "idx_jobs_queue" not in names
+    assert "idx_jobs_claim" in plan
@@ -0,0 +1,68 @@
+import threading
+
+from creativeai_studio.db import Database
+from creativeai_studio.repositories.jobs_repo import JobsRepo
+
+
+def test_pool_applies_wal_and_pragmas_once_per_connection(tmp_path):
+    db = Database(tmp_path / "app.db", pool_size=2, busy_timeout_ms=1234)
+    db.init()
+
+    with db.connect() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+
+    for _ in range(5):
+        with db.connect() as conn:
+            conn.execute("SELECT 1").fetchone()
+
+    stats = db.pool_stats()
+    assert stats["connections_created"] == 1
+    assert stats["checkouts"] == 7
+
+
+def test_pool_reuses_connection_for_nested_checkouts(tmp_path):
+    db = Database(tmp_path / "app.db", pool_size=1)
+    db.init()
+    jobs = JobsRepo(db)
+
+    with db.connect() as outer:
+        jobs.create(
+            job_id="j1",
+            job_type="image.generate",
+            model_id="nano-banana-pro",
+            auth_mode="api_key",
+            params={"prompt": "x"},
+        )
+        with db.connect() as inner:
+            assert inner is outer
+
+    assert jobs.get("j1") is not None
+    assert db.pool_stats()["reentrant_checkouts"] >= 1
+
+
+def test_pool_counts_waits_when_exhausted(tmp_path):
+    db = Database(tmp_path / "app.db", pool_size=1)
+    db.init()
+
+    held = threading.Event()
+    release = threading.Event()
+
+    def _hold():
+        with db.connect():
+            held.set()
+            release.wait(timeout=5)
+
+    t = threading.Thread(target=_hold)
+    t.start()
+    held.wait(timeout=5)
+
+    threading.Timer(0.05, release.set).start()
+    with db.connect() as conn:
+        conn.execute("SELECT 1").fetchone()
+    t.join(timeout=5)
+
+    stats = db.pool_stats()
+    assert stats["waits"] == 1
+    assert stats["open"] == 1
@@ -0,0 +1,179 @@
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from creativeai_studio.config import AppConfig
+from creativeai_studio.downloader import Downloader, DownloadError, DownloadTooLargeError
+from creativeai_studio.main import create_app
+from creativeai_studio.runner import JobRunner
+
+PAYLOAD = os.urandom(256 * 1024)
+
+
+class _Server:
+    def __init__(
+        self,
+        payload: bytes,
+        *,
+        drop_first_after: int | None = None,
+        honour_range: bool = True,
+        replace_with: bytes | None = None,
+    ):
+        self.payload = payload
+        self.drop_first_after = drop_first_after
+        self.honour_range = honour_range
+        self.replace_with = replace_with
+        self.ranges: list[str | None] = []
+        self.if_ranges: list[str | None] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                rng = self.headers.get("Range")
+                server.ranges.append(rng)
+                server.if_ranges.append(self.headers.get("If-Range"))
+                if server.ranges[1:] and server.replace_with is not None:
+                    server.payload = server.replace_with  # the object changed between attempts
+                etag = f'"{hashlib.sha256(server.payload).hexdigest()[:16]}"'
+                start = 0
+                if rng and server.honour_range and self.headers.get("If-Range") == etag:
+                    start = int(rng.removeprefix("bytes=").split("-")[0])
+                body = server.payload[start:]
+                self.send_response(206 if start else 200)
+                self.send_header("Content-Type", "video/mp4")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                if start:
+                    self.send_header("Content-Range", f"bytes {start}-{len(server.payload) - 1}/{len(server.payload)}")
+                self.end_headers()
+                if server.drop_first_after is not None:
+                    cut, server.drop_first_after = server.drop_first_after, None
+                    self.wfile.write(body[:cut])
+                    self.wfile.flush()
+                    self.connection.shutdown(2)
+                    return
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/out.mp4"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server_factory():
+    servers = []
+
+    def make(*args, **kwargs):
+        s = _Server(*args, **kwargs)
+        servers.append(s)
+        return s
+
+    yield make
+    for s in servers:
+        s.close()
+
+
+def test_download_streams_and_hashes(tmp_path, server_factory):
+    server = server_factory(PAYLOAD)
+    progress = []
+    result = Downloader(chunk_size=8192, progress_interval_seconds=0).download(
+        server.url, tmp_path / "out.part", on_progress=progress.append
+    )
+
+    assert result.size_bytes == len(PAYLOAD)
+    assert result.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+    assert result.content_type == "video/mp4"
+    assert (tmp_path / "out.part").read_bytes() == PAYLOAD
+    assert progress[-1].bytes_done == len(PAYLOAD)
+    assert progress[-1].fraction == 1.0
+
+
+def test_download_resumes_with_range_after_a_dropped_connection(tmp_path, server_factory):
+    server = server_factory(PAYLOAD, drop_first_after=100_000)
+    result = Downloader(chunk_size=4096, backoff_seconds=0).download(server.url, tmp_path / "out.part")
+
+    assert server.ranges[0] is None
+    assert server.ranges[1] is not None and server.ranges[1].startswith("bytes=")
+    assert int(server.ranges[1].removeprefix("bytes=").rstrip("-")) > 0
+    assert server.if_ranges == [None, server.if_ranges[1]] and server.if_ranges[1].startswith('"')
+    assert (tmp_path / "out.part").read_bytes() == PAYLOAD
+    assert result.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+
+
+def test_download_restarts_when_the_object_changed(tmp_path, server_factory):
+    replacement = os.urandom(len(PAYLOAD))
+    server = server_factory(PAYLOAD, drop_first_after=100_000, replace_with=replacement)
+    result = Downloader(chunk_size=4096, backoff_seconds=0).download(server.url, tmp_path / "out.part")
+
+    assert server.if_ranges[1] is not None
+    assert (tmp_path / "out.part").read_bytes() == replacement
+    assert result.sha256 == hashlib.sha256(replacement).hexdigest()
+
+
+def test_download_restarts_when_range_is_ignored(tmp_path, server_factory):
+    server = server_factory(PAYLOAD, drop_first_after=50_000, honour_range=False)
+    result = Downloader(chunk_size=4096, backoff_seconds=0).download(server.url, tmp_path / "out.part")
+
+    assert (tmp_path / "out.part").read_bytes() == PAYLOAD
+    assert result.size_bytes == len(PAYLOAD)
+
+
+def test_download_enforces_max_bytes_and_attempts(tmp_path, server_factory):
+    server = server_factory(PAYLOAD)
+    with pytest.raises(DownloadTooLargeError):
+        Downloader(max_bytes=1024).download(server.url, tmp_path / "a.part")
+
+    with pytest.raises(DownloadError):
+        Downloader(max_attempts=2, backoff_seconds=0, timeout_seconds=1).download(
+            "http://127.0.0.1:9/nothing", tmp_path / "b.part"
+        )
+
+
+class _UrlVideoProvider:
+    def __init__(self, url: str):
+        self.url = url
+
+    def make_client_api_key(self, api_key: str):
+        return object()
+
+    def generate_video(self, **__):
+        return {"gcs_uri": self.url, "mime_type": "video/mp4"}
+
+
+def test_runner_moves_downloaded_video_into_blob_store(tmp_path, server_factory):
+    server = server_factory(PAYLOAD)
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    ctx = app.state.ctx
+    ctx.settings.set_str("google_api_key", "x")
+    ctx.jobs.create(
+        job_id="j1",
+        job_type="video.generate",
+        model_id="veo-3.1",
+        auth_mode="api_key",
+        params={"prompt": "x", "aspect_ratio": "16:9", "duration_seconds": 5},
+    )
+
+    runner = JobRunner(
+        ctx,
+        provider=_UrlVideoProvider(server.url),
+        downloader=Downloader(chunk_size=4096, progress_interval_seconds=0),
+    )
+    runner._run_one("j1")
+
+    job = ctx.jobs.get("j1")
+    assert job["status"] == "succeeded"
+    assert job["progress"] == 1.0
+    asset = ctx.assets.get(job["result"]["output_asset_id"])
+    assert asset["content_hash"] == hashlib.sha256(PAYLOAD).hexdigest()
+    assert ctx.asset_store.resolve(asset["file_path"]).read_bytes() == PAYLOAD
+    assert list((tmp_path / "data/tmp").iterdir()) == []
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+from creativeai_studio.runner import LeaseLostError, _PendingOutputs
+
+
+def _app(data_dir, **cfg):
+    return create_app(AppConfig(data_dir=data_dir, **cfg))
+
+
+def _create(ctx, job_id: str, **kwargs) -> None:
+    ctx.jobs.create(
+        job_id=job_id,
+        job_type="image.generate",
+        model_id="nano-banana-pro",
+        auth_mode="api_key",
+        params={"prompt": job_id},
+        lane="google/image.generate",
+        **kwargs,
+    )
+
+
+def _expire(ctx, job_id: str) -> None:
+    with ctx.db.connect() as conn:
+        conn.execute("UPDATE jobs SET lease_expires_at = '2000-01-01T00:00:00+00:00' WHERE id = ?", (job_id,))
+
+
+def test_runners_sharing_a_database_never_claim_the_same_job(tmp_path):
+    apps = [_app(tmp_path / "data"), _app(tmp_path / "data")]
+    for i in range(40):
+        _create(apps[0].state.ctx, f"j{i:02d}")
+
+    claimed: list[str] = []
+    lock = threading.Lock()
+
+    def drain(app, owner: str) -> None:
+        while True:
+            job = app.state.ctx.jobs.claim_next(owner, 60)
+            if job is None:
+                return
+            with lock:
+                claimed.append(job["id"])
+
+    threads = [
+        threading.Thread(target=drain, args=(apps[i % 2], f"runner-{i}")) for i in range(6)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(claimed) == [f"j{i:02d}" for i in range(40)]
+    assert apps[0].state.runner.qsize() == 0
+
+
+def test_expired_lease_is_retried_by_another_runner(tmp_path):
+    app_a = _app(tmp_path / "data")
+    app_b = _app(tmp_path / "data")
+    ctx = app_a.state.ctx
+    _create(ctx, "j1")
+
+    job = ctx.jobs.claim("j1", "runner-a", 60)
+    assert job["status"] == "running"
+    assert job["lease_owner"] == "runner-a"
+    assert job["attempts"] == 1
+    # A live lease is not touched by another runner's recovery.
+    assert app_b.state.runner.recover_expired_leases() == []
+
+    _expire(ctx, "j1")
+    assert app_b.state.runner.recover_expired_leases() == ["j1"]
+    requeued = ctx.jobs.get("j1")
+    assert requeued["status"] == "queued"
+    assert requeued["lease_owner"] is None
+
+    again = app_b.state.ctx.jobs.claim_next("runner-b", 60)
+    assert again["id"] == "j1"
+    assert again["attempts"] == 2
+
+
+def test_job_fails_once_attempts_are_exhausted(tmp_path):
+    app = _app(tmp_path / "data", job_max_attempts=1)
+    ctx = app.state.ctx
+    _create(ctx, "j1")
+
+    ctx.jobs.claim("j1", "runner-a", 60)
+    _expire(ctx, "j1")
+    assert app.state.runner.recover_expired_leases() == []
+
+    job = ctx.jobs.get("j1")
+    assert job["status"] == "failed"
+    assert "1 attempt" in job["error_message"]
+
+
+def test_heartbeat_extends_only_the_owners_leases(tmp_path):
+    ctx = _app(tmp_path / "data").state.ctx
+    _create(ctx, "j1")
+    ctx.jobs.claim("j1", "runner-a", 60)
+    _expire(ctx, "j1")
+
+    assert ctx.jobs.renew_leases("runner-b", ["j1"], 60) == 0
+    assert ctx.jobs.renew_leases("runner-a", ["j1"], 60) == 1
+    assert ctx.jobs.get("j1")["lease_expires_at"] > "2000-01-01T00:00:00+00:00"
+    assert ctx.jobs.recover_expired_leases(max_attempts=3) == ([], [])
+
+
+def test_runner_that_lost_its_lease_does_not_finish_the_job(tmp_path):
+    app_a = _app(tmp_path / "data")
+    app_b = _app(tmp_path / "data")
+    ctx = app_a.state.ctx
+    _create(ctx, "j1")
+
+    runner_a = app_a.state.runner
+    ctx.jobs.claim("j1", runner_a._owner, 60)
+    _expire(ctx, "j1")
+    app_b.state.runner.recover_expired_leases()
+    taken = app_b.state.ctx.jobs.claim_next(app_b.state.runner._owner, 60)
+    assert taken["id"] == "j1"
+
+    stored = ctx.asset_store.save_generated("a1", ".png", b"late output")
+    row = {
+        "asset_id": "a1",
+        "media_type": "image",
+        "file_path": stored.rel_path,
+        "mime_type": "image/png",
+        "size_bytes": stored.size_bytes,
+        "content_hash": stored.sha256,
+        "deduplicated": stored.deduplicated,
+        "source_job_id": "j1",
+    }
+    with pytest.raises(LeaseLostError):
+        runner_a._finish_succeeded("j1", _PendingOutputs(rows=[row]))
+    job = ctx.jobs.get("j1")
+    assert job["status"] == "running"
+    assert job["lease_owner"] == app_b.state.runner._owner
+    assert ctx.assets.get("a1") is None
+    assert not stored.abs_path.exists()
+
+
+def test_runner_that_lost_its_lease_does_not_fail_or_cancel_the_job(tmp_path):
+    app_a = _app(tmp_path / "data")
+    app_b = _app(tmp_path / "data")
+    ctx = app_a.state.ctx
+    _create(ctx, "j1")
+
+    job = ctx.jobs.claim("j1", app_a.state.runner._owner, 60)
+    _expire(ctx, "j1")
+    app_b.state.runner.recover_expired_leases()
+    app_b.state.ctx.jobs.claim_next(app_b.state.runner._owner, 60)
+
+    # No API key is configured, so runner A's attempt fails; the write must not land.
+    app_a.state.runner._execute_leased(job)
+    assert ctx.jobs.set_status("j1", "canceled", owner=app_a.state.runner._owner) is False
+    job = ctx.jobs.get("j1")
+    assert job["status"] == "running"
+    assert job["error_message"] is None
+    assert job["lease_owner"] == app_b.state.runner._owner
+
+
+def test_pending_operation_is_leased_per_poll_and_survives_recovery(tmp_path):
+    ctx = _app(tmp_path / "data").state.ctx
+    _create(ctx, "v1")
+    ctx.jobs.claim("v1", "runner-a", 60)
+    ctx.jobs.set_provider_operation("v1", {"operation_name": "op-1"})
+    ctx.jobs.release_lease("v1", "runner-a")
+
+    assert [j["id"] for j in ctx.jobs.list_pending_operations()] == ["v1"]
+    assert ctx.jobs.claim_operation("v1", "runner-b", 60)["lease_owner"] == "runner-b"
+    # While runner-b polls, nobody else may.
+    assert ctx.jobs.claim_operation("v1", "runner-c", 60) is None
+    assert ctx.jobs.list_pending_operations() == []
+
+    # A poller that died leaves an expired lease; the operation is resumed, not requeued.
+    _expire(ctx, "v1")
+    assert ctx.jobs.recover_expired_leases(max_attempts=3) == ([], [])
+    assert ctx.jobs.get("v1")["status"] == "running"
+    assert ctx.jobs.claim_operation("v1", "runner-c", 60)["lease_owner"] == "runner-c"
+
+
+def test_recovery_is_not_capped(tmp_path):
+    app = _app(tmp_path / "data")
+    ctx = app.state.ctx
+    for i in range(1500):
+        _create(ctx, f"j{i:04d}")
+    with ctx.db.connect() as conn:
+        conn.execute("UPDATE jobs SET status = 'running'")
+
+    app.state.runner.recover_on_startup()
+    assert app.state.runner.qsize() == 1500
+
+
+def test_worker_loop_logs_claim_failures_and_keeps_going(tmp_path, caplog):
+    app = _app(tmp_path / "data", queue_poll_interval_seconds=0.05)
+    runner = app.state.runner
+    calls = []
+
+    def get(claim, timeout):
+        calls.append(timeout)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        runner._stop.set()
+
+    runner._scheduler.get = get
+    runner._worker_loop()
+
+    assert len(calls) == 2
+    assert "Claiming the next job failed" in caplog.text
+    assert "database is locked" in caplog.text
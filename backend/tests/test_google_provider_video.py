@@ -49,3 +49,47 @@ def test_generate_video_downloads_video_bytes_via_sdk_when_uri_is_returned():
     fake_client.files.download.assert_called_once_with(file=video)
     assert out["bytes"] == b"mp4-bytes"
     assert out["mime_type"] == "video/mp4"
+
+
+def test_submit_video_returns_operation_name_and_poll_video_resolves_it():
+    fake_client = Mock()
+    op = Mock(done=False)
+    op.name = "operations/abc"
+    fake_client.models.generate_videos.return_value = op
+
+    p = GoogleProvider(client_factory=lambda **_: fake_client)
+    handle = p.submit_video(
+        provider_model="veo-3.1-generate-preview",
+        prompt="x",
+        duration_seconds=4,
+        aspect_ratio="16:9",
+        client=fake_client,
+    )
+    assert handle == {"operation_name": "operations/abc"}
+
+    fake_client.operations.get.return_value = Mock(done=False)
+    assert p.poll_video("operations/abc", client=fake_client) is None
+    assert fake_client.operations.get.call_args.args[0].name == "operations/abc"
+
+    video = Mock(uri="gs://b/out.mp4", mime_type="video/mp4")
+    video.video_bytes = None
+    done = Mock(done=True, error=None)
+    done.result = Mock(generated_videos=[Mock(video=video)])
+    fake_client.operations.get.return_value = done
+    fake_client.files.download.return_value = b"mp4"
+
+    out = p.poll_video("operations/abc", client=fake_client)
+    assert out == {"bytes": b"mp4", "mime_type": "video/mp4"}
+
+
+def test_poll_video_raises_operation_error():
+    fake_client = Mock()
+    fake_client.operations.get.return_value = Mock(done=True, error={"code": 3, "message": "bad prompt"})
+
+    p = GoogleProvider(client_factory=lambda **_: fake_client)
+    try:
+        p.poll_video("operations/abc", client=fake_client)
+    except RuntimeError as e:
+        assert "bad prompt" in str(e)
+    else:
+        raise AssertionError("expected RuntimeError")
@@ -0,0 +1,104 @@
+import threading
+
+from creativeai_studio.api.jobs import _create_job, _Idempotency
+
+
+def _count_jobs(app) -> int:
+    with app.state.ctx.db.connect() as conn:
+        return conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+
+def test_retried_create_returns_the_original_job(jobs_app, image_job):
+    app, client, enqueued = jobs_app()
+    headers = {"Idempotency-Key": "k-1"}
+
+    first = client.post("/api/jobs", json=image_job("a cat"), headers=headers)
+    again = client.post("/api/jobs", json=image_job("a cat"), headers=headers)
+
+    assert first.status_code == again.status_code == 200
+    assert again.json()["id"] == first.json()["id"]
+    assert "Idempotent-Replayed" not in first.headers
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert enqueued == [first.json()["id"]]
+    assert _count_jobs(app) == 1
+
+    # Without a key (or with another one) every request is a new job.
+    client.post("/api/jobs", json=image_job("a cat"))
+    client.post("/api/jobs", json=image_job("a cat"), headers={"Idempotency-Key": "k-2"})
+    assert _count_jobs(app) == 3
+
+
+def test_key_reused_for_a_different_request_is_rejected(jobs_app, image_job):
+    app, client, _ = jobs_app()
+    headers = {"Idempotency-Key": "k-1"}
+    client.post("/api/jobs", json=image_job("a cat"), headers=headers)
+
+    res = client.post("/api/jobs", json=image_job("a dog"), headers=headers)
+    assert res.status_code == 422
+    src = client.get("/api/jobs").json()[0]["id"]
+    assert client.post(f"/api/jobs/{src}/clone", json={}, headers=headers).status_code == 422
+    assert client.post("/api/jobs", json=image_job("x"), headers={"Idempotency-Key": "k" * 256}).status_code == 400
+    assert _count_jobs(app) == 1
+
+
+def test_retried_batch_and_clone_are_replayed(jobs_app, image_job):
+    app, client, enqueued = jobs_app()
+    batch = {"jobs": [image_job("a"), image_job("b")]}
+    first = client.post("/api/jobs/batch", json=batch, headers={"Idempotency-Key": "b-1"}).json()
+    again = client.post("/api/jobs/batch", json=batch, headers={"Idempotency-Key": "b-1"}).json()
+    assert again["batch_id"] == first["batch_id"]
+    assert [j["id"] for j in again["jobs"]] == [j["id"] for j in first["jobs"]]
+    assert again["total"] == 2
+
+    src = first["jobs"][0]["id"]
+    clone = client.post(f"/api/jobs/{src}/clone", json={"prompt": "c"}, headers={"Idempotency-Key": "c-1"})
+    retry = client.post(f"/api/jobs/{src}/clone", json={"prompt": "c"}, headers={"Idempotency-Key": "c-1"})
+    assert retry.json()["id"] == clone.json()["id"]
+    assert len(enqueued) == 3
+    assert _count_jobs(app) == 3
+
+
+def test_expired_key_can_be_reused(jobs_app, image_job):
+    app, client, _ = jobs_app()
+    headers = {"Idempotency-Key": "k-1"}
+    first = client.post("/api/jobs", json=image_job("a cat"), headers=headers).json()
+    with app.state.ctx.db.connect() as conn:
+        conn.execute("UPDATE idempotency_keys SET expires_at = '2000-01-01T00:00:00+00:00'")
+
+    second = client.post("/api/jobs", json=image_job("a dog"), headers=headers).json()
+    assert second["id"] != first["id"]
+    with app.state.ctx.db.connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM idempotency_keys").fetchone()[0] == 1
+
+
+def test_concurrent_retries_create_one_job(jobs_app, image_job):
+    app, _, enqueued = jobs_app()
+    ctx = app.state.ctx
+    results: list[str] = []
+
+    def submit() -> None:
+        idem = _Idempotency(key="k-1", request_hash="h")
+        results.append(_create_job(image_job("a cat"), ctx, app.state.runner, idem)["id"])
+
+    threads = [threading.Thread(target=submit) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(set(results)) == 1
+    assert len(results) == 8
+    assert len(enqueued) == 1
+    assert _count_jobs(app) == 1
+
+
+def test_live_key_for_a_missing_job_is_a_conflict(jobs_app, image_job):
+    app, client, _ = jobs_app()
+    headers = {"Idempotency-Key": "k-1"}
+    first = client.post("/api/jobs", json=image_job("a cat"), headers=headers).json()
+    with app.state.ctx.db.connect() as conn:
+        conn.execute("DELETE FROM jobs WHERE id = ?", (first["id"],))
+
+    res = client.post("/api/jobs", json=image_job("a cat"), headers=headers)
+    assert res.status_code == 409
+    assert _count_jobs(app) == 0
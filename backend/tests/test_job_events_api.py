@@ -0,0 +1,111 @@
+import json
+import threading
+from io import BytesIO
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+from creativeai_studio.runner import JobRunner
+
+
+class _DummyProvider:
+    def make_client_api_key(self, api_key: str):
+        return object()
+
+    def generate_image(self, **__):
+        buf = BytesIO()
+        Image.new("RGB", (8, 8), color=(255, 0, 0)).save(buf, format="PNG")
+        return {"bytes": buf.getvalue(), "mime_type": "image/png"}
+
+
+def _read_events(resp) -> list[tuple[str, dict]]:
+    events: list[tuple[str, dict]] = []
+    event = None
+    for line in resp.iter_lines():
+        if line.startswith("event: "):
+            event = line[len("event: ") :]
+        elif line.startswith("data: ") and event is not None:
+            events.append((event, json.loads(line[len("data: ") :])))
+            if event == "end":
+                break
+    return events
+
+
+def _create_job(ctx, job_id: str) -> None:
+    ctx.jobs.create(
+        job_id=job_id,
+        job_type="image.generate",
+        model_id="nano-banana-pro",
+        auth_mode="api_key",
+        params={"prompt": "x", "aspect_ratio": "1:1", "image_size": "1k"},
+    )
+
+
+def test_job_events_stream_pushes_runner_transitions(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    ctx = app.state.ctx
+    ctx.settings.set_str("google_api_key", "x")
+    _create_job(ctx, "j1")
+    runner = JobRunner(ctx, provider=_DummyProvider(), concurrency=1)
+    client = TestClient(app)
+
+    def _run_when_subscribed():
+        for _ in range(200):
+            if ctx.events.has_subscribers("j1"):
+                break
+            threading.Event().wait(0.01)
+        runner._run_one("j1")
+
+    t = threading.Thread(target=_run_when_subscribed)
+    t.start()
+    with client.stream("GET", "/api/jobs/j1/events") as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        events = _read_events(resp)
+    t.join(timeout=5)
+
+    statuses = [data["status"] for name, data in events if name == "job"]
+    assert statuses[0] == "queued"
+    assert statuses[-1] == "succeeded"
+    final = [data for name, data in events if name == "job"][-1]
+    assert any(a["role"] == "output" for a in final["job_assets"])
+    assert events[-1][0] == "end"
+    assert not ctx.events.has_subscribers("j1")
+
+
+def test_multiplexed_stream_ends_immediately_for_finished_and_missing_jobs(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    ctx = app.state.ctx
+    _create_job(ctx, "j1")
+    ctx.jobs.set_failed("j1", "boom")
+    client = TestClient(app)
+
+    with client.stream("GET", "/api/jobs/events", params={"ids": "j1,nope"}) as resp:
+        assert resp.status_code == 200
+        events = _read_events(resp)
+
+    assert [name for name, _ in events] == ["job", "missing", "end"]
+    assert events[0][1]["status"] == "failed"
+    assert events[1][1] == {"id": "nope"}
+
+
+def test_job_events_requires_known_job_and_ids(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+
+    assert client.get("/api/jobs/nope/events").status_code == 404
+    assert client.get("/api/jobs/events").status_code == 400
+
+
+def test_publish_skips_snapshot_without_subscribers(tmp_path, monkeypatch):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    ctx = app.state.ctx
+    _create_job(ctx, "j1")
+
+    def _fail(*_, **__):
+        raise AssertionError("snapshot should not be read without subscribers")
+
+    monkeypatch.setattr(ctx.events, "snapshot", _fail)
+    ctx.events.publish_job("j1")
@@ -0,0 +1,91 @@
+def test_batch_of_jobs_is_inserted_and_enqueued_together(jobs_app, image_job):
+    _, client, enqueued = jobs_app()
+
+    resp = client.post(
+        "/api/jobs/batch",
+        json={"jobs": [image_job("a", params={"reference_image_asset_id": "r1"}), image_job("b")]},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 2
+    ids = [j["id"] for j in body["jobs"]]
+    assert enqueued == ids
+    assert [j["params"]["prompt"] for j in body["jobs"]] == ["a", "b"]
+    assert all(j["batch_id"] == body["batch_id"] for j in body["jobs"])
+
+    links = client.get(f"/api/jobs/{ids[0]}").json()["job_assets"]
+    assert links == [{"job_id": ids[0], "asset_id": "r1", "role": "input_reference"}]
+
+    listed = client.get("/api/jobs", params={"batch_id": body["batch_id"]}).json()
+    assert sorted(j["id"] for j in listed) == sorted(ids)
+
+
+def test_batch_template_with_variations(jobs_app, image_job):
+    _, client, enqueued = jobs_app()
+
+    resp = client.post(
+        "/api/jobs/batch",
+        json={
+            "template": image_job("base"),
+            "variations": [{"prompt": "cat"}, {"prompt": "dog", "params": {"aspect_ratio": "16:9"}, "priority": 5}],
+        },
+    )
+    assert resp.status_code == 200
+    jobs = resp.json()["jobs"]
+    assert [j["params"]["prompt"] for j in jobs] == ["cat", "dog"]
+    assert jobs[0]["params"]["aspect_ratio"] == "1:1"
+    assert jobs[1]["params"]["aspect_ratio"] == "16:9"
+    assert jobs[1]["priority"] == 5
+    assert len(enqueued) == 2
+
+
+def test_batch_is_rejected_whole_when_any_item_is_invalid(jobs_app, image_job):
+    _, client, enqueued = jobs_app()
+
+    resp = client.post(
+        "/api/jobs/batch",
+        json={"jobs": [image_job("ok"), {**image_job("bad"), "model_id": "no-such-model"}]},
+    )
+    assert resp.status_code == 400
+    errors = resp.json()["detail"]
+    assert [e["index"] for e in errors] == [1]
+    assert enqueued == []
+    assert client.get("/api/jobs").json() == []
+
+
+def test_batch_shape_errors(jobs_app):
+    client = jobs_app()[1]
+
+    assert client.post("/api/jobs/batch", json={}).status_code == 400
+    assert client.post("/api/jobs/batch", json={"jobs": []}).status_code == 400
+    assert client.post("/api/jobs/batch", json={"jobs": ["x"]}).status_code == 400
+
+
+def test_batch_status_aggregates_job_states(jobs_app, image_job):
+    app, client, _ = jobs_app()
+    ctx = app.state.ctx
+
+    body = client.post("/api/jobs/batch", json={"jobs": [image_job(p) for p in ("a", "b", "c")]}).json()
+    batch_id = body["batch_id"]
+    ids = [j["id"] for j in body["jobs"]]
+
+    status = client.get(f"/api/jobs/batches/{batch_id}").json()
+    assert status["total"] == 3
+    assert status["counts"] == {"queued": 3}
+    assert status["status"] == "queued"
+    assert status["completed"] == 0
+
+    ctx.jobs.set_succeeded(ids[0], {"outputs": []})
+    ctx.jobs.set_status(ids[1], "running")
+    status = client.get(f"/api/jobs/batches/{batch_id}").json()
+    assert status["status"] == "running"
+    assert status["completed"] == 1
+
+    ctx.jobs.set_failed(ids[1], "boom")
+    ctx.jobs.set_succeeded(ids[2], {"outputs": []})
+    status = client.get(f"/api/jobs/batches/{batch_id}").json()
+    assert status["status"] == "partial"
+    assert status["counts"] == {"succeeded": 2, "failed": 1}
+    assert status["finished_at"] is not None
+
+    assert client.get("/api/jobs/batches/missing").status_code == 404
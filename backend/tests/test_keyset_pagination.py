@@ -0,0 +1,111 @@
+from fastapi.testclient import TestClient
+
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+
+
+def _create_jobs(ctx, n: int) -> None:
+    for i in range(n):
+        ctx.jobs.create(
+            job_id=f"j{i:03d}",
+            job_type="image.generate",
+            model_id="nano-banana-pro",
+            auth_mode="api_key",
+            params={"prompt": str(i)},
+        )
+
+
+def test_jobs_cursor_pages_cover_all_rows_without_duplicates(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+    _create_jobs(app.state.ctx, 7)
+
+    seen: list[str] = []
+    cursor = ""
+    while True:
+        resp = client.get("/api/jobs", params={"limit": 3, "cursor": cursor})
+        assert resp.status_code == 200
+        body = resp.json()
+        seen.extend(j["id"] for j in body["items"])
+        if body["next_cursor"] is None:
+            break
+        cursor = body["next_cursor"]
+
+    assert seen == [f"j{i:03d}" for i in reversed(range(7))]
+
+
+def test_jobs_cursor_is_stable_when_new_rows_are_inserted(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+    ctx = app.state.ctx
+    _create_jobs(ctx, 4)
+
+    first = client.get("/api/jobs", params={"limit": 2, "cursor": ""}).json()
+    ctx.jobs.create(
+        job_id="j999",
+        job_type="image.generate",
+        model_id="nano-banana-pro",
+        auth_mode="api_key",
+        params={"prompt": "new"},
+    )
+    second = client.get("/api/jobs", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+
+    assert [j["id"] for j in first["items"]] == ["j003", "j002"]
+    assert [j["id"] for j in second["items"]] == ["j001", "j000"]
+
+
+def test_jobs_offset_mode_still_returns_list(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+    _create_jobs(app.state.ctx, 3)
+
+    resp = client.get("/api/jobs", params={"limit": 2, "offset": 1})
+    assert resp.status_code == 200
+    assert [j["id"] for j in resp.json()] == ["j001", "j000"]
+
+
+def test_invalid_cursor_is_rejected(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+
+    assert client.get("/api/jobs", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/api/assets", params={"cursor": "%%%"}).status_code == 400
+
+
+def test_assets_cursor_pagination(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+    ctx = app.state.ctx
+    for i in range(5):
+        ctx.assets.insert_upload(
+            asset_id=f"a{i}",
+            media_type="image",
+            file_path=f"assets/uploads/a{i}.png",
+            mime_type="image/png",
+            size_bytes=1,
+        )
+
+    page1 = client.get("/api/assets", params={"limit": 3, "cursor": ""}).json()
+    page2 = client.get("/api/assets", params={"limit": 3, "cursor": page1["next_cursor"]}).json()
+
+    assert [a["id"] for a in page1["items"]] == ["a4", "a3", "a2"]
+    assert [a["id"] for a in page2["items"]] == ["a1", "a0"]
+    assert page2["next_cursor"] is None
+
+
+def test_cursor_query_uses_index(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    with app.state.ctx.db.connect() as conn:
+        plan = " ".join(
+            str(r[3])
+            for r in conn.execute(
+                """
+                EXPLAIN QUERY PLAN
+                SELECT * FROM jobs WHERE status = ? AND (created_at, id) < (?, ?)
+                ORDER BY created_at DESC, id DESC LIMIT 51
+                """,
+                ("queued", "2026-01-01T00:00:00+00:00", "x"),
+            )
+        )
+    assert "idx_jobs_status_created" in plan
+    assert "TEMP B-TREE" not in plan
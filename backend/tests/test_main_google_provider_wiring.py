@@ -37,6 +37,11 @@ def test_create_app_wires_google_provider_with_nano_banana_and_veo(monkeypatch,
     app = main_module.create_app(AppConfig(data_dir=tmp_path / "data"))
 
     assert "google" in app.state.runner._providers
+    # Nothing is built until a job first asks for the provider.
+    assert calls == {}
+
+    provider = app.state.runner._providers.get("google")
+    assert isinstance(provider, _GoogleSpy)
     assert calls["nano_client_factory"] is object
     assert calls["veo_client_factory"] is object
     assert calls["google_client_factory"] is object
@@ -1,4 +1,15 @@
-from creativeai_studio.model_catalog import get_model
+import json
+import os
+import time
+
+from creativeai_studio import model_catalog
+from creativeai_studio.model_catalog import (
+    get_catalog,
+    get_model,
+    get_model_constraints,
+    list_models,
+    reload_model_catalog,
+)
 
 
 def test_nano_banana_has_expected_provider_models():
@@ -12,3 +23,48 @@ def test_nano_banana_has_expected_provider_models():
     assert fast is not None
     assert fast["provider_models"]["image_generate"] == "gemini-2.5-flash-image"
     assert fast["resolution_presets"] == ["1k"]
+
+
+def test_catalog_indexes_and_normalized_constraints():
+    catalog = get_catalog()
+    assert {m["model_id"] for m in catalog.by_provider["google"]} >= {"nano-banana", "nano-banana-pro"}
+    assert all(m["media_type"] == "video" for m in catalog.by_media_type["video"])
+
+    c = catalog.constraints["nano-banana-pro"]
+    assert c.resolution_presets == frozenset({"1k", "2k", "4k"})
+    assert "auto" not in c.aspect_ratios
+    assert dict(c.aspect_ratio_values)["16:9"] == 16 / 9
+
+    veo = catalog.constraints["veo-3.1"]
+    assert veo.duration_seconds and all(isinstance(d, int) for d in veo.duration_seconds)
+
+
+def test_catalog_hot_reloads_on_file_change(tmp_path, monkeypatch, caplog):
+    path = tmp_path / "models.json"
+    entry = {"model_id": "m1", "provider_id": "p", "media_type": "image", "resolution_presets": ["1K"]}
+    path.write_text(json.dumps([entry]), encoding="utf-8")
+    monkeypatch.setenv("MODEL_CATALOG_PATH", str(path))
+    monkeypatch.setattr(model_catalog, "RELOAD_CHECK_INTERVAL_SECONDS", 0.0)
+    reload_model_catalog()
+    try:
+        assert get_model("m1") is not None
+        assert get_model_constraints("m1").resolution_presets == frozenset({"1k"})
+        assert get_model("m2") is None
+
+        path.write_text(json.dumps([entry, {**entry, "model_id": "m2"}]), encoding="utf-8")
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+        assert get_model("m2") is not None
+        assert [m["model_id"] for m in list_models(provider_id="p")] == ["m1", "m2"]
+
+        # A broken edit keeps serving the last good catalog.
+        path.write_text("[{", encoding="utf-8")
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 2_000_000_000))
+        assert get_model("m2") is not None
+        assert "Failed to reload model catalog" in caplog.text
+
+        # So does a file that disappears mid-edit.
+        path.unlink()
+        assert get_model("m2") is not None
+    finally:
+        monkeypatch.delenv("MODEL_CATALOG_PATH")
+        reload_model_catalog()
@@ -0,0 +1,78 @@
+from io import BytesIO
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from creativeai_studio.client_cache import ProviderClientCache
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+from creativeai_studio.runner import JobRunner
+
+
+class _CountingProvider:
+    def __init__(self):
+        self.created: list[str] = []
+        self.clients: list[object] = []
+
+    def make_client_api_key(self, api_key: str):
+        self.created.append(api_key)
+        return object()
+
+    def generate_image(self, *, client, **__):
+        self.clients.append(client)
+        buf = BytesIO()
+        Image.new("RGB", (8, 8), color=(0, 0, 255)).save(buf, format="PNG")
+        return {"bytes": buf.getvalue(), "mime_type": "image/png"}
+
+
+def _create_job(ctx, job_id: str) -> None:
+    ctx.jobs.create(
+        job_id=job_id,
+        job_type="image.generate",
+        model_id="nano-banana-pro",
+        auth_mode="api_key",
+        params={"prompt": "x", "aspect_ratio": "1:1", "image_size": "1k"},
+    )
+
+
+def test_cache_is_bounded_lru_keyed_by_key_fingerprint():
+    cache = ProviderClientCache(max_size=2)
+    made: list[str] = []
+
+    def factory(api_key: str):
+        made.append(api_key)
+        return object()
+
+    a = cache.get_or_create("google", "k1", factory)
+    assert cache.get_or_create("google", "k1", factory) is a
+    cache.get_or_create("volcengine_ark", "k1", factory)
+    cache.get_or_create("google", "k2", factory)
+
+    assert made == ["k1", "k1", "k2"]
+    stats = cache.stats()
+    assert stats == {"size": 2, "max_size": 2, "hits": 1, "misses": 3, "evictions": 1}
+    assert cache.get_or_create("google", "k1", factory) is not a
+
+
+def test_runner_reuses_client_until_settings_change_the_key(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    ctx = app.state.ctx
+    client = TestClient(app)
+    assert client.put("/api/settings", json={"google_api_key": "key-1"}).status_code == 200
+
+    provider = _CountingProvider()
+    runner = JobRunner(ctx, provider=provider, concurrency=1)
+    for job_id in ("j1", "j2"):
+        _create_job(ctx, job_id)
+        runner._run_one(job_id)
+
+    assert provider.created == ["key-1"]
+    assert provider.clients[0] is provider.clients[1]
+
+    assert client.put("/api/settings", json={"google_api_key": "key-2"}).status_code == 200
+    _create_job(ctx, "j3")
+    runner._run_one("j3")
+
+    assert provider.created == ["key-1", "key-2"]
+    assert provider.clients[2] is not provider.clients[0]
+    assert ctx.jobs.get("j3")["status"] == "succeeded"
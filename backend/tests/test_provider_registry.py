@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+from creativeai_studio.providers.registry import ProviderRegistry
+
+
+def test_registry_builds_each_provider_once_on_first_use():
+    built: list[str] = []
+
+    def factory():
+        built.append("google")
+        return object()
+
+    registry = ProviderRegistry({"google": factory})
+    assert "google" in registry
+    assert registry.stats() == {"google": "deferred"}
+    assert built == []
+
+    first = registry.get("google")
+    assert registry.get("google") is first
+    assert built == ["google"]
+    assert registry.stats() == {"google": "loaded"}
+    assert registry.get("missing") is None
+
+
+def test_registry_marks_provider_unavailable_when_sdk_import_fails():
+    def factory():
+        raise ImportError("No module named 'openai'")
+
+    registry = ProviderRegistry({"volcengine_ark": factory})
+    assert registry.get("volcengine_ark") is None
+    assert registry.stats() == {"volcengine_ark": "unavailable"}
+
+
+def test_importing_main_does_not_import_provider_sdks():
+    code = (
+        "import json, sys\n"
+        "import creativeai_studio.main\n"
+        "heavy = ('google.genai', 'google.cloud.storage', 'openai')\n"
+        "print(json.dumps([m for m in heavy if m in sys.modules]))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    assert json.loads(out.stdout.strip().splitlines()[-1]) == []
@@ -0,0 +1,112 @@
+from io import BytesIO
+
+from PIL import Image
+
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+from creativeai_studio.providers.volcengine_ark_provider import VolcengineArkProvider
+from creativeai_studio.reference_cache import ReferenceCache
+from creativeai_studio.runner import JobRunner
+
+
+def test_cache_is_byte_budgeted_lru_with_metrics():
+    cache = ReferenceCache(max_bytes=10)
+    loads: list[str] = []
+
+    def loader(name: str, size: int):
+        def load() -> bytes:
+            loads.append(name)
+            return b"x" * size
+
+        return load
+
+    assert cache.get_bytes("a", "h1", loader("a", 4)) == b"xxxx"
+    assert cache.get_bytes("a", "h1", loader("a", 4)) == b"xxxx"
+    cache.get_bytes("b", "h1", loader("b", 4))
+    cache.get_bytes("a", "h1", loader("a", 4))  # touch a, so b is the LRU entry
+    cache.get_bytes("c", "h1", loader("c", 4))  # over budget: evicts b
+
+    assert loads == ["a", "b", "c"]
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 3
+    assert stats["evictions"] == 1
+    assert stats["size_bytes"] == 8
+
+    # A different content hash is a different entry, never the stale bytes.
+    assert cache.get_bytes("a", "h2", lambda: b"new") == b"new"
+    # Payloads larger than the whole budget are returned but not kept.
+    assert cache.get_bytes("big", "h", lambda: b"y" * 11) == b"y" * 11
+    assert cache.stats()["entries"] <= 3
+
+
+class _ArkLikeProvider:
+    reference_encodings = ("data_url",)
+
+    def __init__(self):
+        self.encoded = 0
+        self.seen_refs: list[list[dict]] = []
+
+    def make_client_api_key(self, api_key: str):
+        return object()
+
+    def encode_reference(self, kind: str, data: bytes, mime_type: str) -> str:
+        self.encoded += 1
+        return VolcengineArkProvider(client_factory=object).encode_reference(kind, data, mime_type)
+
+    def generate_image(self, *, reference_images=None, **__):
+        self.seen_refs.append(list(reference_images or []))
+        buf = BytesIO()
+        Image.new("RGB", (8, 8)).save(buf, format="PNG")
+        return {"bytes": buf.getvalue(), "mime_type": "image/png"}
+
+
+def test_runner_reuses_reference_bytes_and_data_urls_across_jobs(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    ctx = app.state.ctx
+
+    img = BytesIO()
+    Image.new("RGB", (4, 4), color=(255, 0, 0)).save(img, format="PNG")
+    stored = ctx.asset_store.save_upload(asset_id="a1", filename="ref.png", content=img.getvalue())
+    ctx.assets.insert_upload(
+        asset_id="a1",
+        media_type="image",
+        file_path=stored.rel_path,
+        mime_type="image/png",
+        size_bytes=stored.size_bytes,
+        width=4,
+        height=4,
+        content_hash=stored.sha256,
+    )
+    ctx.settings.set_str("ark_api_key", "k")
+
+    provider = _ArkLikeProvider()
+    runner = JobRunner(ctx, providers={"volcengine_ark": provider})
+    for job_id in ("j1", "j2", "j3"):
+        ctx.jobs.create(
+            job_id=job_id,
+            job_type="image.generate",
+            model_id="doubao-seedream-4-5-251128",
+            auth_mode="api_key",
+            params={"prompt": "x", "image_size": "2k", "reference_image_asset_ids": ["a1"]},
+        )
+        runner._run_one(job_id)
+        assert ctx.jobs.get(job_id)["status"] == "succeeded"
+
+    assert provider.encoded == 1
+    data_urls = {refs[0]["data_url"] for refs in provider.seen_refs}
+    assert len(data_urls) == 1
+    assert data_urls.pop().startswith("data:image/png;base64,")
+
+    stats = ctx.references.stats()
+    assert stats["misses"] == 2  # raw bytes + data URL, once each
+    assert stats["hits"] == 4
+
+
+def test_ark_provider_prefers_precomputed_data_url():
+    refs = VolcengineArkProvider._coerce_reference_images(
+        reference_image_bytes=None,
+        reference_image_mime_type=None,
+        reference_images=[{"bytes": b"raw", "mime_type": "image/png", "data_url": "data:cached"}],
+    )
+    assert refs == ["data:cached"]
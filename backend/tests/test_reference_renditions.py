@@ -0,0 +1,112 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+from creativeai_studio.model_catalog import build_catalog, get_model_constraints
+from creativeai_studio.runner import JobRunner
+
+
+class _CapturingProvider:
+    def __init__(self):
+        self.seen: list[dict] = []
+
+    def make_client_api_key(self, api_key: str):
+        return object()
+
+    def generate_image(self, *, reference_images=None, **__):
+        self.seen.extend(reference_images or [])
+        buf = BytesIO()
+        Image.new("RGB", (8, 8)).save(buf, format="PNG")
+        return {"bytes": buf.getvalue(), "mime_type": "image/png"}
+
+
+def _upload(ctx, asset_id: str, size: tuple[int, int], mode: str = "RGB") -> None:
+    buf = BytesIO()
+    Image.new(mode, size).save(buf, format="PNG")
+    stored = ctx.asset_store.save_upload(asset_id=asset_id, filename="ref.png", content=buf.getvalue())
+    ctx.assets.insert_upload(
+        asset_id=asset_id,
+        media_type="image",
+        file_path=stored.rel_path,
+        mime_type="image/png",
+        size_bytes=stored.size_bytes,
+        width=size[0],
+        height=size[1],
+        content_hash=stored.sha256,
+    )
+
+
+def _run(data_dir, job_id: str, ref_id: str) -> tuple[_CapturingProvider, list]:
+    # A fresh app per job, so reuse has to come from the disk rendition rather than memory.
+    ctx = create_app(AppConfig(data_dir=data_dir)).state.ctx
+    ctx.settings.set_str("google_api_key", "k")
+    renders: list = []
+    render = ctx.renditions._render_reference
+    ctx.renditions._render_reference = lambda *a: renders.append(a) or render(*a)
+
+    provider = _CapturingProvider()
+    ctx.jobs.create(
+        job_id=job_id,
+        job_type="image.generate",
+        model_id="nano-banana",
+        auth_mode="api_key",
+        params={"prompt": "x", "aspect_ratio": "1:1", "reference_image_asset_id": ref_id},
+    )
+    JobRunner(ctx, providers={"google": provider})._run_one(job_id)
+    assert ctx.jobs.get(job_id)["status"] == "succeeded"
+    return provider, renders
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    return tmp_path / "data"
+
+
+def test_oversized_reference_is_downsized_once_and_reused(data_dir):
+    max_edge = get_model_constraints("nano-banana").reference_image_max_edge
+    _upload(create_app(AppConfig(data_dir=data_dir)).state.ctx, "a1", (max_edge * 2, max_edge // 2))
+
+    first, renders = _run(data_dir, "j1", "a1")
+    assert len(renders) == 1
+    ref = first.seen[0]
+    assert ref["mime_type"] == "image/jpeg"
+    with Image.open(BytesIO(ref["bytes"])) as img:
+        assert img.format == "JPEG"
+        assert img.size == (max_edge, max_edge // 4)
+
+    second, renders = _run(data_dir, "j2", "a1")
+    assert renders == []
+    assert second.seen[0]["bytes"] == ref["bytes"]
+    assert len(list((data_dir / "renditions" / "a1").glob(f"ref{max_edge}-*.jpg"))) == 1
+
+
+def test_references_within_the_limit_are_sent_untouched(data_dir):
+    ctx = create_app(AppConfig(data_dir=data_dir)).state.ctx
+    _upload(ctx, "small", (64, 32))
+
+    provider, renders = _run(data_dir, "j1", "small")
+    assert renders == []
+    assert provider.seen[0]["mime_type"] == "image/png"
+    original = ctx.asset_store.resolve(ctx.assets.get("small")["file_path"])
+    assert provider.seen[0]["bytes"] == original.read_bytes()
+    assert not (data_dir / "renditions" / "small").exists()
+
+
+def test_transparent_references_stay_png(data_dir):
+    ctx = create_app(AppConfig(data_dir=data_dir)).state.ctx
+    _upload(ctx, "alpha", (300, 600), "RGBA")
+    path, mime_type = ctx.renditions.get_reference(ctx.assets.get("alpha"), 100)
+    assert mime_type == "image/png"
+    with Image.open(path) as img:
+        assert img.mode == "RGBA"
+        assert img.size == (50, 100)
+
+
+def test_catalog_rejects_invalid_reference_edge(tmp_path):
+    entry = {"model_id": "m", "reference_image_max_edge": 0}
+    with pytest.raises(ValueError, match="reference_image_max_edge"):
+        build_catalog([entry], tmp_path / "models.json")
+    assert build_catalog([{"model_id": "m"}], tmp_path).constraints["m"].reference_image_max_edge is None
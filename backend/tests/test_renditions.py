@@ -0,0 +1,177 @@
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+from creativeai_studio.renditions import snap_width
+
+
+def _upload_png(client: TestClient, width: int, height: int) -> str:
+    buf = BytesIO()
+    Image.new("RGB", (width, height), color=(200, 10, 10)).save(buf, format="PNG")
+    up = client.post("/api/assets/upload", files={"file": ("big.png", buf.getvalue(), "image/png")})
+    assert up.status_code == 200
+    return up.json()["id"]
+
+
+def test_snap_width_rounds_up_to_fixed_sizes():
+    assert snap_width(None) == 256
+    assert snap_width(1) == 128
+    assert snap_width(200) == 256
+    assert snap_width(256) == 256
+    assert snap_width(5000) == 1024
+
+
+def test_thumbnail_is_generated_lazily_and_cached(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+    asset_id = _upload_png(client, 1600, 800)
+
+    res = client.get(f"/api/assets/{asset_id}/thumbnail", params={"w": 300})
+    assert res.status_code == 200
+    assert res.headers["content-type"] == app.state.ctx.renditions.mime_type
+    with Image.open(BytesIO(res.content)) as img:
+        assert img.size == (512, 256)
+
+    cached = app.state.ctx.renditions.path_for(asset_id, 512)
+    assert cached.parent == tmp_path / "data/renditions" / asset_id
+    mtime = cached.stat().st_mtime_ns
+    assert client.get(f"/api/assets/{asset_id}/thumbnail", params={"w": 512}).status_code == 200
+    assert cached.stat().st_mtime_ns == mtime
+    assert res.headers["cache-control"] == "public, max-age=31536000, immutable"
+    revalidated = client.get(
+        f"/api/assets/{asset_id}/thumbnail",
+        params={"w": 512},
+        headers={"If-None-Match": res.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+
+
+def test_small_images_are_not_upscaled(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+    asset_id = _upload_png(client, 40, 30)
+
+    res = client.get(f"/api/assets/{asset_id}/thumbnail", params={"w": 1024})
+    with Image.open(BytesIO(res.content)) as img:
+        assert img.size == (40, 30)
+
+
+def test_video_thumbnail_uses_poster_frame(tmp_path, monkeypatch):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+    ctx = app.state.ctx
+    stored = ctx.asset_store.save_generated("v1", ".mp4", b"not really a video")
+    ctx.jobs.create(job_id="j1", job_type="video.generate", model_id="veo-3.1", auth_mode="api_key", params={})
+    ctx.assets.insert_generated(
+        asset_id="v1",
+        media_type="video",
+        file_path=stored.rel_path,
+        mime_type="video/mp4",
+        size_bytes=stored.size_bytes,
+        source_job_id="j1",
+        duration_seconds=8.0,
+    )
+
+    offsets = []
+
+    def fake_extract(src: Path, duration_seconds):
+        offsets.append(duration_seconds)
+        frame = tmp_path / "frame.png"
+        Image.new("RGB", (1280, 720)).save(frame)
+        return frame
+
+    monkeypatch.setattr(ctx.renditions, "_extract_poster_frame", fake_extract)
+    res = client.get("/api/assets/v1/thumbnail", params={"w": 128})
+    assert res.status_code == 200
+    with Image.open(BytesIO(res.content)) as img:
+        assert img.size == (128, 72)
+    assert offsets == [8.0]
+    assert not (tmp_path / "frame.png").exists()
+
+
+def test_thumbnail_unavailable_returns_404(tmp_path, monkeypatch, caplog):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+    ctx = app.state.ctx
+    calls = []
+
+    def fail(src, duration_seconds):
+        calls.append(src)
+        raise FileNotFoundError("ffmpeg")
+
+    monkeypatch.setattr(ctx.renditions, "_extract_poster_frame", fail)
+    ctx.assets.insert_upload(
+        asset_id="v2",
+        media_type="video",
+        file_path="assets/uploads/v2.mp4",
+        mime_type="video/mp4",
+        size_bytes=1,
+    )
+
+    assert client.get("/api/assets/v2/thumbnail").status_code == 404
+    assert client.get("/api/assets/nope/thumbnail").status_code == 404
+    # The failure is logged once and remembered instead of re-running ffmpeg per request.
+    assert client.get("/api/assets/v2/thumbnail").status_code == 404
+    assert len(calls) == 1
+    assert "Failed to render 256px thumbnail for asset v2" in caplog.text
+
+
+def test_concurrent_requests_render_a_tile_once(tmp_path, monkeypatch):
+    ctx = create_app(AppConfig(data_dir=tmp_path / "data")).state.ctx
+    renditions = ctx.renditions
+    # Inserted through the repo rather than uploaded, so no background prewarm races the test.
+    buf = BytesIO()
+    Image.new("RGB", (600, 300)).save(buf, format="PNG")
+    stored = ctx.asset_store.save_upload("a1", "a.png", buf.getvalue())
+    asset = ctx.assets.insert_upload(
+        asset_id="a1",
+        media_type="image",
+        file_path=stored.rel_path,
+        mime_type="image/png",
+        size_bytes=stored.size_bytes,
+        content_hash=stored.sha256,
+    )
+
+    started, release = threading.Event(), threading.Event()
+    renders = []
+    render = renditions._render
+
+    def slow_render(*args):
+        renders.append(args)
+        started.set()
+        release.wait(5)
+        render(*args)
+
+    monkeypatch.setattr(renditions, "_render", slow_render)
+    threads = [threading.Thread(target=renditions.get_or_create, args=(asset, 128)) for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    key = (asset["id"], 128)
+    while renditions._key_locks[key].users < 4:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(renders) == 1
+    assert renditions._key_locks == {}
+
+
+def test_render_failures_are_bounded(tmp_path, monkeypatch):
+    renditions = create_app(AppConfig(data_dir=tmp_path / "data")).state.ctx.renditions
+    monkeypatch.setattr("creativeai_studio.renditions.MAX_RENDER_FAILURES", 3)
+    for i in range(5):
+        renditions._record_failure((f"a{i}", 128))
+    assert list(renditions._failures) == [("a2", 128), ("a3", 128), ("a4", 128)]
+
+    renditions._failures[("a2", 128)] -= 3600  # backoff over
+    renditions._record_failure(("a5", 128))
+    assert ("a2", 128) not in renditions._failures
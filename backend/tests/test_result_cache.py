@@ -0,0 +1,104 @@
+from fastapi.testclient import TestClient
+
+
+def _succeed(ctx, job_id: str, asset_id: str) -> None:
+    # What the runner does for a finished job: output asset, output link, terminal state.
+    stored = ctx.asset_store.save_generated(asset_id, ".png", asset_id.encode())
+    ctx.assets.insert_generated(
+        asset_id=asset_id,
+        media_type="image",
+        file_path=stored.rel_path,
+        mime_type="image/png",
+        size_bytes=stored.size_bytes,
+        source_job_id=job_id,
+    )
+    ctx.job_assets.add(job_id, asset_id, role="output")
+    ctx.jobs.set_succeeded(job_id, {"output_asset_id": asset_id})
+
+
+def _upload(client: TestClient, content: bytes) -> str:
+    res = client.post("/api/assets/upload", files={"file": ("ref.png", content, "image/png")})
+    assert res.status_code == 200
+    return res.json()["id"]
+
+
+def test_identical_request_links_prior_outputs_without_queueing(jobs_app, image_job):
+    app, client, enqueued = jobs_app(result_cache_ttl_seconds=3600)
+    ctx = app.state.ctx
+
+    first = client.post("/api/jobs", json=image_job("a cat")).json()
+    assert first["status"] == "queued"
+    _succeed(ctx, first["id"], "out1")
+
+    # Priority and auth do not change what gets generated, so they do not defeat the cache.
+    again = client.post("/api/jobs", json=image_job("a cat", priority=5)).json()
+    assert again["status"] == "succeeded"
+    assert again["result"] == {"output_asset_id": "out1", "cached_from": first["id"]}
+    assert enqueued == [first["id"]]
+    links = client.get(f"/api/jobs/{again['id']}").json()["job_assets"]
+    assert {"job_id": again["id"], "asset_id": "out1", "role": "output"} in links
+
+    clone = client.post(f"/api/jobs/{again['id']}/clone", json={}).json()
+    assert clone["status"] == "succeeded"
+    assert clone["result"]["cached_from"] == first["id"]
+
+    assert client.post("/api/jobs", json=image_job("a dog")).json()["status"] == "queued"
+    fresh = client.post("/api/jobs", json=image_job("a cat", cache=False)).json()
+    assert fresh["status"] == "queued"
+    rerun = client.post(f"/api/jobs/{first['id']}/clone", json={"cache": False}).json()
+    assert rerun["status"] == "queued"
+    assert client.post("/api/jobs", json=image_job("a cat", cache="no")).status_code == 400
+
+
+def test_references_match_by_content_not_asset_id(jobs_app, image_job, png):
+    app, client, _ = jobs_app(result_cache_ttl_seconds=3600)
+    ref_a = _upload(client, png((255, 0, 0)))
+    ref_b = _upload(client, png((255, 0, 0)))
+    other = _upload(client, png((0, 0, 255)))
+
+    first = client.post("/api/jobs", json=image_job("x", params={"reference_image_asset_id": ref_a})).json()
+    _succeed(app.state.ctx, first["id"], "out1")
+
+    same = client.post("/api/jobs", json=image_job("x", params={"reference_image_asset_id": ref_b})).json()
+    assert same["status"] == "succeeded"
+    changed = client.post("/api/jobs", json=image_job("x", params={"reference_image_asset_id": other}))
+    assert changed.json()["status"] == "queued"
+
+
+def test_cache_is_off_by_default_and_respects_ttl(tmp_path, jobs_app, image_job, png):
+    app, client, _ = jobs_app(data_dir=tmp_path / "off", result_cache_ttl_seconds=0)
+    first = client.post("/api/jobs", json=image_job("a cat")).json()
+    _succeed(app.state.ctx, first["id"], "out1")
+    assert client.post("/api/jobs", json=image_job("a cat")).json()["status"] == "queued"
+    assert app.state.ctx.jobs.get(first["id"])["request_key"] is None
+
+    # With the cache off, no key is computed, so inputs are not read for it either.
+    ref = _upload(client, png((255, 0, 0)))
+    reads = []
+    get = app.state.ctx.assets.get
+    app.state.ctx.assets.get = lambda *a, **kw: reads.append(a) or get(*a, **kw)
+    job = client.post("/api/jobs", json=image_job("x", params={"reference_image_asset_id": ref})).json()
+    assert job["status"] == "queued"
+    assert reads == []
+
+    app, client, _ = jobs_app(data_dir=tmp_path / "ttl", result_cache_ttl_seconds=60)
+    first = client.post("/api/jobs", json=image_job("a cat")).json()
+    _succeed(app.state.ctx, first["id"], "out1")
+    with app.state.ctx.db.connect() as conn:
+        conn.execute("UPDATE jobs SET finished_at = '2000-01-01T00:00:00+00:00' WHERE id = ?", (first["id"],))
+    assert client.post("/api/jobs", json=image_job("a cat")).json()["status"] == "queued"
+
+
+def test_batch_only_enqueues_cache_misses(jobs_app, image_job):
+    app, client, enqueued = jobs_app(result_cache_ttl_seconds=3600)
+    first = client.post("/api/jobs", json=image_job("a cat")).json()
+    _succeed(app.state.ctx, first["id"], "out1")
+    enqueued.clear()
+
+    body = client.post("/api/jobs/batch", json={"jobs": [image_job("a cat"), image_job("a dog")]}).json()
+    hit, miss = body["jobs"]
+    assert hit["status"] == "succeeded"
+    assert miss["status"] == "queued"
+    assert enqueued == [miss["id"]]
+    summary = client.get(f"/api/jobs/batches/{body['batch_id']}").json()
+    assert summary["counts"] == {"queued": 1, "succeeded": 1}
@@ -0,0 +1,215 @@
+import random
+from io import BytesIO
+
+from PIL import Image
+
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+from creativeai_studio.retry_policy import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    RetryPolicy,
+    is_transient_error,
+)
+from creativeai_studio.runner import JobRunner
+
+
+class _HttpError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_transient_errors_are_classified():
+    assert is_transient_error(RuntimeError("503 UNAVAILABLE. {'status': 'UNAVAILABLE'}"))
+    assert is_transient_error(RuntimeError("429 RESOURCE_EXHAUSTED quota"))
+    assert is_transient_error(ConnectionResetError())
+    assert is_transient_error(_HttpError(502))
+    assert not is_transient_error(_HttpError(400))
+    assert not is_transient_error(RuntimeError("No image output"))
+    # Raised by the runner itself when a video operation overruns; retrying would loop forever.
+    assert not is_transient_error(TimeoutError("Video generation timed out"))
+
+
+def test_backoff_grows_exponentially_with_jitter_and_a_cap():
+    policy = RetryPolicy(max_attempts=5, base_delay_seconds=2, max_delay_seconds=10)
+    rng = random.Random(7)
+    for attempts, step in [(1, 2), (2, 4), (3, 8), (4, 10), (9, 10)]:
+        delays = [policy.backoff_seconds(attempts, rng) for _ in range(50)]
+        assert all(step / 2 <= d <= step for d in delays)
+        assert len(set(delays)) > 1
+
+    busy = RuntimeError("503 UNAVAILABLE")
+    assert policy.should_retry(busy, attempts=4)
+    assert not policy.should_retry(busy, attempts=5)
+    assert not policy.should_retry(ValueError("bad prompt"), attempts=1)
+
+
+def test_circuit_breaker_opens_then_readmits_gradually():
+    now = [0.0]
+    breaker = CircuitBreaker(
+        failure_threshold=2, cooldown_seconds=30, recovery_successes=2, clock=lambda: now[0]
+    )
+
+    for _ in range(2):
+        assert breaker.try_acquire()
+        breaker.record_result(False)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert not breaker.try_acquire()
+
+    now[0] = 31
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert breaker.try_acquire()
+    assert not breaker.try_acquire()  # one probe at a time to start with
+    breaker.release()  # the probe slot comes back if the claim found nothing
+    assert breaker.try_acquire()
+    breaker.record_result(True)
+    assert breaker.try_acquire()
+    assert breaker.try_acquire()  # one success: two concurrent jobs
+    assert not breaker.try_acquire()
+    breaker.record_result(True)
+    assert breaker.state == CLOSED
+    breaker.record_result(None)
+
+    # A failure while half-open goes straight back to open.
+    for _ in range(2):
+        assert breaker.try_acquire()
+        breaker.record_result(False)
+    now[0] = 62
+    assert breaker.try_acquire()
+    breaker.record_result(False)
+    assert breaker.state == OPEN
+    assert breaker.stats()["opened_total"] == 3
+
+
+class _FlakyProvider:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def make_client_api_key(self, api_key: str):
+        return object()
+
+    def generate_image(self, **__):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("503 UNAVAILABLE: currently experiencing high demand")
+        buf = BytesIO()
+        Image.new("RGB", (8, 8)).save(buf, format="PNG")
+        return {"bytes": buf.getvalue(), "mime_type": "image/png"}
+
+
+def _runner(tmp_path, provider, **cfg):
+    app = create_app(AppConfig(data_dir=tmp_path / "data", **cfg))
+    ctx = app.state.ctx
+    ctx.settings.set_str("google_api_key", "x")
+    ctx.settings.set_str("ark_api_key", "x")
+    return ctx, JobRunner(ctx, providers={"google": provider, "volcengine_ark": provider})
+
+
+def _create(ctx, job_id: str, model_id: str = "nano-banana-pro", lane: str = "google/image.generate"):
+    ctx.jobs.create(
+        job_id=job_id,
+        job_type="image.generate",
+        model_id=model_id,
+        auth_mode="api_key",
+        params={"prompt": "x", "aspect_ratio": "1:1", "image_size": "2k"},
+        lane=lane,
+    )
+
+
+def test_transient_failure_is_requeued_with_backoff_then_succeeds(tmp_path):
+    provider = _FlakyProvider(failures=1)
+    ctx, runner = _runner(tmp_path, provider, retry_base_delay_seconds=60, retry_max_delay_seconds=60)
+    _create(ctx, "j1")
+
+    runner._run_one("j1")
+    job = ctx.jobs.get("j1")
+    assert job["status"] == "queued"
+    assert job["attempts"] == 1
+    assert job["lease_owner"] is None
+    assert "重试" in job["status_message"]
+    assert "503" in job["error_detail"]
+    # Not claimable while the backoff runs, neither by lane nor by id.
+    assert ctx.jobs.claim_next("other", 60) is None
+    assert ctx.jobs.claim("j1", "other", 60) is None
+
+    with ctx.db.connect() as conn:
+        conn.execute("UPDATE jobs SET available_at = '2000-01-01T00:00:00+00:00'")
+    runner._run_one("j1")
+    job = ctx.jobs.get("j1")
+    assert job["status"] == "succeeded"
+    assert job["attempts"] == 2
+    assert provider.calls == 2
+
+
+def test_retries_stop_at_the_models_max_attempts(tmp_path):
+    provider = _FlakyProvider(failures=10)
+    ctx, runner = _runner(
+        tmp_path, provider, job_max_attempts=5, retry_base_delay_seconds=0, retry_max_delay_seconds=0
+    )
+    ctx.jobs.create(
+        job_id="v1",
+        job_type="video.generate",
+        model_id="veo-3.1",
+        auth_mode="api_key",
+        params={"prompt": "x", "aspect_ratio": "16:9", "duration_seconds": 4},
+    )
+    provider.generate_video = provider.generate_image  # type: ignore[attr-defined]
+
+    # veo-3.1 sets retry_max_attempts=2 in the catalog, overriding JOB_MAX_ATTEMPTS.
+    runner._run_one("v1")
+    assert ctx.jobs.get("v1")["status"] == "queued"
+    runner._run_one("v1")
+    job = ctx.jobs.get("v1")
+    assert job["status"] == "failed"
+    assert job["attempts"] == 2
+    assert "服务繁忙" in job["error_message"]
+
+
+def test_open_circuit_pauses_only_the_failing_provider(tmp_path):
+    provider = _FlakyProvider(failures=10)
+    ctx, runner = _runner(
+        tmp_path, provider, circuit_failure_threshold=1, circuit_cooldown_seconds=3600
+    )
+    _create(ctx, "g1")
+    _create(ctx, "g2")
+    _create(ctx, "a1", model_id="doubao-seedream-4-5-251128", lane="volcengine_ark/image.generate")
+
+    runner._run_one("g1")
+    assert runner.circuit_stats()["google"]["state"] == OPEN
+
+    lanes = ["google/image.generate", "volcengine_ark/image.generate"]
+    assert runner._claim_next("google/image.generate", lanes) is None
+    lane, job, _ = runner._claim_next("volcengine_ark/image.generate", lanes)
+    assert (lane, job["id"]) == ("volcengine_ark/image.generate", "a1")
+    # Google jobs stay queued, including those reached through the unknown-lane fallback.
+    assert runner._claim_next(None, []) is None
+    assert ctx.jobs.get("g2")["status"] == "queued"
+    # A direct run is refused by the open breaker too, and hands the claim back unspent.
+    runner._run_one("g2")
+    job = ctx.jobs.get("g2")
+    assert (job["status"], job["attempts"], job["lease_owner"]) == ("queued", 0, None)
+    assert runner.circuit_stats()["google"]["in_flight"] == 0
+
+
+def test_non_transient_failures_leave_the_circuit_closed(tmp_path):
+    provider = _FlakyProvider(failures=0)
+
+    def reject(**__):
+        raise ValueError("prompt rejected by policy")
+
+    provider.generate_image = reject  # type: ignore[method-assign]
+    ctx, runner = _runner(tmp_path, provider, circuit_failure_threshold=1)
+    _create(ctx, "g1")
+    _create(ctx, "g2")
+
+    runner._run_one("g1")
+    runner._run_one("g2")
+    assert [ctx.jobs.get(j)["status"] for j in ("g1", "g2")] == ["failed", "failed"]
+    stats = runner.circuit_stats()["google"]
+    assert (stats["state"], stats["consecutive_failures"], stats["in_flight"]) == ("closed", 0, 0)
@@ -96,7 +96,9 @@ def test_runner_image_generate_shows_friendly_message_for_nano_banana_no_image(t
 
 
 def test_runner_image_generate_shows_friendly_message_for_provider_503(tmp_path):
-    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    app = create_app(
+        AppConfig(data_dir=tmp_path / "data", retry_base_delay_seconds=0, retry_max_delay_seconds=0)
+    )
     ctx = app.state.ctx
     ctx.settings.set_str("google_api_key", "x")
 
@@ -109,7 +111,11 @@ def test_runner_image_generate_shows_friendly_message_for_provider_503(tmp_path)
     )
 
     runner = JobRunner(ctx, provider=_BusyDummyProvider(), concurrency=1)
+    # 503s are retried first; the friendly message is what is left once attempts run out.
     runner._run_one("j3")
+    assert ctx.jobs.get("j3")["status"] == "queued"
+    for _ in range(ctx.cfg.job_max_attempts - 1):
+        runner._run_one("j3")
 
     job = ctx.jobs.get("j3")
     assert job is not None
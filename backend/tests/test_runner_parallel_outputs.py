@@ -0,0 +1,134 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+from PIL import Image
+
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+from creativeai_studio.runner import JobRunner
+
+COLORS = [(i * 30, 255 - i * 30, 7) for i in range(8)]
+
+
+def _png(color: tuple[int, int, int]) -> bytes:
+    buf = BytesIO()
+    Image.new("RGB", (4, 4), color=color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class _SlowImageServer:
+    def __init__(self, delay: float):
+        self.active = 0
+        self.max_active = 0
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with lock:
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                time.sleep(delay)
+                body = _png(COLORS[int(self.path.strip("/"))])
+                self.send_response(200)
+                self.send_header("Content-Type", "image/png")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with lock:
+                    server.active -= 1
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+
+class _UrlArkProvider:
+    def __init__(self, base: str):
+        self.base = base
+
+    def make_client_api_key(self, api_key: str):
+        return object()
+
+    def generate_image(self, **__):
+        return {"items": [{"url": f"{self.base}/{i}"} for i in range(len(COLORS))]}
+
+
+def test_multi_image_outputs_are_fetched_in_parallel_and_keep_order(tmp_path):
+    server = _SlowImageServer(delay=0.2)
+    try:
+        app = create_app(AppConfig(data_dir=tmp_path / "data", output_fetch_workers=4))
+        ctx = app.state.ctx
+        ctx.settings.set_str("ark_api_key", "ark_x")
+        ctx.jobs.create(
+            job_id="j1",
+            job_type="image.generate",
+            model_id="doubao-seedream-4-5-251128",
+            auth_mode="api_key",
+            params={"prompt": "x", "aspect_ratio": "1:1", "image_size": "2k", "sequential_image_generation": "auto"},
+        )
+
+        batches = []
+        original = ctx.assets.insert_generated_many
+
+        def spy(rows):
+            batches.append(len(rows))
+            return original(rows)
+
+        ctx.assets.insert_generated_many = spy
+        runner = JobRunner(ctx, providers={"volcengine_ark": _UrlArkProvider(server.base)})
+
+        started = time.monotonic()
+        runner._run_one("j1")
+        elapsed = time.monotonic() - started
+    finally:
+        server.httpd.shutdown()
+        server.httpd.server_close()
+
+    job = ctx.jobs.get("j1")
+    assert job["status"] == "succeeded"
+    assert server.max_active > 1
+    assert elapsed < 0.2 * len(COLORS)
+    assert batches == [len(COLORS)]
+
+    outputs = job["result"]["outputs"]
+    assert [o["index"] for o in outputs] == list(range(len(COLORS)))
+    for out, color in zip(outputs, COLORS):
+        asset = ctx.assets.get(out["asset_id"])
+        with Image.open(ctx.asset_store.resolve(asset["file_path"])) as img:
+            assert img.convert("RGB").getpixel((0, 0)) == color
+
+    linked = {row["asset_id"] for row in ctx.job_assets.list_by_job("j1") if row["role"] == "output"}
+    assert linked == {o["asset_id"] for o in outputs}
+
+
+class _PartlyBrokenArkProvider:
+    def make_client_api_key(self, api_key: str):
+        return object()
+
+    def generate_image(self, **__):
+        return {"items": [{"bytes": _png(COLORS[0])}, {"b64_json": "not base64!"}, {"bytes": _png(COLORS[1])}]}
+
+
+def test_failed_output_discards_the_siblings_already_written(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data", output_fetch_workers=4))
+    ctx = app.state.ctx
+    ctx.settings.set_str("ark_api_key", "ark_x")
+    ctx.jobs.create(
+        job_id="j1",
+        job_type="image.generate",
+        model_id="doubao-seedream-4-5-251128",
+        auth_mode="api_key",
+        params={"prompt": "x", "aspect_ratio": "1:1", "image_size": "2k", "sequential_image_generation": "auto"},
+    )
+    runner = JobRunner(ctx, providers={"volcengine_ark": _PartlyBrokenArkProvider()})
+
+    runner._run_one("j1")
+
+    assert ctx.jobs.get("j1")["status"] == "failed"
+    assert [p for p in (tmp_path / "data/assets/blobs").rglob("*") if p.is_file()] == []
@@ -0,0 +1,97 @@
+from concurrent.futures import wait
+
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+from creativeai_studio.runner import JobRunner
+
+
+class _AsyncVideoProvider:
+    def __init__(self, polls_until_done: int = 1):
+        self.submitted: list[str] = []
+        self.polled: list[str] = []
+        self._polls_until_done = polls_until_done
+
+    def make_client_api_key(self, api_key: str):
+        return object()
+
+    def submit_video(self, *, provider_model: str, **__):
+        self.submitted.append(provider_model)
+        return {"operation_name": f"operations/{len(self.submitted)}"}
+
+    def poll_video(self, operation_name: str, *, client=None):
+        self.polled.append(operation_name)
+        if len(self.polled) <= self._polls_until_done:
+            return None
+        return {"bytes": b"vid", "mime_type": "video/mp4"}
+
+
+def _setup(tmp_path, **runner_kwargs):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    ctx = app.state.ctx
+    ctx.settings.set_str("google_api_key", "x")
+    ctx.jobs.create(
+        job_id="v1",
+        job_type="video.generate",
+        model_id="veo-3.1",
+        auth_mode="api_key",
+        params={"prompt": "x", "aspect_ratio": "16:9", "duration_seconds": 4},
+    )
+    provider = _AsyncVideoProvider()
+    runner = JobRunner(ctx, provider=provider, concurrency=1, **runner_kwargs)
+    return ctx, provider, runner
+
+
+def _poll(runner: JobRunner) -> None:
+    wait(runner.poll_operations_once(), timeout=5)
+
+
+def test_video_job_is_submitted_then_completed_by_poller(tmp_path):
+    ctx, provider, runner = _setup(tmp_path)
+
+    runner._run_one("v1")
+    job = ctx.jobs.get("v1")
+    assert job["status"] == "running"
+    assert job["provider_operation"]["operation_name"] == "operations/1"
+    assert provider.submitted == ["veo-3.1-generate-preview"]
+
+    _poll(runner)
+    assert ctx.jobs.get("v1")["status"] == "running"
+
+    _poll(runner)
+    job = ctx.jobs.get("v1")
+    assert job["status"] == "succeeded"
+    asset = ctx.assets.get(job["result"]["output_asset_id"])
+    assert asset["media_type"] == "video"
+    assert ctx.jobs.list_pending_operations() == []
+
+
+def test_recover_on_startup_keeps_jobs_with_pending_operations(tmp_path):
+    ctx, _, runner = _setup(tmp_path)
+    runner._run_one("v1")
+
+    runner.recover_on_startup()
+
+    assert ctx.jobs.get("v1")["status"] == "running"
+    assert [j["id"] for j in ctx.jobs.list_pending_operations()] == ["v1"]
+
+
+def test_operation_timeout_fails_job(tmp_path):
+    ctx, _, runner = _setup(tmp_path, operation_timeout_seconds=-1)
+    runner._run_one("v1")
+
+    _poll(runner)
+
+    job = ctx.jobs.get("v1")
+    assert job["status"] == "failed"
+    assert "timed out" in str(job["error_detail"])
+
+
+def test_cancel_requested_stops_polling(tmp_path):
+    ctx, provider, runner = _setup(tmp_path)
+    runner._run_one("v1")
+    ctx.jobs.request_cancel("v1")
+
+    _poll(runner)
+
+    assert ctx.jobs.get("v1")["status"] == "canceled"
+    assert provider.polled == []
@@ -0,0 +1,161 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+from creativeai_studio.runner import JobRunner
+
+
+def _runner_with_jobs(tmp_path, jobs, **runner_kwargs):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    ctx = app.state.ctx
+    runner = JobRunner(ctx, **runner_kwargs)
+    for job_id, lane, priority in jobs:
+        ctx.jobs.create(
+            job_id=job_id,
+            job_type=lane.split("/", 1)[1],
+            model_id="nano-banana-pro",
+            auth_mode="api_key",
+            params={"prompt": job_id},
+            priority=priority,
+            lane=lane,
+        )
+        runner.enqueue(job_id)
+    return runner
+
+
+def _pick(runner):
+    picked = runner._scheduler.get(runner._claim_next, timeout=0)
+    return None if picked is None else (picked[0], picked[1]["id"])
+
+
+def test_scheduler_orders_by_priority_then_fifo_within_lane(tmp_path):
+    lane = "google/image.generate"
+    runner = _runner_with_jobs(
+        tmp_path,
+        [("low", lane, 0), ("high", lane, 5), ("low2", lane, 0)],
+        concurrency=10,
+    )
+
+    picked = [_pick(runner)[1] for _ in range(3)]
+    assert picked == ["high", "low", "low2"]
+
+
+def test_scheduler_round_robins_across_lanes(tmp_path):
+    jobs = [(f"ark{i}", "volcengine_ark/image.generate", 0) for i in range(3)]
+    jobs += [("veo0", "google/video.generate", 0), ("gem0", "google/image.generate", 0)]
+    runner = _runner_with_jobs(tmp_path, jobs, concurrency=10)
+
+    picked = [_pick(runner)[1] for _ in range(5)]
+    assert picked[:3] == ["ark0", "veo0", "gem0"]
+    assert picked[3:] == ["ark1", "ark2"]
+
+
+def test_scheduler_enforces_per_lane_concurrency(tmp_path):
+    jobs = [(f"g{i}", "google/image.generate", 0) for i in range(3)]
+    jobs += [("v0", "google/video.generate", 0), ("v1", "google/video.generate", 0)]
+    runner = _runner_with_jobs(tmp_path, jobs, lane_concurrency={"google/image.generate": 2})
+
+    picked = [_pick(runner) for _ in range(3)]
+    assert sorted(job_id for _, job_id in picked) == ["g0", "g1", "v0"]
+    assert _pick(runner) is None
+
+    runner._scheduler.done("google/video.generate")
+    assert _pick(runner) == ("google/video.generate", "v1")
+
+    stats = runner.lane_stats()
+    assert stats["google/image.generate"]["running"] == 2
+    assert stats["google/image.generate"]["depth"] == 1
+    assert stats["google/video.generate"]["dispatched_total"] == 2
+
+
+def test_jobs_get_lane_and_priority_and_queue_stats_are_exposed(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+
+    resp = client.post(
+        "/api/jobs",
+        json={
+            "job_type": "image.generate",
+            "model_id": "doubao-seedream-4-5-251128",
+            "priority": 3,
+            "params": {"prompt": "x", "image_size": "2k", "aspect_ratio": "1:1"},
+        },
+    )
+    assert resp.status_code == 200
+    job = resp.json()
+    assert job["priority"] == 3
+    assert job["lane"] == "volcengine_ark/image.generate"
+
+    clone = client.post(f"/api/jobs/{job['id']}/clone", json={}).json()
+    assert clone["priority"] == 3
+
+    stats = client.get("/api/jobs/queue").json()
+    assert stats["queued"] == 2
+    assert stats["lanes"]["volcengine_ark/image.generate"]["depth"] == 2
+
+
+def test_invalid_priority_is_rejected(tmp_path):
+    app = create_app(AppConfig(data_dir=tmp_path / "data"))
+    client = TestClient(app)
+
+    resp = client.post(
+        "/api/jobs",
+        json={
+            "job_type": "image.generate",
+            "model_id": "nano-banana-pro",
+            "priority": 99,
+            "params": {"prompt": "x", "image_size": "1k", "aspect_ratio": "1:1"},
+        },
+    )
+    assert resp.status_code == 400
+    assert "priority must be between" in resp.text
+
+    for bad in ("3", 2.9, True):
+        resp = client.post(
+            "/api/jobs",
+            json={
+                "job_type": "image.generate",
+                "model_id": "nano-banana-pro",
+                "priority": bad,
+                "params": {"prompt": "x", "image_size": "1k", "aspect_ratio": "1:1"},
+            },
+        )
+        assert resp.status_code == 400
+        assert "priority must be an integer" in resp.text
+
+
+def test_each_lane_gets_its_own_workers(tmp_path):
+    jobs = [("v0", "google/video.generate", 0), ("g0", "google/image.generate", 0)]
+    runner = _runner_with_jobs(
+        tmp_path, jobs, concurrency=3, lane_concurrency={"google/video.generate": 1}
+    )
+    assert runner._scheduler.capacity() == 4
+    runner._execute = lambda job: None  # type: ignore[method-assign]
+    runner.start()
+    assert runner._workers == 4
+
+    runner.enqueue_many([{"lane": "volcengine_ark/image.generate"}])
+    assert runner._workers == 7
+    runner._stop.set()
+
+
+def test_claim_runs_outside_the_scheduler_lock(tmp_path):
+    runner = _runner_with_jobs(tmp_path, [("g0", "google/image.generate", 0)])
+    scheduler = runner._scheduler
+    unblocked: list[bool] = []
+
+    def claim(lane, known_lanes):
+        # Another thread (a finishing worker, an enqueue) must not queue behind the claim.
+        t = threading.Thread(target=scheduler.wake)
+        t.start()
+        t.join(timeout=2)
+        unblocked.append(not t.is_alive())
+        return runner._claim_next(lane, known_lanes)
+
+    assert scheduler.get(claim, timeout=0)[1]["id"] == "g0"
+    assert unblocked and all(unblocked)
+    # A miss hands the reserved slot back.
+    assert scheduler.get(claim, timeout=0) is None
+    assert scheduler.stats()["google/image.generate"]["running"] == 1
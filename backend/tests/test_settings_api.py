@@ -27,3 +27,22 @@ def test_put_and_get_ark_api_key_presence(tmp_path):
     got = client.get("/api/settings")
     assert got.status_code == 200
     assert got.json()["ark_api_key_present"] is True
+
+
+def test_runtime_settings_expose_profile_and_stats(tmp_path):
+    cfg = AppConfig(
+        data_dir=tmp_path / "data",
+        db_pool_size=3,
+        runner_lane_concurrency=(("google/video.generate", 2),),
+    )
+    app = create_app(cfg)
+    client = TestClient(app)
+
+    res = client.get("/api/settings/runtime")
+    assert res.status_code == 200
+    data = res.json()
+    assert data["profile"]["db"]["pool_size"] == 3
+    assert data["profile"]["runner"]["lane_concurrency"] == {"google/video.generate": 2}
+    assert data["stats"]["db_pool"]["checkouts"] >= 1
+    assert data["stats"]["lanes"] == {}
+    assert data["stats"]["events"]["subscriptions"] == 0
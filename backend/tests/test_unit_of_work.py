@@ -0,0 +1,109 @@
+from io import BytesIO
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from creativeai_studio.config import AppConfig
+from creativeai_studio.main import create_app
+from creativeai_studio.runner import JobRunner
+
+
+def _png() -> bytes:
+    buf = BytesIO()
+    Image.new("RGB", (4, 4), color=(9, 9, 9)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class _MultiImageProvider:
+    def make_client_api_key(self, api_key: str):
+        return object()
+
+    def generate_image(self, **__):
+        return {"items": [{"bytes": _png(), "mime_type": "image/png"} for _ in range(3)]}
+
+
+def _app(tmp_path):
+    # A single pooled connection lets the test observe every statement the runner issues.
+    app = create_app(AppConfig(data_dir=tmp_path / "data", db_pool_size=1))
+    ctx = app.state.ctx
+    ctx.settings.set_str("ark_api_key", "ark_x")
+    ctx.jobs.create(
+        job_id="j1",
+        job_type="image.generate",
+        model_id="doubao-seedream-4-5-251128",
+        auth_mode="api_key",
+        params={"prompt": "x", "aspect_ratio": "1:1", "image_size": "2k", "sequential_image_generation": "auto"},
+    )
+    return app, ctx
+
+
+def test_transaction_rolls_back_every_repo_write(tmp_path):
+    _, ctx = _app(tmp_path)
+
+    with pytest.raises(RuntimeError), ctx.db.transaction():
+        ctx.jobs.create(job_id="j2", job_type="image.generate", model_id="m", auth_mode="api_key", params={})
+        with ctx.db.transaction():
+            ctx.job_assets.add(job_id="j2", asset_id="a1", role="input_reference")
+        raise RuntimeError("boom")
+
+    assert ctx.jobs.get("j2") is None
+    assert ctx.job_assets.list_by_job("j2") == []
+
+
+def test_job_completion_is_a_single_commit(tmp_path):
+    _, ctx = _app(tmp_path)
+    statements: list[str] = []
+    with ctx.db.connect() as conn:
+        conn.set_trace_callback(statements.append)
+
+    JobRunner(ctx, providers={"volcengine_ark": _MultiImageProvider()})._run_one("j1")
+
+    with ctx.db.connect() as conn:
+        conn.set_trace_callback(None)
+    job = ctx.jobs.get("j1")
+    assert job["status"] == "succeeded"
+    assert len(job["result"]["outputs"]) == 3
+    # One commit to mark the job running, one for outputs + links + succeeded.
+    assert statements.count("COMMIT") == 2
+    last_begin = max(i for i, s in enumerate(statements) if s.startswith("BEGIN"))
+    final_tx = statements[last_begin:]
+    assert any("INSERT INTO assets" in s for s in final_tx)
+    assert any("job_assets" in s for s in final_tx)
+    assert any("status = 'succeeded'" in s for s in final_tx)
+
+
+def test_failed_completion_leaves_no_orphan_rows(tmp_path, monkeypatch):
+    _, ctx = _app(tmp_path)
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(ctx.jobs, "set_succeeded", broken)
+    JobRunner(ctx, providers={"volcengine_ark": _MultiImageProvider()})._run_one("j1")
+
+    assert ctx.jobs.get("j1")["status"] == "failed"
+    assert ctx.assets.list() == []
+    assert [r for r in ctx.job_assets.list_by_job("j1") if r["role"] == "output"] == []
+
+
+def test_job_creation_commits_job_and_references_together(tmp_path):
+    app, ctx = _app(tmp_path)
+    client = TestClient(app)
+    ref = client.post("/api/assets/upload", files={"file": ("r.png", _png(), "image/png")}).json()["id"]
+
+    def broken_add(*args, **kwargs):
+        raise RuntimeError("crash mid-create")
+
+    ctx.job_assets.add = broken_add
+    with pytest.raises(RuntimeError):
+        client.post(
+            "/api/jobs",
+            json={
+                "job_type": "image.generate",
+                "model_id": "nano-banana-pro",
+                "auth_mode": "api_key",
+                "params": {"prompt": "x", "aspect_ratio": "1:1", "image_size": "1k", "reference_image_asset_ids": [ref]},
+            },
+        )
+    assert [j["id"] for j in ctx.jobs.list()] == ["j1"]
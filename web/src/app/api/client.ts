@@ -1,4 +1,4 @@
-import type { Asset, Job, ModelInfo, Settings } from './types'
+import type { Asset, Job, ModelInfo, Page, Settings } from './types'
 
 type ApiError = Error & { status?: number }
 
@@ -68,7 +68,16 @@ export const api = {
     const suffix = qs.toString() ? `?${qs.toString()}` : ''
     return apiGet<Asset[]>(`/api/assets${suffix}`)
   },
+  listAssetsPage: (params?: { media_type?: string; origin?: string; limit?: number; cursor?: string | null }) => {
+    const qs = new URLSearchParams()
+    if (params?.media_type) qs.set('media_type', params.media_type)
+    if (params?.origin) qs.set('origin', params.origin)
+    if (params?.limit != null) qs.set('limit', String(params.limit))
+    qs.set('cursor', params?.cursor || '')
+    return apiGet<Page<Asset>>(`/api/assets?${qs.toString()}`)
+  },
   getAsset: (id: string) => apiGet<Asset>(`/api/assets/${id}`),
+  assetThumbnailUrl: (id: string, width = 256) => `/api/assets/${id}/thumbnail?w=${width}`,
   listJobs: (params?: { status?: string; job_type?: string; model_id?: string; limit?: number; offset?: number }) => {
     const qs = new URLSearchParams()
     if (params?.status) qs.set('status', params.status)
@@ -79,7 +88,17 @@ export const api = {
     const suffix = qs.toString() ? `?${qs.toString()}` : ''
     return apiGet<Job[]>(`/api/jobs${suffix}`)
   },
+  listJobsPage: (params?: { status?: string; job_type?: string; model_id?: string; limit?: number; cursor?: string | null }) => {
+    const qs = new URLSearchParams()
+    if (params?.status) qs.set('status', params.status)
+    if (params?.job_type) qs.set('job_type', params.job_type)
+    if (params?.model_id) qs.set('model_id', params.model_id)
+    if (params?.limit != null) qs.set('limit', String(params.limit))
+    qs.set('cursor', params?.cursor || '')
+    return apiGet<Page<Job>>(`/api/jobs?${qs.toString()}`)
+  },
   getJob: (id: string) => apiGet<Job>(`/api/jobs/${id}`),
+  jobEventsUrl: (id: string) => `/api/jobs/${id}/events`,
   createJob: (payload: Record<string, unknown>) =>
     apiJson<Job>('/api/jobs', { method: 'POST', body: JSON.stringify(payload) }),
   cancelJob: (id: string) => apiJson<{ ok: boolean }>(`/api/jobs/${id}/cancel`, { method: 'POST', body: '{}' }),
@@ -82,5 +82,12 @@ export type Job = {
   created_at: string
   started_at: string | null
   finished_at: string | null
+  priority?: number
+  lane?: string | null
   job_assets?: Array<{ job_id: string; asset_id: string; role: string }>
 }
+
+export type Page<T> = {
+  items: T[]
+  next_cursor: string | null
+}
@@ -154,7 +154,7 @@ export function ImageAssetPickerModal({
                 close()
               }}
             >
-              <img className="assetThumb" src={`/api/assets/${a.id}/content`} alt={a.id} loading="lazy" />
+              <img className="assetThumb" src={api.assetThumbnailUrl(a.id)} alt={a.id} loading="lazy" />
               <div className="assetMeta">
                 <div className="assetId">{a.id.slice(0, 10)}</div>
                 <div className="assetSub">
@@ -32,6 +32,8 @@ function formatDims(a: Asset | null): string {
 
 export function AssetsPage() {
   const [assets, setAssets] = useState<Asset[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [selected, setSelected] = useState<Asset | null>(null)
   const [mediaType, setMediaType] = useState<string>('')
   const [origin, setOrigin] = useState<string>('')
@@ -41,13 +43,14 @@ export function AssetsPage() {
   async function refresh() {
     setError(null)
     try {
-      const list = await api.listAssets({
+      const page = await api.listAssetsPage({
         media_type: mediaType || undefined,
         origin: origin || undefined,
         limit: 50,
-        offset: 0,
       })
+      const list = page.items
       setAssets(list)
+      setNextCursor(page.next_cursor)
       setSelected((prev) => {
         if (prev) return list.find((a) => a.id === prev.id) || list[0] || null
         return list[0] || null
@@ -57,6 +60,25 @@ export function AssetsPage() {
     }
   }
 
+  async function loadMore() {
+    if (!nextCursor || loadingMore) return
+    setLoadingMore(true)
+    try {
+      const page = await api.listAssetsPage({
+        media_type: mediaType || undefined,
+        origin: origin || undefined,
+        limit: 50,
+        cursor: nextCursor,
+      })
+      setAssets((prev) => [...prev, ...page.items])
+      setNextCursor(page.next_cursor)
+    } catch (e) {
+      setError(e instanceof Error ? e.message : String(e))
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   useEffect(() => {
     refresh()
     // eslint-disable-next-line react-hooks/exhaustive-deps
@@ -173,8 +195,7 @@ export function AssetsPage() {
           {assets.length > 0 ? (
             <div className="assetGallery">
               {assets.map((a) => {
-                const thumbUrl = `/api/assets/${a.id}/content`
-                const videoThumbUrl = `${thumbUrl}#t=0.1`
+                const thumbUrl = api.assetThumbnailUrl(a.id)
                 const active = selected?.id === a.id
                 const sourceModelLabel = a.source_model_name || a.source_model_id
                 return (
@@ -187,18 +208,12 @@ export function AssetsPage() {
                   >
                     {active ? <div className="assetThumbCornerTag">已选中</div> : null}
                     <div className="assetThumbFrame">
-                      {a.media_type === 'image' ? (
-                        <img className="assetThumbImg" src={thumbUrl} alt={a.id} loading="lazy" />
-                      ) : (
-                        <video
-                          className="assetThumbImg"
-                          src={videoThumbUrl}
-                          muted
-                          playsInline
-                          preload="metadata"
-                          aria-label={`${a.id} 视频缩略图`}
-                        />
-                      )}
+                      <img
+                        className="assetThumbImg"
+                        src={thumbUrl}
+                        alt={a.media_type === 'image' ? a.id : `${a.id} 视频缩略图`}
+                        loading="lazy"
+                      />
                       <div className="assetThumbBadge">{a.media_type === 'image' ? '图片' : '视频'}</div>
                     </div>
                     <div className="assetThumbMeta">
@@ -217,6 +232,13 @@ export function AssetsPage() {
           ) : (
             <div className="muted">暂无资产</div>
           )}
+          {nextCursor ? (
+            <div className="row toolbarCenter" style={{ marginTop: 12 }}>
+              <button type="button" className="btnPillSoft" onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? '加载中…' : '加载更多'}
+              </button>
+            </div>
+          ) : null}
         </div>
       </section>
 
@@ -148,21 +148,46 @@ export function GeneratePage() {
     if (modelId !== next.model_id) setModelId(next.model_id)
   }, [filteredModels, selectableModels, modelId])
 
+  const jobId = job?.id
+  const jobActive = job?.status === 'queued' || job?.status === 'running'
+
   useEffect(() => {
-    const id = job?.id
-    if (!id) return
-    if (job.status !== 'queued' && job.status !== 'running') return
+    if (!jobId || !jobActive) return
+
+    let pollTimer: number | null = null
+    const startPolling = () => {
+      if (pollTimer != null) return
+      pollTimer = window.setInterval(async () => {
+        try {
+          const next = await api.getJob(jobId)
+          setJob(next)
+        } catch (e) {
+          setError(e instanceof Error ? e.message : String(e))
+        }
+      }, 1000)
+    }
 
-    const t = window.setInterval(async () => {
-      try {
-        const next = await api.getJob(id)
-        setJob(next)
-      } catch (e) {
-        setError(e instanceof Error ? e.message : String(e))
+    // Prefer server-pushed updates; fall back to 1s polling if the stream is unavailable.
+    let es: EventSource | null = null
+    if (typeof EventSource === 'undefined') {
+      startPolling()
+    } else {
+      es = new EventSource(api.jobEventsUrl(jobId))
+      es.addEventListener('job', (ev) => {
+        setJob(JSON.parse((ev as MessageEvent<string>).data) as Job)
+      })
+      es.addEventListener('end', () => es?.close())
+      es.onerror = () => {
+        es?.close()
+        startPolling()
       }
-    }, 1000)
-    return () => window.clearInterval(t)
-  }, [job?.id, job?.status])
+    }
+
+    return () => {
+      es?.close()
+      if (pollTimer != null) window.clearInterval(pollTimer)
+    }
+  }, [jobId, jobActive])
 
   async function uploadAndSet(
     file: File,
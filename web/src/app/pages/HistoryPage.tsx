@@ -23,14 +23,17 @@ function renderStatusBadge(status: string) {
 
 export function HistoryPage() {
   const [jobs, setJobs] = useState<Job[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [selected, setSelected] = useState<Job | null>(null)
   const [models, setModels] = useState<ModelInfo[]>([])
   const [error, setError] = useState<string | null>(null)
 
   const refresh = useCallback(async (selectedId?: string) => {
     try {
-      const list = await api.listJobs({ limit: 50, offset: 0 })
-      setJobs(list)
+      const page = await api.listJobsPage({ limit: 50 })
+      setJobs(page.items)
+      setNextCursor(page.next_cursor)
       if (selectedId) {
         const next = await api.getJob(selectedId)
         setSelected(next)
@@ -44,10 +47,11 @@ export function HistoryPage() {
     let canceled = false
     async function bootstrap() {
       try {
-        const [m, j] = await Promise.all([api.getModels(), api.listJobs({ limit: 50, offset: 0 })])
+        const [m, page] = await Promise.all([api.getModels(), api.listJobsPage({ limit: 50 })])
         if (canceled) return
         setModels(m)
-        setJobs(j)
+        setJobs(page.items)
+        setNextCursor(page.next_cursor)
       } catch (e) {
         if (canceled) return
         setError(e instanceof Error ? e.message : String(e))
@@ -59,6 +63,20 @@ export function HistoryPage() {
     }
   }, [])
 
+  async function loadMore() {
+    if (!nextCursor || loadingMore) return
+    setLoadingMore(true)
+    try {
+      const page = await api.listJobsPage({ limit: 50, cursor: nextCursor })
+      setJobs((prev) => [...prev, ...page.items])
+      setNextCursor(page.next_cursor)
+    } catch (e) {
+      setError(e instanceof Error ? e.message : String(e))
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const selectedModel = useMemo(() => {
     if (!selected) return null
     return models.find((m) => m.model_id === selected.model_id) || null
@@ -155,6 +173,13 @@ export function HistoryPage() {
               ) : null}
             </tbody>
           </table>
+          {nextCursor ? (
+            <div className="row toolbarCenter" style={{ marginTop: 12 }}>
+              <button type="button" className="btnPillSoft" onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? '加载中…' : '加载更多'}
+              </button>
+            </div>
+          ) : null}
         </div>
       </section>
 